@@ -1,17 +1,31 @@
 from .antispam import SpamDetectionGenerator, SpamManager
 from .ban import BanManager
-from .base import CogManager, questionnaire
+from .base import CogManager, CooldownStore, questionnaire
 from .birthday import BirthdayManager
 from .commandhinter import CommandHinter, CommandResponseGenerator
 from .convertors import TimeConvertor
-from .database import DatabaseManager, create_mysql
+from .database import (
+    DatabaseManager,
+    BufferedDatabase,
+    DatabaseInstrumentation,
+    MemoryStore,
+    Predicate,
+    SqliteProfile,
+    create_mysql,
+)
 from .economy import EconomyManager, EconomyAccount
 from .fivem import FiveMServer
 from .imaging import ImageManager, Backgrounds
 from .infractions import InfractionManager
 from .invitetracker import InviteTracker
 from .kick import KickManager
-from .leveling import LevelingManager
+from .leveling import (
+    LevelingManager,
+    LevelCurve,
+    GeometricLevelCurve,
+    LinearLevelCurve,
+    PolynomialLevelCurve,
+)
 from .messagefilter import MessageFilter, MessageResponseGenerator
 from .modmail import ModMailManager
 from .music import LavalinkMusicManager
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-from typing import TYPE_CHECKING, Union, Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Union, Optional, List, Dict, Any, AsyncIterator
 
 import discord
 
 from .base import DatabaseChecker
+from .database import Predicate
 from .punishments import Punisher
 
 if TYPE_CHECKING:
@@ -39,6 +40,7 @@ class BanManager(DatabaseChecker, Punisher):
                 }
             ],
             ["bans"],
+            indexes={"bans": [("guild", "member"), ("timestamp",)]},
         )
         self.bot = bot
 
@@ -58,11 +60,25 @@ class BanManager(DatabaseChecker, Punisher):
         :rtype: List[Dict[str, Any]]
         """
 
-        return [
-            x
-            for x in await self.database.select(self.tables["bans"], [], fetchall=True)
-            if x["timestamp"] <= datetime.utcnow().timestamp()
-        ]
+        return [x async for x in self.iterate_banned_members()]
+
+    @DatabaseChecker.uses_database
+    async def iterate_banned_members(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        |coro|
+
+        This function streams the members that are supposed to be unbanned but are banned, as they are read.
+
+        :return: The unbanned members.
+        :rtype: AsyncIterator[Dict[str, Any]]
+        """
+
+        async for x in self.database.iterate(
+            self.tables["bans"],
+            [],
+            {"timestamp": Predicate.lte(datetime.utcnow().timestamp())},
+        ):
+            yield x
 
     async def __check_bans(self) -> None:
         """
@@ -77,7 +93,7 @@ class BanManager(DatabaseChecker, Punisher):
         await self.bot.wait_until_ready()
 
         while not self.bot.is_closed():
-            for banned_member in await self.get_banned_members():
+            async for banned_member in self.iterate_banned_members():
                 guild = self.bot.get_guild(banned_member["guild"])
 
                 if guild is None:
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import contextvars
 import dataclasses
 import inspect
 import logging
+import time
+from collections import OrderedDict, namedtuple
 from dataclasses import dataclass
 from typing import (
     List,
@@ -13,9 +17,14 @@ from typing import (
     TYPE_CHECKING,
     Union,
     Tuple,
+    Set,
     Callable,
     Dict,
     Coroutine,
+    Type,
+    Hashable,
+    Iterator,
+    AsyncIterator,
 )
 
 import aiomysql
@@ -24,14 +33,23 @@ try:
     import aiopg
 except ImportError:
     aiopg = None
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+if not aiopg and not asyncpg:
     logging.warning(
-        "Aiopg is not installed correctly, postgres databases are not supported."
+        "Neither aiopg nor asyncpg is installed correctly, postgres databases are not supported."
     )
 
 import aiosqlite
 import discord
 from motor import motor_asyncio
 
+from .database import BufferedDatabase, MemoryStore, has_predicates, make_records
+
 if TYPE_CHECKING:
     from discord.ext import commands
     from .database import Database
@@ -51,22 +69,27 @@ __all__ = (
     "CogManager",
     "DatabaseChecker",
     "CacheBased",
+    "RowCache",
+    "CooldownStore",
 )
 
 
 COLUMN_TYPES = {
     motor_asyncio.AsyncIOMotorDatabase: None,  # mongo does not require any columns
+    MemoryStore: None,
     aiosqlite.core.Connection: {
         "snowflake": "INTEGER",
         "string": "TEXT",
         "number": "INTEGER",
         "smallnumber": "INTEGER",
+        "bignumber": "INTEGER",
     },
     aiomysql.pool.Pool: {
         "snowflake": "BIGINT",
         "string": "TEXT",
         "number": "INT",
         "smallnumber": "SMALLINT",
+        "bignumber": "BIGINT",
     },
 }
 
@@ -76,6 +99,16 @@ if aiopg:
         "string": "TEXT",
         "number": "INT",
         "smallnumber": "SMALLINT",
+        "bignumber": "BIGINT",
+    }
+
+if asyncpg:
+    COLUMN_TYPES[asyncpg.pool.Pool] = {
+        "snowflake": "BIGINT",
+        "string": "TEXT",
+        "number": "INT",
+        "smallnumber": "SMALLINT",
+        "bignumber": "BIGINT",
     }
 
 
@@ -83,6 +116,376 @@ class DatabaseNotConnected(Exception):
     """Raises an error when the user tries to use a method of a manager without a database connected to it."""
 
 
+class RowCache:
+    """
+    Represents a read-through cache of database rows with LRU eviction and a TTL.
+    Rows are keyed by their table and checks, so every backend is supported.
+    A read that overlaps a write of the same row is not cached, as it might have read the row before the write.
+    Rows are neither cached nor patched inside of a transaction, the tables written inside of it are invalidated
+    if it is rolled back.
+    """
+
+    __slots__ = (
+        "max_size",
+        "ttl",
+        "hits",
+        "misses",
+        "_rows",
+        "_columns",
+        "_reads",
+        "_transaction",
+    )
+
+    def __init__(self, max_size: int = 1024, ttl: Union[int, float] = 60):
+        """
+        :param int max_size: The maximum amount of rows the cache holds.
+        :param Union[int, float] ttl: The amount of seconds a row is cached for.
+        """
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._rows: OrderedDict = OrderedDict()
+        self._columns: Dict[str, Set[frozenset]] = {}
+        # Maps the keys that are being read to the amount of reads and a bool indicating if they were written.
+        self._reads: Dict[Tuple[str, frozenset], List[Union[int, bool]]] = {}
+        self._transaction: contextvars.ContextVar[
+            Optional[Set[str]]
+        ] = contextvars.ContextVar("row_cache_transaction", default=None)
+
+    def __repr__(self):
+        return f"<RowCache size={len(self)} hits={self.hits} misses={self.misses}>"
+
+    def __len__(self):
+        return len(self._rows)
+
+    @staticmethod
+    def get_key(table_name: str, checks: Dict[str, Any]) -> Tuple[str, frozenset]:
+        return table_name, frozenset(checks.items())
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        A context manager that marks the calls made inside it as a part of a database transaction.
+        Nested transactions join the outer transaction.
+
+        :return: None
+        :rtype: Iterator[None]
+        """
+
+        if self._transaction.get() is not None:
+            yield
+            return
+
+        written_tables = set()
+        token = self._transaction.set(written_tables)
+
+        try:
+            yield
+        except BaseException:
+            # Rows of the written tables might have been cached by reads made outside of the transaction.
+            for table_name in written_tables:
+                self.invalidate(table_name)
+
+            raise
+        finally:
+            self._transaction.reset(token)
+
+    def get(self, table_name: str, checks: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Returns a copy of the cached row, if it is cached and did not expire.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :return: The row.
+        :rtype: Optional[Dict[str, Any]]
+        """
+
+        key = self.get_key(table_name, checks)
+        cached = self._rows.get(key)
+
+        if cached is None or cached[0] < time.monotonic():
+            self.misses += 1
+            self._rows.pop(key, None)
+            return None
+
+        self.hits += 1
+        self._rows.move_to_end(key)
+        return dict(cached[1])
+
+    def start_read(self, table_name: str, checks: Dict[str, Any]) -> None:
+        """
+        Marks the start of a database read of the row, the read has to be finished by finish_read.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :return: None
+        :rtype: None
+        """
+
+        read = self._reads.setdefault(self.get_key(table_name, checks), [0, False])
+        read[0] += 1
+
+    def finish_read(
+        self,
+        table_name: str,
+        checks: Dict[str, Any],
+        row: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Marks the end of a database read of the row and caches the row that was read.
+        The row is not cached if it was written or invalidated while it was being read.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :param Optional[Dict[str, Any]] row: The row that was read, None if the read failed.
+        :return: None
+        :rtype: None
+        """
+
+        key = self.get_key(table_name, checks)
+        read = self._reads[key]
+        read[0] -= 1
+
+        if not read[0]:
+            del self._reads[key]
+
+        if row and not read[1]:
+            self.set(table_name, checks, row)
+
+    def set(self, table_name: str, checks: Dict[str, Any], row: Dict[str, Any]) -> None:
+        """
+        Caches a copy of the row.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :param Dict[str, Any] row: The row.
+        :return: None
+        :rtype: None
+        """
+
+        if has_predicates(checks) or self._transaction.get() is not None:
+            # Rows are only cached by equality checks, a predicate might match rows that are cached by other keys.
+            # Rows read inside of a transaction might not be committed.
+            return
+
+        key = self.get_key(table_name, checks)
+        self._columns.setdefault(table_name, set()).add(frozenset(checks))
+
+        self._rows[key] = (time.monotonic() + self.ttl, dict(row))
+        self._rows.move_to_end(key)
+
+        if len(self._rows) > self.max_size:
+            self._rows.popitem(last=False)
+
+    def update(
+        self, table_name: str, checks: Dict[str, Any], data: Dict[str, Any]
+    ) -> None:
+        """
+        Applies an update to the cached rows.
+        The row is updated in place, rows cached by other columns are invalidated as they might overlap.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the update.
+        :param Dict[str, Any] data: The updated data.
+        :return: None
+        :rtype: None
+        """
+
+        if has_predicates(checks) or any(column in checks for column in data):
+            self.invalidate(table_name)
+            return
+
+        if self._transaction.get() is not None:
+            self.invalidate(table_name, checks)
+            return
+
+        cached = self._rows.get(self.get_key(table_name, checks))
+
+        if cached is not None:
+            cached[1].update(data)
+
+        self.__invalidate_overlapping(table_name, checks)
+        self.__mark_written(table_name, checks)
+
+    def invalidate(self, table_name: str, checks: Dict[str, Any] = None) -> None:
+        """
+        Removes the rows that might match the checks from the cache.
+        All the rows of the table are removed if no checks are provided.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :return: None
+        :rtype: None
+        """
+
+        written_tables = self._transaction.get()
+        if written_tables is not None:
+            written_tables.add(table_name)
+
+        self.__mark_written(table_name, checks)
+
+        if checks is not None and not has_predicates(checks):
+            self._rows.pop(self.get_key(table_name, checks), None)
+            self.__invalidate_overlapping(table_name, checks)
+            return
+
+        for key in [key for key in self._rows if key[0] == table_name]:
+            del self._rows[key]
+
+    def __mark_written(
+        self, table_name: str, checks: Optional[Dict[str, Any]] = None
+    ) -> None:
+        if checks is not None and not has_predicates(checks):
+            # Reads by the same columns are of other rows, reads by other columns might be of the same row.
+            columns = frozenset(checks)
+            keys = [
+                key
+                for key in self._reads
+                if key[0] == table_name
+                and (
+                    key[1] == frozenset(checks.items())
+                    or {column for column, _ in key[1]} != columns
+                )
+            ]
+        else:
+            keys = [key for key in self._reads if key[0] == table_name]
+
+        for key in keys:
+            self._reads[key][1] = True
+
+    def __invalidate_overlapping(self, table_name: str, checks: Dict[str, Any]) -> None:
+        # Rows cached by the same columns are different rows, rows cached by other columns might be the same row.
+        columns = frozenset(checks)
+        if not self._columns.get(table_name, set()) - {columns}:
+            return
+
+        for key in [
+            key
+            for key in self._rows
+            if key[0] == table_name and {column for column, _ in key[1]} != columns
+        ]:
+            del self._rows[key]
+
+    def clear(self) -> None:
+        """
+        Clears the cache.
+
+        :return: None
+        :rtype: None
+        """
+
+        self._rows.clear()
+        self._columns.clear()
+
+        for read in self._reads.values():
+            read[1] = True
+
+
+class CooldownStore:
+    """
+    Represents a store of per-key cooldowns, e.g. per (guild, member) rate limits.
+    Every cooldown has the same duration, so the keys are kept in the order they were triggered in and the
+    expired keys are pruned from the front on every access. The store holds at most max_size keys, the keys that
+    are the closest to expiring are dropped first when it is full.
+    The trigger times are stored rather than the expirations, so changing the cooldown applies to the keys that
+    are already on cooldown.
+    """
+
+    __slots__ = ("cooldown", "max_size", "_triggers")
+
+    def __init__(self, cooldown: Union[int, float], max_size: int = 100000):
+        """
+        :param Union[int, float] cooldown: The amount of seconds a key is on cooldown for.
+        :param int max_size: The maximum amount of keys the store holds.
+        """
+
+        self.cooldown = cooldown
+        self.max_size = max_size
+        self._triggers: OrderedDict = OrderedDict()
+
+    def __repr__(self):
+        return f"<CooldownStore cooldown={self.cooldown} size={len(self)}>"
+
+    def __len__(self):
+        self.__prune(time.monotonic())
+        return len(self._triggers)
+
+    def __prune(self, now: float) -> None:
+        expired = now - self.cooldown
+
+        while self._triggers:
+            key, triggered_at = next(iter(self._triggers.items()))
+
+            if triggered_at > expired:
+                break
+
+            del self._triggers[key]
+
+    def get_remaining(self, key: Hashable) -> float:
+        """
+        Returns the amount of seconds left on the cooldown of the key.
+
+        :param Hashable key: The key.
+        :return: The remaining seconds, 0 if the key is not on cooldown.
+        :rtype: float
+        """
+
+        now = time.monotonic()
+        self.__prune(now)
+
+        triggered_at = self._triggers.get(key)
+        return triggered_at + self.cooldown - now if triggered_at is not None else 0
+
+    def is_on_cooldown(self, key: Hashable) -> bool:
+        """
+        Returns a bool indicating if the key is on cooldown.
+
+        :param Hashable key: The key.
+        :return: If the key is on cooldown.
+        :rtype: bool
+        """
+
+        return self.get_remaining(key) > 0
+
+    def trigger(self, key: Hashable) -> bool:
+        """
+        Starts the cooldown of the key if it is not on cooldown.
+
+        :param Hashable key: The key.
+        :return: A bool indicating if the cooldown was started, False if the key was already on cooldown.
+        :rtype: bool
+        """
+
+        now = time.monotonic()
+        self.__prune(now)
+
+        if key in self._triggers:
+            return False
+
+        self._triggers[key] = now
+
+        if len(self._triggers) > self.max_size:
+            self._triggers.popitem(last=False)
+
+        return True
+
+    def reset(self, key: Hashable = None) -> None:
+        """
+        Removes the cooldown of the key, or of every key if no key is provided.
+
+        :param Hashable key: The key.
+        :return: None
+        :rtype: None
+        """
+
+        if key is None:
+            self._triggers.clear()
+        else:
+            self._triggers.pop(key, None)
+
+
 @dataclass
 class CacheBased:
     """
@@ -430,12 +833,28 @@ class CogManager:
 class DatabaseChecker(EventManager):
     """
     A database checker which makes sure the database is connected to a manager and handles the table creation.
+    The unique keys map table identifiers to the column tuples that identify a single row, they allow the
+    database to upsert in a single statement.
+    The indexes map table identifiers to the column tuples that are looked up often, e.g. (guild, member).
+    The buffered tables map table identifiers to the key columns their updates are coalesced by, they are only
+    buffered when the manager is connected to a BufferedDatabase.
     """
 
     tables_column_data: List[Dict[str, str]]
     table_identifiers: List[str]
     database: Optional[Database] = dataclasses.field(default=None, init=False)
     tables: Dict[str, str] = dataclasses.field(default_factory=dict, init=False)
+    unique_keys: Dict[str, List[Tuple[str, ...]]] = dataclasses.field(
+        default_factory=dict
+    )
+    indexes: Dict[str, List[Tuple[str, ...]]] = dataclasses.field(default_factory=dict)
+    buffered_tables: Dict[str, Tuple[str, ...]] = dataclasses.field(
+        default_factory=dict
+    )
+    row_cache: Optional[RowCache] = dataclasses.field(default=None, init=False)
+    record_classes: Dict[Tuple[str, Tuple[str, ...]], Type[tuple]] = dataclasses.field(
+        default_factory=dict, init=False
+    )
 
     @staticmethod
     def uses_database(func):
@@ -491,10 +910,191 @@ class DatabaseChecker(EventManager):
             types = generate_column_types(table_data.values(), type(database.database))
 
             await database.create_table(
-                table, dict(zip(list(table_data), types)) if types else None, True
+                table,
+                dict(zip(list(table_data), types)) if types else None,
+                True,
+                self.indexes.get(identifier),
+                self.unique_keys.get(identifier),
             )
 
+            if identifier in self.buffered_tables:
+                if isinstance(database, BufferedDatabase):
+                    database.buffer_table(table, self.buffered_tables[identifier])
+                else:
+                    logging.warning(
+                        f"Table '{table}' is not buffered because {database} is not a BufferedDatabase."
+                    )
+
             self.database = database
             self.tables[identifier] = table
 
         await self.call_event("on_database_connect")
+
+    def get_record_class(
+        self, identifier: str, columns: Iterable[str] = None
+    ) -> Type[tuple]:
+        """
+        Returns the record class of the table, a namedtuple with the columns of the table as its fields.
+        Selects that pass it as the record_class decode the rows straight into records, without a dict per row.
+
+        :param str identifier: The table identifier.
+        :param Iterable[str] columns: The columns of the records, all the columns of the table if not provided.
+        :return: The record class.
+        :rtype: Type[tuple]
+        """
+
+        if columns is None:
+            columns = self.tables_column_data[self.table_identifiers.index(identifier)]
+
+        columns = tuple(columns)
+        record_class = self.record_classes.get((identifier, columns))
+
+        if record_class is None:
+            record_class = self.record_classes[(identifier, columns)] = namedtuple(
+                f"{identifier.title().replace('_', '')}Record", columns
+            )
+
+        return record_class
+
+    def enable_row_cache(
+        self, max_size: int = 1024, ttl: Union[int, float] = 60
+    ) -> None:
+        """
+        Enables the read-through row cache of the manager.
+        Writes made through the manager keep the cache consistent, writes made elsewhere are seen after the TTL.
+
+        :param int max_size: The maximum amount of rows the cache holds.
+        :param Union[int, float] ttl: The amount of seconds a row is cached for.
+        :return: None
+        :rtype: None
+        """
+
+        self.row_cache = RowCache(max_size, ttl)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        |coro|
+
+        A context manager that runs the database calls made inside it as a single unit of work, see
+        Database.transaction.
+        The row cache is not filled or patched inside of it, so a rollback does not leave rows in the cache that
+        were never committed.
+
+        :return: None
+        :rtype: AsyncIterator[None]
+        """
+
+        if self.row_cache is None:
+            async with self.database.transaction():
+                yield
+
+            return
+
+        with self.row_cache.transaction():
+            async with self.database.transaction():
+                yield
+
+    async def select_row(
+        self,
+        table_name: str,
+        checks: Dict[str, Any],
+        record_class: Type[tuple] = None,
+    ) -> Optional[Union[Dict[str, Any], tuple]]:
+        """
+        |coro|
+
+        Returns the row that matches the checks, from the row cache if it is enabled.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the row.
+        :param Type[tuple] record_class: The record class to return the row as, see get_record_class.
+        :return: The row.
+        :rtype: Optional[Union[Dict[str, Any], tuple]]
+        """
+
+        if self.row_cache is None:
+            return await self.database.select(
+                table_name, [], checks, record_class=record_class
+            )
+
+        row = self.row_cache.get(table_name, checks)
+
+        if row is None:
+            self.row_cache.start_read(table_name, checks)
+
+            try:
+                row = await self.database.select(table_name, [], checks)
+            finally:
+                self.row_cache.finish_read(table_name, checks, row)
+
+        return make_records(row, record_class, False) if record_class else row
+
+    async def update_row(
+        self, table_name: str, data: Dict[str, Any], checks: Dict[str, Any]
+    ) -> None:
+        """
+        |coro|
+
+        Updates the rows that match the checks and keeps the row cache consistent.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] data: The data to update.
+        :param Dict[str, Any] checks: The checks of the rows.
+        :return: None
+        :rtype: None
+        """
+
+        await self.database.update(table_name, data, checks)
+
+        if self.row_cache is not None:
+            self.row_cache.update(table_name, checks, data)
+
+    async def increment_row(
+        self,
+        table_name: str,
+        deltas: Dict[str, Union[int, float]],
+        checks: Dict[str, Any],
+        returning: Union[bool, Iterable[str]] = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        |coro|
+
+        Atomically adds the deltas to the columns of the rows that match the checks and keeps the row cache
+        consistent.
+
+        :param str table_name: The table name.
+        :param Dict[str, Union[int, float]] deltas: The amount to add to each column.
+        :param Dict[str, Any] checks: The checks of the rows.
+        :param Union[bool, Iterable[str]] returning: True to return the new values of the incremented columns, or
+            the columns of the row to return.
+        :return: The returned columns of the row, if returning is set.
+        :rtype: Optional[Dict[str, Any]]
+        """
+
+        result = await self.database.increment(table_name, deltas, checks, returning)
+
+        if self.row_cache is not None:
+            if result:
+                self.row_cache.update(table_name, checks, result)
+            else:
+                self.row_cache.invalidate(table_name, checks)
+
+        return result
+
+    async def delete_rows(self, table_name: str, checks: Dict[str, Any]) -> None:
+        """
+        |coro|
+
+        Deletes the rows that match the checks and removes them from the row cache.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks of the rows.
+        :return: None
+        :rtype: None
+        """
+
+        await self.database.delete(table_name, checks)
+
+        if self.row_cache is not None:
+            self.row_cache.invalidate(table_name, checks)
@@ -3,13 +3,14 @@ from __future__ import annotations
 import asyncio
 from dataclasses import dataclass
 from datetime import datetime, timedelta, tzinfo
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator
 
 import discord
 import pytz
 from discord.ext import commands
 
 from .base import DatabaseChecker
+from .database import Predicate
 
 
 __all__ = ("PartialBirthdayMember", "BirthdayManager", "BirthdayMember")
@@ -55,8 +56,8 @@ class BirthdayMember:
         :rtype: datetime
         """
 
-        birthday_data = await self.birthday_manager.database.select(
-            self.table, ["utc_birthday"], self.__checks
+        birthday_data = await self.birthday_manager.select_row(
+            self.table, self.__checks
         )
         return datetime.utcfromtimestamp(
             birthday_data["utc_birthday"]
@@ -90,8 +91,8 @@ class BirthdayMember:
         :rtype: str
         """
 
-        timezone_data = await self.birthday_manager.database.select(
-            self.table, ["timezone"], self.__checks
+        timezone_data = await self.birthday_manager.select_row(
+            self.table, self.__checks
         )
         return pytz.timezone(timezone_data["timezone"])
 
@@ -108,7 +109,7 @@ class BirthdayMember:
         partial = PartialBirthdayMember(
             self.member, await self.birthday_date(), await self.timezone()
         )
-        await self.birthday_manager.database.delete(self.table, self.__checks)
+        await self.birthday_manager.delete_rows(self.table, self.__checks)
         return partial
 
     async def set_birthday_date(self, timestamp: float) -> None:
@@ -122,7 +123,7 @@ class BirthdayMember:
         :rtype: None
         """
 
-        await self.birthday_manager.database.update(
+        await self.birthday_manager.update_row(
             self.table, {"utc_birthday": timestamp}, self.__checks
         )
 
@@ -137,7 +138,7 @@ class BirthdayMember:
         :rtype: None
         """
 
-        await self.birthday_manager.database.update(
+        await self.birthday_manager.update_row(
             self.table, {"timezone": timezone}, self.__checks
         )
 
@@ -179,6 +180,7 @@ class BirthdayManager(DatabaseChecker):
                 }
             ],
             ["birthdays"],
+            unique_keys={"birthdays": [("guild", "member")]},
         )
         self.bot = bot
         self.add_event(self._on_database_connect, "on_database_connect")
@@ -310,13 +312,30 @@ class BirthdayManager(DatabaseChecker):
         :rtype: List[Dict[str, Any]]
         """
 
-        result_members = []
-        registered_members = await self.database.select(
-            self.tables["birthdays"], [], fetchall=True
-        )
+        return [x async for x in self.iterate_members_with_birthday(timezones)]
+
+    @DatabaseChecker.uses_database
+    async def iterate_members_with_birthday(
+        self, timezones: List[str]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        |coro|
 
-        birthday_members = [x for x in registered_members if x["timezone"] in timezones]
-        for birthday_member in birthday_members:
+        This function receives a list of timezones and streams the members that have birthdays in that date
+        and timezone, as they are read.
+        Only the members of the timezones are read, the timezones are filtered by the database.
+
+        :param List[str] timezones: The timezones.
+        :return: The members that have a birthday.
+        :rtype: AsyncIterator[Dict[str, Any]]
+        """
+
+        if not timezones:
+            return
+
+        async for birthday_member in self.database.iterate(
+            self.tables["birthdays"], [], {"timezone": Predicate.in_(timezones)}
+        ):
             timezone_time = datetime.now(pytz.timezone(birthday_member["timezone"]))
             date_of_birth = datetime.fromtimestamp(birthday_member["utc_birthday"])
 
@@ -324,9 +343,7 @@ class BirthdayManager(DatabaseChecker):
                 date_of_birth.month == timezone_time.month
                 and date_of_birth.day == timezone_time.day
             ):
-                result_members.append(birthday_member)
-
-        return result_members
+                yield birthday_member
 
     @staticmethod
     def round_to_nearest(timedelta_to_round: timedelta) -> float:
@@ -348,7 +365,7 @@ class BirthdayManager(DatabaseChecker):
         while not self.bot.is_closed():
             await asyncio.sleep(self.round_to_nearest(timedelta(minutes=30)))
 
-            for birthday_member in await self.get_members_with_birthday(
+            async for birthday_member in self.iterate_members_with_birthday(
                 self.get_midnight_timezones()
             ):
                 guild = self.bot.get_guild(birthday_member["guild"])
@@ -1,7 +1,32 @@
 import asyncio
+import bisect
+import contextvars
+import itertools
+import logging
+import operator
+import re
+import sqlite3
 import sys
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import (
+    Dict,
+    Any,
+    Optional,
+    List,
+    Union,
+    Callable,
+    Hashable,
+    Iterable,
+    Tuple,
+    Set,
+    FrozenSet,
+    AsyncIterator,
+    Type,
+)
 
 import aiomysql
 
@@ -10,8 +35,14 @@ try:
 except ImportError:
     aiopg = None
 
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
 import aiosqlite
 from motor import motor_asyncio
+from pymongo import ReturnDocument
 
 if sys.version_info >= (3, 8) and sys.platform.lower().startswith("win"):
     # Aiopg requires the event loop policy to be WindowsSelectorEventLoop, if it is not, aiopg raises an error.
@@ -36,327 +67,2520 @@ async def create_mysql(
     :rtype: aiomysql.pool.Pool
     """
 
-    # Created this function to make sure the user has autocommit enabled.
-    # we must make sure autocommit is enabled because manual commits are not working on aiomysql :)
-    return await aiomysql.create_pool(
-        host=host, port=port, user=user, password=password, db=dbname, autocommit=True
-    )
+    # Created this function to make sure the user has autocommit enabled.
+    # we must make sure autocommit is enabled because manual commits are not working on aiomysql :)
+    return await aiomysql.create_pool(
+        host=host, port=port, user=user, password=password, db=dbname, autocommit=True
+    )
+
+
+MYSQL_DUPLICATE_KEY_NAME = 1061
+
+
+def get_index_name(
+    table_name: str, columns: Iterable[str], unique: bool = False
+) -> str:
+    """
+    Returns the name of the index on the columns of the table.
+
+    :param str table_name: The table name.
+    :param Iterable[str] columns: The indexed columns.
+    :param bool unique: A bool indicating if the index is unique.
+    :return: The index name.
+    :rtype: str
+    """
+
+    return f"{table_name}_{'_'.join(columns)}_{'unique' if unique else 'index'}"
+
+
+OrderBy = List[Tuple[Union[str, Tuple[str, ...]], str]]
+MAX_LIMIT = 2**63 - 1
+
+
+def parse_order_by(order_by: Optional[OrderBy]) -> List[Tuple[Tuple[str, ...], bool]]:
+    """
+    Parses the order by columns of a select.
+    Every item is a column, or a tuple of columns that is ordered by their sum, and a direction (ASC or DESC).
+
+    :param Optional[OrderBy] order_by: The order by columns.
+    :return: The column tuples and a bool indicating if they are descending.
+    :rtype: List[Tuple[Tuple[str, ...], bool]]
+    :raises: ValueError: An invalid direction was passed.
+    """
+
+    result = []
+
+    for columns, direction in order_by or []:
+        direction = direction.upper()
+
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"Invalid order direction {direction!r}.")
+
+        result.append(
+            (
+                (columns,) if isinstance(columns, str) else tuple(columns),
+                direction == "DESC",
+            )
+        )
+
+    return result
+
+
+class Predicate:
+    """
+    Represents a comparison of a column in the checks of a database call, checks that are not predicates are
+    compared by equality.
+
+    >>> await database.select("mutes", [], {"timestamp_of_unmute": Predicate.lte(now)}, fetchall=True)
+    """
+
+    __slots__ = ("operator", "values")
+
+    SQL_OPERATORS = {"ne": "<>", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+    MONGO_OPERATORS = {
+        "ne": "$ne",
+        "lt": "$lt",
+        "lte": "$lte",
+        "gt": "$gt",
+        "gte": "$gte",
+    }
+    PYTHON_OPERATORS = {
+        "ne": operator.ne,
+        "lt": operator.lt,
+        "lte": operator.le,
+        "gt": operator.gt,
+        "gte": operator.ge,
+    }
+
+    def __init__(self, operator: str, values: Tuple[Any, ...]):
+        """
+        :param str operator: The operator (ne, lt, lte, gt, gte, in or between).
+        :param Tuple[Any, ...] values: The operands of the operator.
+        """
+
+        self.operator = operator
+        self.values = values
+
+    def __repr__(self):
+        return f"<Predicate operator={self.operator!r} values={self.values!r}>"
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Predicate)
+            and self.operator == other.operator
+            and self.values == other.values
+        )
+
+    def __hash__(self):
+        return hash((self.operator, self.values))
+
+    @classmethod
+    def ne(cls, value: Any) -> "Predicate":
+        return cls("ne", (value,))
+
+    @classmethod
+    def lt(cls, value: Any) -> "Predicate":
+        return cls("lt", (value,))
+
+    @classmethod
+    def lte(cls, value: Any) -> "Predicate":
+        return cls("lte", (value,))
+
+    @classmethod
+    def gt(cls, value: Any) -> "Predicate":
+        return cls("gt", (value,))
+
+    @classmethod
+    def gte(cls, value: Any) -> "Predicate":
+        return cls("gte", (value,))
+
+    @classmethod
+    def in_(cls, values: Iterable[Any]) -> "Predicate":
+        return cls("in", tuple(values))
+
+    @classmethod
+    def between(cls, low: Any, high: Any) -> "Predicate":
+        """
+        Returns a predicate that matches the values between low and high, inclusive.
+
+        :param Any low: The lower bound.
+        :param Any high: The upper bound.
+        :return: The predicate.
+        :rtype: Predicate
+        """
+
+        return cls("between", (low, high))
+
+    def get_signature(self, column: str) -> Tuple[str, str, int]:
+        # The query template depends on the operator and on the amount of values of IN.
+        return column, self.operator, len(self.values)
+
+    def to_mongo(self) -> Dict[str, Any]:
+        """
+        Returns the mongo query operator of the predicate.
+
+        :return: The query operator.
+        :rtype: Dict[str, Any]
+        """
+
+        if self.operator == "in":
+            return {"$in": list(self.values)}
+
+        if self.operator == "between":
+            return {"$gte": self.values[0], "$lte": self.values[1]}
+
+        return {self.MONGO_OPERATORS[self.operator]: self.values[0]}
+
+    def matches(self, value: Any) -> bool:
+        """
+        Returns a bool indicating if the value matches the predicate.
+
+        :param Any value: The value.
+        :return: If the value matches.
+        :rtype: bool
+        """
+
+        if self.operator == "in":
+            return value in self.values
+
+        if self.operator == "between":
+            return self.values[0] <= value <= self.values[1]
+
+        return self.PYTHON_OPERATORS[self.operator](value, self.values[0])
+
+
+def get_check_columns(checks: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Returns the shape of the checks that their query template is compiled and cached by.
+
+    :param Dict[str, Any] checks: The checks.
+    :return: The equality columns and the signatures of the predicates.
+    :rtype: Tuple[Any, ...]
+    """
+
+    return tuple(
+        value.get_signature(column) if isinstance(value, Predicate) else column
+        for column, value in checks.items()
+    )
+
+
+def get_check_values(checks: Dict[str, Any]) -> List[Any]:
+    """
+    Returns the parameters the checks bind to their query template.
+
+    :param Dict[str, Any] checks: The checks.
+    :return: The parameters.
+    :rtype: List[Any]
+    """
+
+    values = []
+
+    for value in checks.values():
+        if isinstance(value, Predicate):
+            values.extend(value.values)
+        else:
+            values.append(value)
+
+    return values
+
+
+def get_mongo_filter(checks: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns the mongo filter of the checks.
+
+    :param Optional[Dict[str, Any]] checks: The checks.
+    :return: The filter.
+    :rtype: Dict[str, Any]
+    """
+
+    if not has_predicates(checks):
+        return {} if checks is None else checks
+
+    return {
+        column: value.to_mongo() if isinstance(value, Predicate) else value
+        for column, value in checks.items()
+    }
+
+
+def has_predicates(checks: Optional[Dict[str, Any]]) -> bool:
+    """
+    Returns a bool indicating if any of the checks is a predicate rather than an equality check.
+
+    :param Optional[Dict[str, Any]] checks: The checks.
+    :return: If the checks have predicates.
+    :rtype: bool
+    """
+
+    return bool(checks) and any(isinstance(x, Predicate) for x in checks.values())
+
+
+def get_returning_columns(
+    deltas: Dict[str, Union[int, float]], returning: Union[bool, Iterable[str]]
+) -> List[str]:
+    """
+    Returns the columns an increment should return.
+
+    :param Dict[str, Union[int, float]] deltas: The deltas of the increment.
+    :param Union[bool, Iterable[str]] returning: True to return the incremented columns, or the columns to return.
+    :return: The columns, empty if nothing should be returned.
+    :rtype: List[str]
+    """
+
+    if returning is True:
+        return list(deltas)
+
+    return list(returning) if returning else []
+
+
+def make_records(
+    rows: Union[List[Dict[str, Any]], Dict[str, Any], None],
+    record_class: Type[tuple],
+    fetchall: bool,
+) -> Union[List[tuple], tuple, None]:
+    """
+    Converts the rows of a select to records, used by the databases that return documents.
+
+    :param Union[List[Dict[str, Any]], Dict[str, Any], None] rows: The rows.
+    :param Type[tuple] record_class: The namedtuple class of the records.
+    :param bool fetchall: A bool indicating if the rows are a list.
+    :return: The records.
+    :rtype: Union[List[tuple], tuple, None]
+    """
+
+    fields = record_class._fields
+
+    if not fetchall:
+        return (
+            record_class._make([rows.get(field) for field in fields]) if rows else rows
+        )
+
+    return [record_class._make([row.get(field) for field in fields]) for row in rows]
+
+
+@dataclass
+class SqliteProfile:
+    """
+    Represents the connection tuning of a sqlite database.
+    The defaults only sync the journal on checkpoints instead of on every commit, which is where the writes gain.
+    WAL would let readers on other connections run alongside a writer, but the calls made on one connection are
+    still serialized by the database and by the aiosqlite thread.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    mmap_size: int = 256 * 1024 * 1024
+    cache_size: int = -64000  # A negative cache size is in KiB.
+    busy_timeout: int = 5000
+
+    def get_pragmas(self) -> List[str]:
+        """
+        Returns the PRAGMA statements of the profile.
+
+        :return: The PRAGMA statements.
+        :rtype: List[str]
+        """
+
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA mmap_size = {int(self.mmap_size)}",
+            f"PRAGMA cache_size = {int(self.cache_size)}",
+            f"PRAGMA busy_timeout = {int(self.busy_timeout)}",
+        ]
+
+
+class UnsupportedDatabase(Exception):
+    """Raises error when the user tries to use an unsupported database."""
+
+
+class QueryCache:
+    """
+    Represents a bounded LRU cache of compiled query templates.
+    The hot paths of the sql databases only bind parameters to the cached templates.
+    """
+
+    __slots__ = ("max_size", "hits", "misses", "_queries")
+
+    def __init__(self, max_size: int = 256):
+        """
+        :param int max_size: The maximum amount of query templates the cache holds.
+        """
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._queries: OrderedDict = OrderedDict()
+
+    def __repr__(self):
+        return f"<QueryCache size={len(self)} hits={self.hits} misses={self.misses}>"
+
+    def __len__(self):
+        return len(self._queries)
+
+    def get(self, key: Hashable, builder: Callable[[], str]) -> str:
+        """
+        Returns the query template of the key, builds and caches it if it is not cached.
+
+        :param Hashable key: The query key.
+        :param Callable[[], str] builder: The function that builds the query template.
+        :return: The query template.
+        :rtype: str
+        """
+
+        query = self._queries.get(key)
+
+        if query is not None:
+            self.hits += 1
+            self._queries.move_to_end(key)
+            return query
+
+        self.misses += 1
+        query = self._queries[key] = builder()
+
+        if len(self._queries) > self.max_size:
+            self._queries.popitem(last=False)
+
+        return query
+
+    def clear(self) -> None:
+        """
+        Clears the cached query templates and resets the counters.
+
+        :return: None
+        :rtype: None
+        """
+
+        self._queries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the cache statistics.
+
+        :return: The size, hits and misses of the cache.
+        :rtype: Dict[str, int]
+        """
+
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+class OperationStats:
+    """
+    Represents the statistics of an operation on a table.
+    """
+
+    __slots__ = ("calls", "errors", "rows", "total_time", "max_time", "histogram")
+
+    def __init__(self, buckets_count: int):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.histogram = [0] * buckets_count
+
+    def to_dict(self, buckets: Tuple[float, ...]) -> Dict[str, Any]:
+        """
+        Returns the statistics as a dict, the times are in milliseconds.
+
+        :param Tuple[float, ...] buckets: The upper bounds of the latency histogram buckets, in milliseconds.
+        :return: The statistics.
+        :rtype: Dict[str, Any]
+        """
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total_time * 1000,
+            "average_ms": self.total_time * 1000 / self.calls if self.calls else 0,
+            "max_ms": self.max_time * 1000,
+            "histogram": dict(zip(buckets, self.histogram)),
+        }
+
+
+class DatabaseInstrumentation:
+    """
+    Represents the instrumentation of a database.
+    Records the calls, errors, latency histograms and row counts of every operation by table, and logs the calls
+    that are slower than the slow query threshold along with their compiled query.
+    """
+
+    INSTRUMENTED_METHODS = (
+        "insertifnotexists",
+        "insert",
+        "insert_many",
+        "create_table",
+        "create_index",
+        "update",
+        "increment",
+        "updateorinsert",
+        "delete",
+        "select",
+        "count",
+        "execute",
+    )
+    LATENCY_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, float("inf"))
+
+    def __init__(self, slow_query_threshold: Optional[Union[int, float]] = None):
+        """
+        :param Optional[Union[int, float]] slow_query_threshold: The amount of milliseconds a call has to take to be logged.
+        """
+
+        self.slow_query_threshold = slow_query_threshold
+        self.operations: Dict[Tuple[str, Optional[str]], OperationStats] = {}
+
+        self._last_query = contextvars.ContextVar(
+            f"last_query_{id(self)}", default=None
+        )
+
+    def __repr__(self):
+        return f"<DatabaseInstrumentation operations={len(self.operations)}>"
+
+    def record(
+        self,
+        operation: str,
+        table_name: Optional[str],
+        elapsed: float,
+        rows: int = 0,
+        error: bool = False,
+    ) -> None:
+        """
+        Records a call.
+
+        :param str operation: The operation.
+        :param Optional[str] table_name: The table name, None for raw queries.
+        :param float elapsed: The amount of seconds the call took.
+        :param int rows: The amount of rows the call returned or wrote.
+        :param bool error: A bool indicating if the call raised.
+        :return: None
+        :rtype: None
+        """
+
+        stats = self.operations.get((operation, table_name))
+        if stats is None:
+            stats = self.operations[(operation, table_name)] = OperationStats(
+                len(self.LATENCY_BUCKETS)
+            )
+
+        stats.calls += 1
+        stats.errors += error
+        stats.rows += rows
+        stats.total_time += elapsed
+        stats.max_time = max(stats.max_time, elapsed)
+        stats.histogram[bisect.bisect_left(self.LATENCY_BUCKETS, elapsed * 1000)] += 1
+
+    def stats(self) -> Dict[str, Dict[Optional[str], Dict[str, Any]]]:
+        """
+        Returns a snapshot of the statistics, by operation and table.
+
+        :return: The statistics.
+        :rtype: Dict[str, Dict[Optional[str], Dict[str, Any]]]
+        """
+
+        snapshot = {}
+
+        for (operation, table_name), stats in self.operations.items():
+            snapshot.setdefault(operation, {})[table_name] = stats.to_dict(
+                self.LATENCY_BUCKETS
+            )
+
+        return snapshot
+
+    def reset(self) -> None:
+        """
+        Resets the statistics.
+
+        :return: None
+        :rtype: None
+        """
+
+        self.operations.clear()
+
+    @staticmethod
+    def get_rows_count(operation: str, args: Tuple[Any, ...], result: Any) -> int:
+        if operation == "insert_many":
+            return len(args[1]) if len(args) > 1 else 0
+
+        if operation == "insert":
+            return 1
+
+        if isinstance(result, list):
+            return len(result)
+
+        return 1 if isinstance(result, (dict, tuple)) else 0
+
+    def wrap_query_builder(self, get_query: Callable[..., str]) -> Callable[..., str]:
+        def inner(*args, **kwargs):
+            query = get_query(*args, **kwargs)
+            self._last_query.set(query)
+            return query
+
+        return inner
+
+    def wrap(self, operation: str, method: Callable) -> Callable:
+        """
+        Returns the method wrapped with the instrumentation.
+
+        :param str operation: The operation of the method.
+        :param Callable method: The bound method.
+        :return: The wrapped method.
+        :rtype: Callable
+        """
+
+        async def inner(*args, **kwargs):
+            if operation == "insert_many" and len(args) > 1:
+                args = (args[0], list(args[1])) + args[2:]
+
+            table_name = None if operation == "execute" or not args else args[0]
+            self._last_query.set(None)
+            start = time.perf_counter()
+
+            try:
+                result = await method(*args, **kwargs)
+            except BaseException:
+                self.record(
+                    operation, table_name, time.perf_counter() - start, error=True
+                )
+                raise
+
+            elapsed = time.perf_counter() - start
+            self.record(
+                operation,
+                table_name,
+                elapsed,
+                self.get_rows_count(operation, args, result),
+            )
+
+            if (
+                self.slow_query_threshold is not None
+                and elapsed * 1000 >= self.slow_query_threshold
+            ):
+                # Sql databases compile a query, the arguments are logged for the other databases.
+                query = (
+                    args[0] if operation == "execute" else self._last_query.get()
+                ) or repr(args[1:])
+                logging.warning(
+                    f"Slow database call: {operation} on '{table_name}' took {elapsed * 1000:.1f}ms. Query: {query}"
+                )
+
+            return result
+
+        return inner
+
+
+class Database(ABC):
+    __slots__ = ("database",)
+
+    instrumentation: Optional[DatabaseInstrumentation] = None
+
+    def __init__(self, database):
+        self.database = database
+
+    def enable_instrumentation(
+        self, slow_query_threshold: Optional[Union[int, float]] = None
+    ) -> DatabaseInstrumentation:
+        """
+        Instruments the operations of the database.
+        The methods are only wrapped while the instrumentation is enabled, so it costs nothing when disabled.
+
+        :param Optional[Union[int, float]] slow_query_threshold: The amount of milliseconds a call has to take to be logged.
+        :return: The instrumentation, its stats method returns a snapshot of the statistics.
+        :rtype: DatabaseInstrumentation
+        """
+
+        self.disable_instrumentation()
+        instrumentation = DatabaseInstrumentation(slow_query_threshold)
+
+        for operation in instrumentation.INSTRUMENTED_METHODS:
+            setattr(
+                self,
+                operation,
+                instrumentation.wrap(operation, getattr(self, operation)),
+            )
+
+        if getattr(type(self), "_get_query", None) is not None:
+            self._get_query = instrumentation.wrap_query_builder(self._get_query)
+
+        self.instrumentation = instrumentation
+        return instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """
+        Removes the instrumentation of the database.
+
+        :return: None
+        :rtype: None
+        """
+
+        for name in DatabaseInstrumentation.INSTRUMENTED_METHODS + ("_get_query",):
+            self.__dict__.pop(name, None)
+
+        self.instrumentation = None
+
+    @abstractmethod
+    async def close(self):
+        pass
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        |coro|
+
+        A context manager that runs the database calls made inside it as a single unit of work.
+        Databases that do not support transactions apply every call on its own.
+
+        :return: None
+        :rtype: AsyncIterator[None]
+        """
+
+        yield
+
+    @abstractmethod
+    async def insertifnotexists(
+        self, table_name: str, data: Dict[str, Any], checks: Dict[str, Any]
+    ):
+        pass
+
+    @abstractmethod
+    async def insert(self, table_name: str, data: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def insert_many(self, table_name: str, rows: Iterable[Dict[str, Any]]):
+        pass
+
+    @abstractmethod
+    async def create_table(
+        self,
+        table_name: str,
+        columns: Optional[Dict[str, str]] = None,
+        exists: Optional[bool] = False,
+        indexes: Optional[Iterable[Iterable[str]]] = None,
+        unique_keys: Optional[Iterable[Iterable[str]]] = None,
+    ):
+        pass
+
+    async def create_indexes(
+        self,
+        table_name: str,
+        indexes: Optional[Iterable[Iterable[str]]] = None,
+        unique_keys: Optional[Iterable[Iterable[str]]] = None,
+    ) -> None:
+        """
+        |coro|
+
+        Creates the indexes and unique keys of the table, indexes that already exist are skipped.
+
+        :param str table_name: The table name.
+        :param Optional[Iterable[Iterable[str]]] indexes: The column groups to index.
+        :param Optional[Iterable[Iterable[str]]] unique_keys: The column groups that identify a single row.
+        :return: None
+        :rtype: None
+        """
+
+        for unique_key in unique_keys or []:
+            await self.create_index(table_name, unique_key, unique=True)
+
+        for index in indexes or []:
+            await self.create_index(table_name, index)
+
+    @abstractmethod
+    async def create_index(
+        self, table_name: str, columns: Iterable[str], unique: bool = False
+    ) -> bool:
+        pass
+
+    @abstractmethod
+    async def update(
+        self, table_name: str, data: Dict[str, Any], checks: Dict[str, Any]
+    ):
+        pass
+
+    @abstractmethod
+    async def increment(
+        self,
+        table_name: str,
+        deltas: Dict[str, Union[int, float]],
+        checks: Dict[str, Any],
+        returning: Union[bool, Iterable[str]] = False,
+    ) -> Optional[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def updateorinsert(
+        self,
+        table_name: str,
+        data: Dict[str, Any],
+        checks: Dict[str, Any],
+        insert_data: Dict[str, Any],
+    ):
+        pass
+
+    @abstractmethod
+    async def delete(self, table_name: str, checks: Dict[str, Any]):
+        pass
+
+    @abstractmethod
+    async def select(
+        self,
+        table_name: str,
+        keys: List[str],
+        checks: Optional[Dict[str, Any]] = None,
+        fetchall: Optional[bool] = False,
+        order_by: Optional[OrderBy] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        record_class: Optional[Type[tuple]] = None,
+    ):
+        pass
+
+    @abstractmethod
+    async def count(
+        self, table_name: str, checks: Optional[Dict[str, Any]] = None
+    ) -> int:
+        pass
+
+    @abstractmethod
+    def iterate(
+        self,
+        table_name: str,
+        keys: List[str],
+        checks: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        pass
+
+    @abstractmethod
+    async def execute(
+        self, sql_query: str, values: List[Any], fetchall: bool = True
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        pass
+
+
+class _MongoDatabase(Database):
+    batch_size = 1000
+
+    def __str__(self):
+        return f"<{self.__class__.__name__} '{self.name}'>"
+
+    @property
+    def name(self):
+        return self.database.name
+
+    @staticmethod
+    def get_projection(keys: List[str]) -> Optional[Dict[str, int]]:
+        """
+        Returns the projection that only fetches the keys from the server.
+        The _id field is excluded unless it is requested, all the fields are fetched if no keys are provided.
+
+        :param List[str] keys: The keys.
+        :return: The projection.
+        :rtype: Optional[Dict[str, int]]
+        """
+
+        if not keys:
+            return None
+
+        projection = dict.fromkeys(keys, 1)
+        projection.setdefault("_id", 0)
+
+        return projection
+
+    async def close(self):
+        self.database.client.close()
+
+    async def insertifnotexists(self, table_name, data, checks):
+        return await self.database[table_name].update_one(
+            get_mongo_filter(checks), {"$setOnInsert": data}, upsert=True
+        )
+
+    async def insert(self, table_name, data):
+        return await self.database[table_name].insert_one(data)
+
+    async def insert_many(self, table_name, rows):
+        rows = list(rows)
+
+        if rows:
+            return await self.database[table_name].insert_many(rows)
+
+    async def create_table(
+        self, table_name, _=None, exists=False, indexes=None, unique_keys=None
+    ):
+        # create_table has an unused positional parameter to make the methods consistent between database types.
+
+        if not exists or table_name not in await self.database.list_collection_names():
+            await self.database.create_collection(table_name)
+
+        await self.create_indexes(table_name, indexes, unique_keys)
+
+    async def create_index(self, table_name, columns, unique=False):
+        columns = list(columns)
+
+        try:
+            await self.database[table_name].create_index(
+                [(column, 1) for column in columns],
+                name=get_index_name(table_name, columns, unique),
+                unique=unique,
+            )
+        except Exception as e:
+            logging.warning(
+                f"Could not create the index on {columns} in '{table_name}': {e}"
+            )
+            return False
+
+        return True
+
+    async def update(self, table_name, data, checks):
+        return await self.database[table_name].update_one(
+            get_mongo_filter(checks), {"$set": data}
+        )
+
+    async def increment(self, table_name, deltas, checks, returning=False):
+        if not returning:
+            return await self.database[table_name].update_one(
+                get_mongo_filter(checks), {"$inc": deltas}
+            )
+
+        return await self.database[table_name].find_one_and_update(
+            get_mongo_filter(checks),
+            {"$inc": deltas},
+            projection=self.get_projection(get_returning_columns(deltas, returning)),
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def updateorinsert(self, table_name, data, checks, insert_data):
+        # $set and $setOnInsert cannot share a field, data takes priority when the document is inserted.
+        update = {}
+        insert_only_data = {
+            key: value for key, value in insert_data.items() if key not in data
+        }
+
+        if data:
+            update["$set"] = data
+
+        if insert_only_data or not data:
+            update["$setOnInsert"] = insert_only_data or dict(checks)
+
+        return await self.database[table_name].update_one(
+            get_mongo_filter(checks), update, upsert=True
+        )
+
+    async def delete(self, table_name, checks=None):
+        return await self.database[table_name].delete_one(get_mongo_filter(checks))
+
+    async def select(
+        self,
+        table_name,
+        keys,
+        checks=None,
+        fetchall=False,
+        order_by=None,
+        limit=None,
+        offset=None,
+        record_class=None,
+    ):
+        if record_class is not None:
+            rows = await self.select(
+                table_name,
+                list(record_class._fields),
+                checks,
+                fetchall,
+                order_by,
+                limit,
+                offset,
+            )
+            return make_records(rows, record_class, fetchall)
+
+        if limit == 0:
+            # A limit of 0 means no limit to find and is rejected by $limit.
+            return [] if fetchall else None
+
+        checks = get_mongo_filter(checks)
+        order = parse_order_by(order_by)
+
+        if any(len(columns) > 1 for columns, _ in order):
+            return await self.__aggregate_select(
+                table_name, keys, checks, fetchall, order, limit, offset
+            )
+
+        kwargs = {"projection": self.get_projection(keys)}
+        if order:
+            kwargs["sort"] = [
+                (columns[0], -1 if descending else 1) for columns, descending in order
+            ]
+
+        if offset:
+            kwargs["skip"] = offset
+
+        if not fetchall:
+            return await self.database[table_name].find_one(checks, **kwargs)
+
+        if limit is not None:
+            kwargs["limit"] = limit
+
+        return await (
+            self.database[table_name]
+            .find(checks, batch_size=self.batch_size, **kwargs)
+            .to_list(length=None)
+        )
+
+    async def count(self, table_name, checks=None):
+        return await self.database[table_name].count_documents(get_mongo_filter(checks))
+
+    async def iterate(self, table_name, keys, checks=None, batch_size=1000):
+        async for doc in self.database[table_name].find(
+            get_mongo_filter(checks),
+            self.get_projection(keys),
+            batch_size=batch_size,
+        ):
+            yield doc
+
+    async def __aggregate_select(
+        self, table_name, keys, checks, fetchall, order, limit, offset
+    ):
+        # Expression ordering is not supported by find, the sums are added as temporary fields.
+        added_fields = {}
+        sort = {}
+
+        for index, (columns, descending) in enumerate(order):
+            field = columns[0]
+
+            if len(columns) > 1:
+                field = f"__order_{index}"
+                added_fields[field] = {"$add": [f"${column}" for column in columns]}
+
+            sort[field] = -1 if descending else 1
+
+        pipeline = [{"$match": checks}, {"$addFields": added_fields}, {"$sort": sort}]
+
+        if offset:
+            pipeline.append({"$skip": offset})
+
+        limit = limit if fetchall else 1
+        if limit is not None:
+            pipeline.append({"$limit": limit})
+
+        pipeline.append(
+            {"$project": self.get_projection(keys) or dict.fromkeys(added_fields, 0)}
+        )
+
+        result = await (
+            self.database[table_name]
+            .aggregate(pipeline, batchSize=self.batch_size)
+            .to_list(length=None)
+        )
+
+        if fetchall:
+            return result
+
+        return result[0] if result else None
+
+    async def execute(
+        self, sql_query: str, values: List[Any], fetchall: bool = True
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        raise NotImplementedError("NoSQL databases cannot execute sql queries.")
+
+
+class _SqlDatabase(Database):
+    def __str__(self):
+        return f"<{self.__class__.__name__}>"
+
+    def with_commit(func):
+        async def inner(self, *args, **kwargs):
+            resp = await func(self, *args, **kwargs)
+            if self.commit_needed and self._transaction_cursor.get() is None:
+                await self.commit()
+
+            return resp
+
+        return inner
+
+    def with_cursor(func):
+        async def inner(self, *args, **kwargs):
+            cursor = self._transaction_cursor.get()
+            if cursor is not None:
+                return await func(self, cursor, *args, **kwargs)
+
+            if self.pool:
+                return await self._run_with_cursor(func, *args, **kwargs)
+
+            # A single connection is shared between all tasks, calls made outside of a running transaction
+            # have to wait for it so they are not committed as a part of it.
+            async with self._transaction_lock:
+                if self._pending_pragmas:
+                    await self._apply_pragmas()
+
+                return await self._run_with_cursor(func, *args, **kwargs)
+
+        return inner
+
+    async def _run_with_cursor(self, func, *args, **kwargs):
+        database = await self.database.acquire() if self.pool else self.database
+
+        try:
+            if self.cursor_context:
+                async with self._get_cursor(database) as cursor:
+                    resp = await func(self, cursor, *args, **kwargs)
+
+            else:
+                cursor = await database.cursor()
+                resp = await func(self, cursor, *args, **kwargs)
+                await cursor.close()
+        finally:
+            if self.pool:
+                await self._release_connection(database)
+
+        return resp
+
+    def _get_cursor(self, connection, cursor_class=None):
+        return connection.cursor(cursor_class) if cursor_class else connection.cursor()
+
+    async def _release_connection(self, connection) -> None:
+        self.database.release(connection)
+
+    def __init__(
+        self,
+        database,
+        query_cache_size: int = 256,
+        sqlite_profile: Optional[SqliteProfile] = None,
+    ):
+        super().__init__(database)
+        self.place_holder = DATABASE_TYPES[type(database)]["placeholder"]
+        self.cursor_context = DATABASE_TYPES[type(database)]["cursorcontext"]
+        self.commit_needed = DATABASE_TYPES[type(database)]["commit"]
+        self.quote = DATABASE_TYPES[type(database)]["quotes"]
+        self.pool = DATABASE_TYPES[type(database)]["pool"]
+        self.upsert_clause = DATABASE_TYPES[type(database)]["upsert"]
+        self.index_if_not_exists = DATABASE_TYPES[type(database)]["indexifnotexists"]
+        self.executemany = DATABASE_TYPES[type(database)]["executemany"]
+        self.streaming_cursor = DATABASE_TYPES[type(database)]["streamingcursor"]
+        self.returning = DATABASE_TYPES[type(database)]["returning"]
+        self.query_cache = QueryCache(query_cache_size)
+        self.unique_keys: Dict[str, Set[FrozenSet[str]]] = {}
+
+        self._transaction_cursor = contextvars.ContextVar(
+            f"transaction_cursor_{id(self)}", default=None
+        )
+        self._transaction_lock = asyncio.Lock()
+
+        # PRAGMAs have to be awaited, they are applied before the first call made on the connection.
+        self._pending_pragmas = sqlite_profile.get_pragmas() if sqlite_profile else []
+
+    async def _apply_pragmas(self) -> None:
+        """
+        |coro|
+
+        Applies the pending PRAGMA statements of the sqlite profile.
+
+        :return: None
+        :rtype: None
+        """
+
+        pragmas, self._pending_pragmas = self._pending_pragmas, []
+
+        async with self.database.cursor() as cursor:
+            for pragma in pragmas:
+                await cursor.execute(pragma)
+
+    def _get_query(
+        self, operation: str, table_name: str, *column_groups: Iterable[str]
+    ) -> str:
+        """
+        Returns the compiled query template of the operation from the query cache.
+
+        :param str operation: The operation (insert, update, delete, select or upsert).
+        :param str table_name: The table name.
+        :param Iterable[str] column_groups: The column groups of the operation, e.g. the columns and the checks.
+        :return: The query template.
+        :rtype: str
+        """
+
+        column_groups = tuple(tuple(group) for group in column_groups)
+
+        return self.query_cache.get(
+            (operation, table_name) + column_groups,
+            lambda: self._build_query(operation, table_name, column_groups),
+        )
+
+    def _build_query(
+        self,
+        operation: str,
+        table_name: str,
+        column_groups: Tuple[Tuple[str, ...], ...],
+    ) -> str:
+        return getattr(self, f"_build_{operation}_query")(table_name, *column_groups)
+
+    def _build_where_clause(self, checks: Tuple[Any, ...]) -> str:
+        if not checks:
+            return ""
+
+        return " WHERE " + " AND ".join(self._build_check(check) for check in checks)
+
+    def _build_check(self, check: Union[str, Tuple[str, str, int]]) -> str:
+        if isinstance(check, str):
+            return f"{check} = {self.place_holder}"
+
+        column, operator_name, values_count = check
+
+        if operator_name == "between":
+            return f"{column} BETWEEN {self.place_holder} AND {self.place_holder}"
+
+        if operator_name == "in":
+            if not values_count:
+                # IN () is a syntax error, an empty IN matches no rows.
+                return "1 = 0"
+
+            return f"{column} IN ({', '.join([self.place_holder] * values_count)})"
+
+        return f"{column} {Predicate.SQL_OPERATORS[operator_name]} {self.place_holder}"
+
+    def _build_insert_query(self, table_name, columns):
+        return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join([self.place_holder] * len(columns))})"
+
+    def _build_update_query(self, table_name, columns, checks):
+        return (
+            f"UPDATE {table_name} SET "
+            + ", ".join(f"{column} = {self.place_holder}" for column in columns)
+            + self._build_where_clause(checks)
+        )
+
+    def _build_increment_query(self, table_name, columns, checks, returning=()):
+        # NULL columns are incremented from 0, like the missing fields of the document and memory backends.
+        query = (
+            f"UPDATE {table_name} SET "
+            + ", ".join(
+                f"{column} = COALESCE({column}, 0) + {self.place_holder}"
+                for column in columns
+            )
+            + self._build_where_clause(checks)
+        )
+
+        return query + (f" RETURNING {', '.join(returning)}" if returning else "")
+
+    def _build_delete_query(self, table_name, checks):
+        return f"DELETE FROM {table_name}" + self._build_where_clause(checks)
+
+    def _build_count_query(self, table_name, checks):
+        return f"SELECT COUNT(*) FROM {table_name}" + self._build_where_clause(checks)
+
+    def _build_select_query(self, table_name, columns, checks, order=(), paging=()):
+        query = f"SELECT {','.join(columns) or '*'} FROM {table_name}" + (
+            self._build_where_clause(checks)
+        )
+
+        if order:
+            query += " ORDER BY " + ", ".join(order)
+
+        return query + "".join(f" {clause} {self.place_holder}" for clause in paging)
+
+    def _build_upsert_query(
+        self, table_name, columns, conflict_columns, update_columns
+    ):
+        query = self._build_insert_query(table_name, columns)
+
+        if self.upsert_clause == "duplicate":
+            query += " ON DUPLICATE KEY UPDATE "
+            if not update_columns:
+                # MySQL has no DO NOTHING, assigning a column to itself is the documented no-op.
+                return query + f"{conflict_columns[0]} = {conflict_columns[0]}"
+
+            return query + ", ".join(
+                f"{column} = {self.place_holder}" for column in update_columns
+            )
+
+        query += f" ON CONFLICT ({', '.join(conflict_columns)}) DO "
+        if not update_columns:
+            return query + "NOTHING"
+
+        return (
+            query
+            + "UPDATE SET "
+            + ", ".join(f"{column} = {self.place_holder}" for column in update_columns)
+        )
+
+    def _has_unique_key(self, table_name: str, checks: Dict[str, Any]) -> bool:
+        """
+        Returns a bool indicating if the checks are equality checks of a unique key of the table.
+        Native upserts can only be used when the conflict columns are a unique key.
+
+        :param str table_name: The table name.
+        :param Dict[str, Any] checks: The checks.
+        :return: If the checks are a unique key.
+        :rtype: bool
+        """
+
+        return frozenset(checks) in self.unique_keys.get(
+            table_name, ()
+        ) and not has_predicates(checks)
+
+    @with_cursor
+    @with_commit
+    async def _upsert(
+        self,
+        cursor,
+        table_name: str,
+        insert_data: Dict[str, Any],
+        conflict_columns: Iterable[str],
+        data: Dict[str, Any],
+    ) -> None:
+        """
+        |coro|
+
+        Inserts the row, or updates it with data if a row with the same conflict columns exists, in one statement.
+
+        :param cursor: The cursor.
+        :param str table_name: The table name.
+        :param Dict[str, Any] insert_data: The data to insert.
+        :param Iterable[str] conflict_columns: The unique key columns.
+        :param Dict[str, Any] data: The data to update, the row is left untouched if empty.
+        :return: None
+        :rtype: None
+        """
+
+        await cursor.execute(
+            self._get_query("upsert", table_name, insert_data, conflict_columns, data),
+            list(insert_data.values()) + list(data.values()),
+        )
+
+    async def commit(self):
+        if not self.pool:
+            await self.database.commit()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        |coro|
+
+        A context manager that pins one connection and cursor for the database calls made inside it.
+        The calls are committed once when the context exits, or rolled back if it raises.
+        Nested transactions join the outer transaction.
+
+        :return: None
+        :rtype: AsyncIterator[None]
+        """
+
+        if self._transaction_cursor.get() is not None:
+            yield
+            return
+
+        database = await self.database.acquire() if self.pool else self.database
+        if not self.pool:
+            await self._transaction_lock.acquire()
+
+            if self._pending_pragmas:
+                await self._apply_pragmas()
+
+        try:
+            async with self._get_cursor(database) as cursor:
+                token = self._transaction_cursor.set(cursor)
+
+                try:
+                    await cursor.execute("BEGIN")
+
+                    try:
+                        yield
+                    except BaseException:
+                        await cursor.execute("ROLLBACK")
+                        raise
+
+                    await cursor.execute("COMMIT")
+                finally:
+                    self._transaction_cursor.reset(token)
+        finally:
+            if self.pool:
+                await self._release_connection(database)
+            else:
+                self._transaction_lock.release()
+
+    async def close(self):
+        await self.database.close()
+
+    @staticmethod
+    def group_rows(
+        rows: Iterable[Dict[str, Any]]
+    ) -> Dict[Tuple[str, ...], List[List[Any]]]:
+        """
+        Groups the values of the rows by their columns, rows with the same columns are inserted by one statement.
+
+        :param Iterable[Dict[str, Any]] rows: The rows.
+        :return: The values of the rows by their columns.
+        :rtype: Dict[Tuple[str, ...], List[List[Any]]]
+        """
+
+        batches = {}
+
+        for row in rows:
+            batches.setdefault(tuple(row), []).append(list(row.values()))
+
+        return batches
+
+    async def insertifnotexists(self, table_name, data, checks):
+        if self._has_unique_key(table_name, checks):
+            return await self._upsert(table_name, {**checks, **data}, checks, {})
+
+        response = await self.select(table_name, [], checks, True)
+
+        if not response:
+            return await self.insert(table_name, data)
+
+    @with_cursor
+    @with_commit
+    async def insert(self, cursor, table_name, data):
+        await cursor.execute(
+            self._get_query("insert", table_name, data), list(data.values())
+        )
+
+    @with_cursor
+    @with_commit
+    async def insert_many(self, cursor, table_name, rows):
+        for columns, values in self.group_rows(rows).items():
+            query = self._get_query("insert", table_name, columns)
+
+            if self.executemany:
+                await cursor.executemany(query, values)
+                continue
+
+            # aiopg does not support executemany, the rows are sent as a single multi-row VALUES statement instead.
+            row_placeholders = f"({', '.join([self.place_holder] * len(columns))})"
+            await cursor.execute(
+                query + f", {row_placeholders}" * (len(values) - 1),
+                [value for row_values in values for value in row_values],
+            )
+
+    async def create_table(
+        self, table_name, columns=None, exists=False, indexes=None, unique_keys=None
+    ):
+        await self._create_table(table_name, columns, exists)
+        await self.create_indexes(table_name, indexes, unique_keys)
+
+    @with_cursor
+    @with_commit
+    async def _create_table(self, cursor, table_name, columns=None, exists=False):
+        query = f'CREATE TABLE {"IF NOT EXISTS" if exists else ""} {self.quote}{table_name}{self.quote} ('
+        columns = [] if columns is None else columns
+
+        for column in columns:
+            query += f"\n{self.quote}{column}{self.quote} {columns[column]},"
+
+        query = query[:-1]
+
+        query += "\n);"
+        await cursor.execute(query)
+
+    @with_cursor
+    @with_commit
+    async def _create_index(self, cursor, table_name, columns, unique):
+        index_exists_clause = "IF NOT EXISTS " if self.index_if_not_exists else ""
+
+        await cursor.execute(
+            f"CREATE {'UNIQUE ' if unique else ''}INDEX {index_exists_clause}"
+            f"{self.quote}{get_index_name(table_name, columns, unique)}{self.quote} "
+            f"ON {self.quote}{table_name}{self.quote} ({', '.join(columns)})"
+        )
+
+    async def create_index(self, table_name, columns, unique=False):
+        columns = list(columns)
+
+        try:
+            await self._create_index(table_name, columns, unique)
+        except Exception as e:
+            # MySQL does not support IF NOT EXISTS on indexes, it raises a duplicate key name error instead.
+            if not e.args or e.args[0] != MYSQL_DUPLICATE_KEY_NAME:
+                logging.warning(
+                    f"Could not create the index on {columns} in '{table_name}': {e}"
+                )
+                return False
+
+        if unique:
+            self.unique_keys.setdefault(table_name, set()).add(frozenset(columns))
+
+        return True
+
+    @with_cursor
+    @with_commit
+    async def update(self, cursor, table_name, data, checks):
+        await cursor.execute(
+            self._get_query("update", table_name, data, get_check_columns(checks)),
+            list(data.values()) + get_check_values(checks),
+        )
+
+    async def increment(self, table_name, deltas, checks, returning=False):
+        if not returning or self.returning:
+            return await self._increment(table_name, deltas, checks, returning)
+
+        # The new values are selected in the same transaction when RETURNING is not supported, e.g. on MySQL.
+        async with self.transaction():
+            await self._increment(table_name, deltas, checks, False)
+            return await self.select(
+                table_name, get_returning_columns(deltas, returning), checks
+            )
+
+    @with_cursor
+    @with_commit
+    async def _increment(self, cursor, table_name, deltas, checks, returning):
+        await cursor.execute(
+            self._get_query(
+                "increment",
+                table_name,
+                deltas,
+                get_check_columns(checks),
+                get_returning_columns(deltas, returning),
+            ),
+            list(deltas.values()) + get_check_values(checks),
+        )
+
+        if not returning:
+            return None
+
+        columns = [x[0] for x in cursor.description]
+        # The statement has to be stepped to completion before it is committed.
+        result = await cursor.fetchall()
+
+        return dict(zip(columns, result[0])) if result else None
+
+    async def updateorinsert(self, table_name, data, checks, insert_data):
+        if self._has_unique_key(table_name, checks):
+            return await self._upsert(
+                table_name,
+                {**checks, **insert_data},
+                checks,
+                {key: value for key, value in data.items() if key not in checks},
+            )
+
+        response = await self.select(table_name, [], checks, True)
+
+        if len(response) == 1:
+            return await self.update(table_name, data, checks)
+
+        return await self.insert(table_name, insert_data)
+
+    @with_cursor
+    @with_commit
+    async def delete(self, cursor, table_name, checks=None):
+        checks = {} if checks is None else checks
+
+        await cursor.execute(
+            self._get_query("delete", table_name, get_check_columns(checks)),
+            get_check_values(checks),
+        )
+
+    @with_cursor
+    async def select(
+        self,
+        cursor,
+        table_name,
+        keys,
+        checks=None,
+        fetchall=False,
+        order_by=None,
+        limit=None,
+        offset=None,
+        record_class=None,
+    ):
+        checks = {} if checks is None else checks
+        values = get_check_values(checks)
+
+        if record_class is not None:
+            keys = record_class._fields
+
+        order = [
+            f"{' + '.join(columns)} {'DESC' if descending else 'ASC'}"
+            for columns, descending in parse_order_by(order_by)
+        ]
+
+        paging = []
+        if limit is not None or offset:
+            # OFFSET cannot be used without LIMIT on sqlite and MySQL.
+            paging.append("LIMIT")
+            values.append(limit if limit is not None else MAX_LIMIT)
+
+        if offset:
+            paging.append("OFFSET")
+            values.append(offset)
+
+        await cursor.execute(
+            self._get_query(
+                "select", table_name, keys, get_check_columns(checks), order, paging
+            ),
+            values,
+        )
+        columns = [x[0] for x in cursor.description]
+
+        result = await cursor.fetchall() if fetchall else await cursor.fetchone()
+        if not result:
+            return result
+
+        if record_class is not None:
+            # The columns are selected in the order of the fields, the rows are records without a dict.
+            return (
+                [record_class._make(x) for x in result]
+                if fetchall
+                else record_class._make(result)
+            )
+
+        return (
+            [dict(zip(columns, x)) for x in result]
+            if fetchall
+            else dict(zip(columns, result))
+        )
+
+    @with_cursor
+    async def count(self, cursor, table_name, checks=None):
+        checks = {} if checks is None else checks
+
+        await cursor.execute(
+            self._get_query("count", table_name, get_check_columns(checks)),
+            get_check_values(checks),
+        )
+
+        return (await cursor.fetchone())[0]
+
+    async def iterate(self, table_name, keys, checks=None, batch_size=1000):
+        checks = {} if checks is None else checks
+
+        if self._transaction_cursor.get() is not None:
+            # The pinned cursor is shared by the whole transaction, it cannot be left open between rows.
+            for row in await self.select(table_name, keys, checks, True) or []:
+                yield row
+
+            return
+
+        database = await self.database.acquire() if self.pool else self.database
+
+        try:
+            async with self._get_cursor(database, self.streaming_cursor) as cursor:
+                await self._run_locked(
+                    cursor.execute,
+                    self._get_query(
+                        "select", table_name, keys, get_check_columns(checks)
+                    ),
+                    get_check_values(checks),
+                )
+                columns = [x[0] for x in cursor.description]
+
+                while rows := await self._run_locked(cursor.fetchmany, batch_size):
+                    for row in rows:
+                        yield dict(zip(columns, row))
+        finally:
+            if self.pool:
+                await self._release_connection(database)
+
+    async def _run_locked(self, func, *args):
+        """
+        |coro|
+
+        Runs a cursor call of a stream under the transaction lock of single connection databases.
+        The connection is shared between all tasks, so a stream would read the uncommitted writes of a transaction
+        that is open. Every batch waits for it like the other calls, the lock is not held between the batches.
+
+        :param func: The cursor call.
+        :param args: The arguments of the call.
+        :return: The result of the call.
+        """
+
+        if self.pool:
+            return await func(*args)
+
+        async with self._transaction_lock:
+            if self._pending_pragmas:
+                await self._apply_pragmas()
+
+            return await func(*args)
+
+    @with_cursor
+    @with_commit
+    async def execute(
+        self, cursor, sql_query: str, values: List[Any] = None, fetchall: bool = True
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        await cursor.execute(sql_query, values if values is not None else [])
+
+        result = await cursor.fetchall() if fetchall else await cursor.fetchone()
+        columns = [x[0] for x in cursor.description]
+        if not result:
+            return result
+
+        return (
+            [dict(zip(columns, x)) for x in result]
+            if fetchall
+            else dict(zip(columns, result))
+        )
+
+
+class _AsyncpgCursor:
+    """
+    Adapts an asyncpg connection to the cursor interface that the sql database uses.
+    """
+
+    __slots__ = ("connection", "description", "_records", "_position")
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = []
+        self._records = []
+        self._position = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._records = []
+
+    async def execute(self, query: str, values: Iterable[Any] = ()) -> None:
+        # asyncpg prepares the statement once per connection and caches it, the query templates are constant.
+        self._records = await self.connection.fetch(query, *(values or ()))
+        self._position = 0
+        self.description = (
+            [(column,) for column in self._records[0].keys()] if self._records else []
+        )
+
+    async def executemany(self, query: str, values: Iterable[Iterable[Any]]) -> None:
+        await self.connection.executemany(query, values)
+
+    async def fetchone(self):
+        records = await self.fetchmany(1)
+        return records[0] if records else None
+
+    async def fetchmany(self, size: int):
+        records = self._records[self._position : self._position + size]
+        self._position += len(records)
+        return records
+
+    async def fetchall(self):
+        return await self.fetchmany(len(self._records))
+
+
+class _AsyncpgDatabase(_SqlDatabase):
+    """
+    Represents a postgres database of an asyncpg pool.
+    The queries are built with ? placeholders that are numbered to $n when the template is compiled.
+    """
+
+    PLACEHOLDER_PATTERN = re.compile(r"\?")
+
+    def _build_query(self, operation, table_name, column_groups):
+        query = super()._build_query(operation, table_name, column_groups)
+        counter = itertools.count(1)
+
+        return self.PLACEHOLDER_PATTERN.sub(lambda _: f"${next(counter)}", query)
+
+    def _get_cursor(self, connection, cursor_class=None):
+        return _AsyncpgCursor(connection)
+
+    async def _release_connection(self, connection) -> None:
+        await self.database.release(connection)
+
+    @_SqlDatabase.with_cursor
+    async def insert_many(self, cursor, table_name, rows):
+        for columns, values in self.group_rows(rows).items():
+            # COPY is the fastest way to bulk load rows into postgres.
+            await cursor.connection.copy_records_to_table(
+                table_name, records=values, columns=columns
+            )
+
+    async def iterate(self, table_name, keys, checks=None, batch_size=1000):
+        checks = {} if checks is None else checks
+
+        if self._transaction_cursor.get() is not None:
+            async for row in super().iterate(table_name, keys, checks, batch_size):
+                yield row
+
+            return
+
+        connection = await self.database.acquire()
+
+        try:
+            # Server-side cursors of postgres only exist inside of a transaction.
+            async with connection.transaction():
+                async for record in connection.cursor(
+                    self._get_query(
+                        "select", table_name, keys, get_check_columns(checks)
+                    ),
+                    *get_check_values(checks),
+                    prefetch=batch_size,
+                ):
+                    yield dict(record.items())
+        finally:
+            await self._release_connection(connection)
+
+
+class MemoryStore:
+    """
+    Represents the storage of an in-memory database.
+    The rows live in the process and are lost when it exits, intended for tests, benchmarks and throwaway bots.
+
+    >>> database = DatabaseManager.connect(MemoryStore())
+    """
+
+    __slots__ = ("tables", "indexes", "_row_ids")
+
+    def __init__(self):
+        self.tables: Dict[str, Dict[int, Dict[str, Any]]] = {}
+        self.indexes: Dict[str, Dict[str, "_MemoryIndex"]] = {}
+        self._row_ids = itertools.count()
+
+    def __repr__(self):
+        return f"<MemoryStore tables={len(self.tables)}>"
+
+    def next_row_id(self) -> int:
+        return next(self._row_ids)
+
+
+class _MemoryIndex:
+    """
+    Represents an index of a memory table, maps the values of the indexed columns to the ids of the rows.
+    """
+
+    __slots__ = ("columns", "unique", "entries")
+
+    def __init__(self, columns: Tuple[str, ...], unique: bool):
+        self.columns = columns
+        self.unique = unique
+        self.entries: Dict[Tuple[Any, ...], Set[int]] = {}
+
+    def get_key(self, row: Dict[str, Any]) -> Tuple[Any, ...]:
+        return tuple(row.get(column) for column in self.columns)
+
+    def check(self, row: Dict[str, Any], row_id: Optional[int] = None) -> None:
+        """
+        Raises an error if the row violates the unique key.
+
+        :param Dict[str, Any] row: The row.
+        :param Optional[int] row_id: The id of the row, if it is already stored.
+        :return: None
+        :rtype: None
+        :raises: ValueError: Another row has the same values in the unique key.
+        """
+
+        if self.unique and self.entries.get(self.get_key(row), set()) - {row_id}:
+            raise ValueError(
+                f"Duplicate entry {self.get_key(row)} for the unique key {self.columns}."
+            )
+
+    def add(self, row_id: int, row: Dict[str, Any]) -> None:
+        self.entries.setdefault(self.get_key(row), set()).add(row_id)
+
+    def remove(self, row_id: int, row: Dict[str, Any]) -> None:
+        key = self.get_key(row)
+        row_ids = self.entries.get(key)
+
+        if row_ids is not None:
+            row_ids.discard(row_id)
+
+            if not row_ids:
+                del self.entries[key]
+
+
+class _MemoryDatabase(Database):
+    """
+    Represents a dict backed database.
+    Equality checks on all the columns of an index are answered by the index, other checks scan the table.
+    Transactions undo their writes when they raise, the writes are visible to other tasks before they commit.
+    """
+
+    def __init__(self, database: MemoryStore):
+        super().__init__(database)
+
+        self._undo_log = contextvars.ContextVar(f"undo_log_{id(self)}", default=None)
+
+    def __str__(self):
+        return f"<{self.__class__.__name__}>"
+
+    def _get_table(self, table_name: str) -> Dict[int, Dict[str, Any]]:
+        table = self.database.tables.get(table_name)
+
+        if table is None:
+            raise KeyError(f"Table '{table_name}' does not exist.")
+
+        return table
+
+    @staticmethod
+    def _matches(row: Dict[str, Any], checks: Dict[str, Any]) -> bool:
+        return all(
+            value.matches(row.get(column))
+            if isinstance(value, Predicate)
+            else row.get(column) == value
+            for column, value in checks.items()
+        )
+
+    def _find(
+        self, table_name: str, checks: Optional[Dict[str, Any]]
+    ) -> List[Tuple[int, Dict[str, Any]]]:
+        """
+        Returns the ids and the rows that match the checks, in insertion order.
+
+        :param str table_name: The table name.
+        :param Optional[Dict[str, Any]] checks: The checks.
+        :return: The ids and the rows.
+        :rtype: List[Tuple[int, Dict[str, Any]]]
+        """
+
+        table = self._get_table(table_name)
+        if not checks:
+            return list(table.items())
+
+        equality_columns = {
+            column
+            for column, value in checks.items()
+            if not isinstance(value, Predicate)
+        }
+        usable_indexes = [
+            index
+            for index in self.database.indexes.get(table_name, {}).values()
+            if equality_columns.issuperset(index.columns)
+        ]
+
+        if not usable_indexes:
+            return [
+                (row_id, row)
+                for row_id, row in table.items()
+                if self._matches(row, checks)
+            ]
+
+        index = max(usable_indexes, key=lambda x: len(x.columns))
+        row_ids = index.entries.get(index.get_key(checks), ())
+
+        return [
+            (row_id, table[row_id])
+            for row_id in sorted(row_ids)
+            if self._matches(table[row_id], checks)
+        ]
+
+    def _log_undo(self, undo: Callable[[], None]) -> None:
+        undo_log = self._undo_log.get()
+
+        if undo_log is not None:
+            undo_log.append(undo)
+
+    def _insert_row(
+        self, table_name: str, row: Dict[str, Any], row_id: Optional[int] = None
+    ) -> None:
+        table = self._get_table(table_name)
+        indexes = self.database.indexes.get(table_name, {}).values()
+        row = dict(row)
+
+        for index in indexes:
+            index.check(row)
+
+        # Rows restored by an undo keep their id, the undo operations logged before them refer to it.
+        row_id = self.database.next_row_id() if row_id is None else row_id
+        table[row_id] = row
+
+        for index in indexes:
+            index.add(row_id, row)
+
+        self._log_undo(lambda: self._delete_row(table_name, row_id))
+
+    def _update_row(self, table_name: str, row_id: int, data: Dict[str, Any]) -> None:
+        row = self._get_table(table_name)[row_id]
+        indexes = [
+            index
+            for index in self.database.indexes.get(table_name, {}).values()
+            if any(column in data for column in index.columns)
+        ]
+        previous_data = {column: row.get(column) for column in data}
+        updated_row = {**row, **data}
+
+        for index in indexes:
+            index.check(updated_row, row_id)
+
+        for index in indexes:
+            index.remove(row_id, row)
+
+        row.update(data)
+
+        for index in indexes:
+            index.add(row_id, row)
+
+        self._log_undo(lambda: self._update_row(table_name, row_id, previous_data))
+
+    def _delete_row(self, table_name: str, row_id: int) -> None:
+        row = self._get_table(table_name).pop(row_id)
+
+        for index in self.database.indexes.get(table_name, {}).values():
+            index.remove(row_id, row)
+
+        self._log_undo(lambda: self._insert_row(table_name, row, row_id))
+
+    async def close(self):
+        pass
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        if self._undo_log.get() is not None:
+            yield
+            return
+
+        undo_log = []
+        token = self._undo_log.set(undo_log)
+
+        try:
+            yield
+        except BaseException:
+            # The undo operations are not logged again, the log of the context is reset first.
+            self._undo_log.reset(token)
+            token = None
+
+            for undo in reversed(undo_log):
+                undo()
+
+            raise
+        finally:
+            if token is not None:
+                self._undo_log.reset(token)
+
+    async def insertifnotexists(self, table_name, data, checks):
+        if not self._find(table_name, checks):
+            self._insert_row(table_name, data)
+
+    async def insert(self, table_name, data):
+        self._insert_row(table_name, data)
+
+    async def insert_many(self, table_name, rows):
+        for row in rows:
+            self._insert_row(table_name, row)
+
+    async def create_table(
+        self, table_name, columns=None, exists=False, indexes=None, unique_keys=None
+    ):
+        # Rows are schemaless, the columns are accepted to make the methods consistent between database types.
+        if table_name in self.database.tables:
+            if not exists:
+                raise ValueError(f"Table '{table_name}' already exists.")
+        else:
+            self.database.tables[table_name] = {}
 
+        await self.create_indexes(table_name, indexes, unique_keys)
 
-class UnsupportedDatabase(Exception):
-    """Raises error when the user tries to use an unsupported database."""
+    async def create_index(self, table_name, columns, unique=False):
+        columns = tuple(columns)
+        table = self._get_table(table_name)
+        table_indexes = self.database.indexes.setdefault(table_name, {})
+        name = get_index_name(table_name, columns, unique)
 
+        if name in table_indexes:
+            return True
 
-class Database(ABC):
-    __slots__ = ("database",)
+        index = _MemoryIndex(columns, unique)
 
-    def __init__(self, database):
-        self.database = database
+        try:
+            for row_id, row in table.items():
+                index.check(row)
+                index.add(row_id, row)
+        except ValueError as e:
+            logging.warning(
+                f"Could not create the index on {list(columns)} in '{table_name}': {e}"
+            )
+            return False
 
-    @abstractmethod
-    async def close(self):
-        pass
+        table_indexes[name] = index
+        return True
 
-    @abstractmethod
-    async def insertifnotexists(
-        self, table_name: str, data: Dict[str, Any], checks: Dict[str, Any]
-    ):
-        pass
+    async def update(self, table_name, data, checks):
+        for row_id, _ in self._find(table_name, checks):
+            self._update_row(table_name, row_id, data)
+
+    async def increment(self, table_name, deltas, checks, returning=False):
+        rows = self._find(table_name, checks)
+
+        for row_id, row in rows:
+            self._update_row(
+                table_name,
+                row_id,
+                {
+                    column: (0 if row.get(column) is None else row[column]) + delta
+                    for column, delta in deltas.items()
+                },
+            )
 
-    @abstractmethod
-    async def insert(self, table_name: str, data: Dict[str, Any]):
-        pass
+        if returning and rows:
+            return self._project(rows[0][1], get_returning_columns(deltas, returning))
 
-    @abstractmethod
-    async def create_table(
-        self,
-        table_name: str,
-        columns: Optional[Dict[str, str]] = None,
-        exists: Optional[bool] = False,
-    ):
-        pass
+    async def updateorinsert(self, table_name, data, checks, insert_data):
+        if self._find(table_name, checks):
+            return await self.update(table_name, data, checks)
 
-    @abstractmethod
-    async def update(
-        self, table_name: str, data: Dict[str, Any], checks: Dict[str, Any]
-    ):
-        pass
+        self._insert_row(table_name, insert_data)
 
-    @abstractmethod
-    async def updateorinsert(
-        self,
-        table_name: str,
-        data: Dict[str, Any],
-        checks: Dict[str, Any],
-        insert_data: Dict[str, Any],
-    ):
-        pass
+    async def delete(self, table_name, checks=None):
+        for row_id, _ in self._find(table_name, checks):
+            self._delete_row(table_name, row_id)
 
-    @abstractmethod
-    async def delete(self, table_name: str, checks: Dict[str, Any]):
-        pass
+    @staticmethod
+    def _project(row: Dict[str, Any], keys: List[str]) -> Dict[str, Any]:
+        return {key: row.get(key) for key in keys} if keys else dict(row)
 
-    @abstractmethod
     async def select(
         self,
-        table_name: str,
-        keys: List[str],
-        checks: Optional[Dict[str, Any]] = None,
-        fetchall: Optional[bool] = False,
+        table_name,
+        keys,
+        checks=None,
+        fetchall=False,
+        order_by=None,
+        limit=None,
+        offset=None,
+        record_class=None,
     ):
-        pass
+        rows = [row for _, row in self._find(table_name, checks)]
+
+        # Stable sorts from the last order column to the first, NULL values are ordered first like sqlite.
+        for columns, descending in reversed(parse_order_by(order_by)):
+            rows.sort(
+                key=lambda row: self.__get_order_value(row, columns),
+                reverse=descending,
+            )
+
+        rows = rows[offset or 0 :]
+        if limit is not None:
+            rows = rows[:limit]
+
+        if record_class is not None:
+            return make_records(
+                rows if fetchall else rows[0] if rows else None, record_class, fetchall
+            )
+
+        if not fetchall:
+            return self._project(rows[0], keys) if rows else None
+
+        return [self._project(row, keys) for row in rows]
+
+    @staticmethod
+    def __get_order_value(row: Dict[str, Any], columns: Tuple[str, ...]) -> Tuple:
+        values = [row.get(column) for column in columns]
+
+        if any(value is None for value in values):
+            return (False, 0)
+
+        return True, sum(values) if len(values) > 1 else values[0]
+
+    async def count(self, table_name, checks=None):
+        return len(self._find(table_name, checks))
+
+    async def iterate(self, table_name, keys, checks=None, batch_size=1000):
+        for _, row in self._find(table_name, checks):
+            yield self._project(row, keys)
 
-    @abstractmethod
     async def execute(
         self, sql_query: str, values: List[Any], fetchall: bool = True
     ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
-        pass
+        raise NotImplementedError("Memory databases cannot execute sql queries.")
 
 
-class _MongoDatabase(Database):
-    def __str__(self):
-        return f"<{self.__class__.__name__} '{self.name}'>"
+class _PendingRow:
+    """
+    Represents the pending writes of a buffered row.
+    The updated columns hold their new values and the incremented columns hold the sum of the deltas that were
+    added after the update, if any. The deltas are never folded into the values, so a flush does not write values
+    that were computed from an earlier state of the row.
+    The base holds the values of the row that were read before the pending writes, if any were read.
+    """
 
-    @property
-    def name(self):
-        return self.database.name
+    __slots__ = ("data", "deltas", "base")
 
-    async def close(self):
-        self.database.client.close()
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.deltas: Dict[str, Union[int, float]] = {}
+        self.base: Dict[str, Any] = {}
 
-    async def insertifnotexists(self, table_name, data, checks):
-        response = await self.select(table_name, [], checks, True)
+    def set(self, data: Dict[str, Any]) -> None:
+        for column in data:
+            self.deltas.pop(column, None)
 
-        if not response:
-            return await self.insert(table_name, data)
+        self.data.update(data)
 
-    async def insert(self, table_name, data):
-        return await self.database[table_name].insert_one(data)
+    def add(self, deltas: Dict[str, Union[int, float]]) -> None:
+        for column, delta in deltas.items():
+            self.deltas[column] = self.deltas.get(column, 0) + delta
 
-    async def create_table(self, table_name, _=None, exists=False):
-        # create_table has an unused positional parameter to make the methods consistent between database types.
+    def covers(self, columns: Iterable[str]) -> bool:
+        # Updates and increments do not create rows, the pending writes only answer reads of a row that was read.
+        return bool(self.base) and all(
+            column in self.data or column in self.base for column in columns
+        )
 
-        if exists and table_name in await self.database.list_collection_names():
-            return
+    def get(self, column: str) -> Any:
+        value = self.data[column] if column in self.data else self.base[column]
 
-        return await self.database.create_collection(table_name)
+        if column in self.deltas:
+            # NULL columns are incremented from 0, like the increments of the databases.
+            return (0 if value is None else value) + self.deltas[column]
 
-    async def update(self, table_name, data, checks):
-        return await self.database[table_name].update_one(checks, {"$set": data})
+        return value
 
-    async def updateorinsert(self, table_name, data, checks, insert_data):
-        response = await self.select(table_name, [], checks, True)
+    def apply(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the row with the pending writes applied to it.
 
-        if len(response) == 1:
-            return await self.update(table_name, data, checks)
+        :param Dict[str, Any] row: The row, as it is stored in the database.
+        :return: The row.
+        :rtype: Dict[str, Any]
+        """
 
-        return await self.insert(table_name, insert_data)
+        row = dict(row)
 
-    async def delete(self, table_name, checks=None):
-        return await self.database[table_name].delete_one(
-            {} if checks is None else checks
-        )
+        for column in row:
+            if column in self.data:
+                row[column] = self.data[column]
 
-    async def select(self, table_name, keys, checks=None, fetchall=False):
-        checks = {} if checks is None else checks
+            if column in self.deltas:
+                value = row[column]
+                row[column] = (0 if value is None else value) + self.deltas[column]
 
-        if fetchall:
-            fetch = self.database[table_name].find(checks)
-            result = []
+        return row
 
-            async for doc in fetch:
-                current_doc = {}
+    def merge(self, newer: "_PendingRow") -> None:
+        # The newer writes were made after these writes, the values they read are not kept as they might be stale.
+        self.set(newer.data)
+        self.add(newer.deltas)
 
-                for key, value in doc.items():
-                    if not keys or key in keys:
-                        current_doc[key] = value
 
-                result.append(current_doc)
-        else:
-            fetch = await self.database[table_name].find_one(checks)
-            result = {}
+class BufferedDatabase(Database):
+    """
+    Represents a write-behind layer on top of a database.
+    Updates and increments of the buffered tables are coalesced in memory by row and flushed in batches, either
+    when the amount of pending rows reaches max_pending, when flush_interval seconds pass or when the database is
+    closed.
+    Increments are flushed as increments rather than as values, so writes made to the same rows by other
+    connections in the meantime are not overwritten.
+    """
 
-            if fetch is not None:
-                for key, value in fetch.items():
-                    if not keys or key in keys:
-                        result[key] = value
-            else:
-                result = None
+    def __init__(
+        self,
+        database: Database,
+        flush_interval: Union[int, float] = 5,
+        max_pending: int = 500,
+    ):
+        """
+        :param Database database: The database to buffer the writes of.
+        :param Union[int, float] flush_interval: The maximum amount of seconds a write stays in memory.
+        :param int max_pending: The amount of pending rows that triggers a flush.
+        """
 
-        return result
+        super().__init__(database.database)
+        self.inner = database
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
 
-    async def execute(
-        self, sql_query: str, values: List[Any], fetchall: bool = True
-    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
-        raise NotImplementedError("NoSQL databases cannot execute sql queries.")
+        self.buffered_tables: Dict[str, FrozenSet[str]] = {}
+        self.buffered_writes = 0
+        self.flushed_writes = 0
+        self.flushes = 0
 
+        self._pending: Dict[Tuple[str, FrozenSet[Tuple[str, Any]]], _PendingRow] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        # Flushes and the reads of pending rows are serialized, a read must not see a flush that is half written.
+        self._flush_lock = asyncio.Lock()
 
-class _SqlDatabase(Database):
     def __str__(self):
-        return f"<{self.__class__.__name__}>"
+        return f"<{self.__class__.__name__} inner={self.inner}>"
 
-    def with_commit(func):
-        async def inner(self, *args, **kwargs):
-            resp = await func(self, *args, **kwargs)
-            if self.commit_needed:
-                await self.commit()
+    def __getattr__(self, item):
+        if item == "inner":
+            raise AttributeError(item)
 
-            return resp
+        return getattr(self.inner, item)
 
-        return inner
+    def buffer_table(self, table_name: str, key_columns: Iterable[str]) -> None:
+        """
+        Buffers the updates of the table that are made by the key columns.
+        Updates that use other checks are written directly.
 
-    def with_cursor(func):
-        async def inner(self, *args, **kwargs):
-            database = await self.database.acquire() if self.pool else self.database
+        :param str table_name: The table name.
+        :param Iterable[str] key_columns: The columns that identify a single row, e.g. (guild, member).
+        :return: None
+        :rtype: None
+        """
 
-            if self.cursor_context:
-                async with database.cursor() as cursor:
-                    resp = await func(self, cursor, *args, **kwargs)
+        self.buffered_tables[table_name] = frozenset(key_columns)
 
-            else:
-                cursor = await database.cursor()
-                resp = await func(self, cursor, *args, **kwargs)
-                await cursor.close()
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the write-behind statistics.
 
-            if self.pool:
-                self.database.release(database)
+        :return: The pending rows, the buffered and flushed writes and the amount of flushes.
+        :rtype: Dict[str, int]
+        """
 
-            return resp
+        return {
+            "pending": len(self._pending),
+            "buffered_writes": self.buffered_writes,
+            "flushed_writes": self.flushed_writes,
+            "flushes": self.flushes,
+        }
+
+    def _get_key(
+        self, table_name: str, checks: Optional[Dict[str, Any]]
+    ) -> Optional[Tuple[str, FrozenSet[Tuple[str, Any]]]]:
+        key_columns = self.buffered_tables.get(table_name)
+
+        if (
+            key_columns is None
+            or not checks
+            or key_columns != checks.keys()
+            or has_predicates(checks)
+        ):
+            return None
+
+        return table_name, frozenset(checks.items())
+
+    async def flush(self, table_name: str = None) -> None:
+        """
+        |coro|
 
-        return inner
+        Writes the pending updates to the database in a single transaction.
+        If the write fails, the updates are kept pending and the error is raised.
 
-    def __init__(self, database):
-        super().__init__(database)
-        self.place_holder = DATABASE_TYPES[type(database)]["placeholder"]
-        self.cursor_context = DATABASE_TYPES[type(database)]["cursorcontext"]
-        self.commit_needed = DATABASE_TYPES[type(database)]["commit"]
-        self.quote = DATABASE_TYPES[type(database)]["quotes"]
-        self.pool = DATABASE_TYPES[type(database)]["pool"]
+        :param str table_name: The table to flush, all the tables are flushed if not provided.
+        :return: None
+        :rtype: None
+        """
 
-    async def commit(self):
-        if not self.pool:
-            await self.database.commit()
+        async with self._flush_lock:
+            writes = [
+                (key, self._pending.pop(key))
+                for key in list(self._pending)
+                if table_name is None or key[0] == table_name
+            ]
+
+            if not writes:
+                return
+
+            try:
+                async with self.inner.transaction():
+                    for (table, checks), pending_row in writes:
+                        if pending_row.data:
+                            await self.inner.update(
+                                table, pending_row.data, dict(checks)
+                            )
+
+                        if pending_row.deltas:
+                            await self.inner.increment(
+                                table, pending_row.deltas, dict(checks)
+                            )
+            except BaseException:
+                for key, pending_row in writes:
+                    newer = self._pending.get(key)
+                    if newer is not None:
+                        pending_row.merge(newer)
+
+                    self._pending[key] = pending_row
+
+                raise
+
+        self.flushed_writes += len(writes)
+        self.flushes += 1
+
+    async def __delayed_flush(self) -> None:
+        await asyncio.sleep(self.flush_interval)
+        self._flush_task = None
+
+        try:
+            await self.flush()
+        except Exception:
+            logging.exception("Could not flush the buffered database writes.")
+
+    async def __schedule_flush(self) -> None:
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+
+        elif self._flush_task is None:
+            self._flush_task = asyncio.get_event_loop().create_task(
+                self.__delayed_flush()
+            )
 
-    async def close(self):
-        await self.database.close()
+    async def __select_pending(
+        self,
+        key: Tuple[str, FrozenSet[Tuple[str, Any]]],
+        keys: List[str],
+        checks: Dict[str, Any],
+        create: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        |coro|
 
-    async def insertifnotexists(self, table_name, data, checks):
-        response = await self.select(table_name, [], checks, True)
+        Selects a row from the database and applies its pending writes.
+        The values that were read are kept as the base of the pending row, so the next reads are answered in memory.
 
-        if not response:
-            return await self.insert(table_name, data)
+        :param Tuple[str, FrozenSet[Tuple[str, Any]]] key: The key of the row.
+        :param List[str] keys: The columns to select, all the columns if empty.
+        :param Dict[str, Any] checks: The checks of the row.
+        :param bool create: A bool indicating if the pending row should be created if the row exists.
+        :return: The row, None if it does not exist.
+        :rtype: Optional[Dict[str, Any]]
+        """
 
-    @with_cursor
-    @with_commit
-    async def insert(self, cursor, table_name, data):
-        query = f"INSERT INTO {table_name} ({', '.join(data.keys())}) VALUES ({', '.join([self.place_holder] * len(data.values()))})"
-        await cursor.execute(query, list(data.values()))
+        async with self._flush_lock:
+            row = await self.inner.select(key[0], keys, checks)
 
-    @with_cursor
-    @with_commit
-    async def create_table(self, cursor, table_name, columns=None, exists=False):
-        query = f'CREATE TABLE {"IF NOT EXISTS" if exists else ""} {self.quote}{table_name}{self.quote} ('
-        columns = [] if columns is None else columns
+        if not row:
+            return None
 
-        for column in columns:
-            query += f"\n{self.quote}{column}{self.quote} {columns[column]},"
+        # No flush ran during the read, so the row does not include the writes that are still pending.
+        pending_row = (
+            self._pending.setdefault(key, _PendingRow())
+            if create
+            else self._pending.get(key)
+        )
 
-        query = query[:-1]
+        if pending_row is None:
+            return row
 
-        query += "\n);"
-        await cursor.execute(query)
+        pending_row.base.update(row)
+        return pending_row.apply(row)
 
-    @with_cursor
-    @with_commit
-    async def update(self, cursor, table_name, data, checks):
-        query = f"UPDATE {table_name} SET "
+    async def close(self):
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            self._flush_task = None
 
-        if data:
-            for key in data:
-                query += f"{key} = {self.place_holder}, "
-            query = query[:-2]
+        await self.flush()
+        await self.inner.close()
 
-        if checks:
-            query += " WHERE "
-            for check in checks:
-                query += f"{check} = {self.place_holder} AND "
+    def transaction(self):
+        return self.inner.transaction()
 
-            query = query[:-4]
+    async def insertifnotexists(self, table_name, data, checks):
+        key = self._get_key(table_name, checks)
+        pending_row = self._pending.get(key) if key is not None else None
 
-        await cursor.execute(query, list(data.values()) + list(checks.values()))
+        if pending_row is not None:
+            if pending_row.base:
+                # The row was read, so it already exists.
+                return
 
-    async def updateorinsert(self, table_name, data, checks, insert_data):
-        response = await self.select(table_name, [], checks, True)
+            await self.flush(table_name)
 
-        if len(response) == 1:
-            return await self.update(table_name, data, checks)
+        return await self.inner.insertifnotexists(table_name, data, checks)
 
-        return await self.insert(table_name, insert_data)
+    async def insert(self, table_name, data):
+        await self.flush(table_name)
+        return await self.inner.insert(table_name, data)
 
-    @with_cursor
-    @with_commit
-    async def delete(self, cursor, table_name, checks=None):
-        checks = {} if checks is None else checks
+    async def insert_many(self, table_name, rows):
+        await self.flush(table_name)
+        return await self.inner.insert_many(table_name, rows)
 
-        query = f"DELETE FROM {table_name} "
+    async def create_table(
+        self, table_name, columns=None, exists=False, indexes=None, unique_keys=None
+    ):
+        return await self.inner.create_table(
+            table_name, columns, exists, indexes, unique_keys
+        )
 
-        if checks:
-            query += "WHERE "
-            for check in checks:
-                query += f"{check} = {self.place_holder} AND "
+    async def create_index(self, table_name, columns, unique=False):
+        return await self.inner.create_index(table_name, columns, unique)
 
-            query = query[:-4]
+    async def update(self, table_name, data, checks):
+        key = self._get_key(table_name, checks)
 
-        await cursor.execute(query, list(checks.values()))
+        if key is None:
+            await self.flush(table_name)
+            return await self.inner.update(table_name, data, checks)
 
-    @with_cursor
-    async def select(self, cursor, table_name, keys, checks=None, fetchall=False):
-        checks = {} if checks is None else checks
+        self._pending.setdefault(key, _PendingRow()).set(data)
+        self.buffered_writes += 1
 
-        keys = "*" if not keys else keys
-        query = f"SELECT {','.join(keys)} FROM {table_name} "
+        await self.__schedule_flush()
 
-        if checks:
-            query += "WHERE "
-            for check in checks:
-                query += f"{check} = {self.place_holder} AND "
+    async def increment(self, table_name, deltas, checks, returning=False):
+        key = self._get_key(table_name, checks)
 
-            query = query[:-4]
+        if key is None:
+            await self.flush(table_name)
+            return await self.inner.increment(table_name, deltas, checks, returning)
 
-        await cursor.execute(query, list(checks.values()))
-        columns = [x[0] for x in cursor.description]
+        columns = get_returning_columns(deltas, returning)
+        pending_row = self._pending.get(key)
 
-        result = await cursor.fetchall() if fetchall else await cursor.fetchone()
-        if not result:
-            return result
+        if columns and (pending_row is None or not pending_row.covers(columns)):
+            # The returned values are the stored values plus the pending writes, the stored values are read once.
+            if not await self.__select_pending(key, columns, checks, True):
+                # Increments do not create rows.
+                return None
 
-        return (
-            [dict(zip(columns, x)) for x in result]
-            if fetchall
-            else dict(zip(columns, result))
+        pending_row = self._pending.setdefault(key, _PendingRow())
+        pending_row.add(deltas)
+        self.buffered_writes += 1
+
+        result = (
+            {column: pending_row.get(column) for column in columns} if columns else None
         )
+        await self.__schedule_flush()
 
-    @with_cursor
-    @with_commit
-    async def execute(
-        self, cursor, sql_query: str, values: List[Any] = None, fetchall: bool = True
-    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
-        await cursor.execute(sql_query, values if values is not None else [])
+        return result
 
-        result = await cursor.fetchall() if fetchall else await cursor.fetchone()
-        columns = [x[0] for x in cursor.description]
-        if not result:
-            return result
+    async def updateorinsert(self, table_name, data, checks, insert_data):
+        await self.flush(table_name)
+        return await self.inner.updateorinsert(table_name, data, checks, insert_data)
 
-        return (
-            [dict(zip(columns, x)) for x in result]
-            if fetchall
-            else dict(zip(columns, result))
+    async def delete(self, table_name, checks=None):
+        await self.flush(table_name)
+        return await self.inner.delete(table_name, checks)
+
+    async def select(
+        self,
+        table_name,
+        keys,
+        checks=None,
+        fetchall=False,
+        order_by=None,
+        limit=None,
+        offset=None,
+        record_class=None,
+    ):
+        key = (
+            None
+            if fetchall or order_by or limit is not None or offset
+            else self._get_key(table_name, checks)
         )
+        pending_row = self._pending.get(key) if key is not None else None
+
+        if pending_row is None:
+            if key is None:
+                # Other rows might match the checks, their pending writes have to be visible.
+                await self.flush(table_name)
+
+            return await self.inner.select(
+                table_name,
+                keys,
+                checks,
+                fetchall,
+                order_by,
+                limit,
+                offset,
+                record_class,
+            )
+
+        if record_class is not None:
+            row = await self.select(table_name, list(record_class._fields), checks)
+            return make_records(row, record_class, False)
+
+        if keys and pending_row.covers(keys):
+            return {column: pending_row.get(column) for column in keys}
+
+        return await self.__select_pending(key, keys, checks)
+
+    async def count(self, table_name, checks=None):
+        await self.flush(table_name)
+        return await self.inner.count(table_name, checks)
+
+    async def iterate(self, table_name, keys, checks=None, batch_size=1000):
+        await self.flush(table_name)
+
+        async for row in self.inner.iterate(table_name, keys, checks, batch_size):
+            yield row
+
+    async def execute(
+        self, sql_query: str, values: List[Any] = None, fetchall: bool = True
+    ) -> Union[List[Dict[str, Any]], Dict[str, Any]]:
+        await self.flush()
+        return await self.inner.execute(sql_query, values, fetchall)
 
 
 DATABASE_TYPES: Dict[Any, Dict[str, Any]] = {
     motor_asyncio.AsyncIOMotorDatabase: {"class": _MongoDatabase, "placeholder": None},
+    MemoryStore: {"class": _MemoryDatabase, "placeholder": None},
     aiosqlite.core.Connection: {
         "class": _SqlDatabase,
         "placeholder": "?",
@@ -364,6 +2588,11 @@ DATABASE_TYPES: Dict[Any, Dict[str, Any]] = {
         "commit": True,
         "quotes": '"',
         "pool": False,
+        "upsert": "conflict",
+        "indexifnotexists": True,
+        "executemany": True,
+        "streamingcursor": None,
+        "returning": sqlite3.sqlite_version_info >= (3, 35, 0),
     },
     aiomysql.pool.Pool: {
         "class": _SqlDatabase,
@@ -372,6 +2601,11 @@ DATABASE_TYPES: Dict[Any, Dict[str, Any]] = {
         "commit": False,
         "quotes": "`",
         "pool": True,
+        "upsert": "duplicate",
+        "indexifnotexists": False,
+        "executemany": True,
+        "streamingcursor": aiomysql.SSCursor,
+        "returning": False,
     },
 }
 
@@ -383,9 +2617,30 @@ if aiopg:
         "commit": True,
         "quotes": '"',
         "pool": True,
+        "upsert": "conflict",
+        "indexifnotexists": True,
+        "executemany": False,
+        # psycopg2 does not support named cursors on asynchronous connections, rows are buffered by the driver.
+        "streamingcursor": None,
+        "returning": True,
+    }
+
+if asyncpg:
+    DATABASE_TYPES[asyncpg.pool.Pool] = {
+        "class": _AsyncpgDatabase,
+        "placeholder": "?",
+        "cursorcontext": True,
+        "commit": False,
+        "quotes": '"',
+        "pool": True,
+        "upsert": "conflict",
+        "indexifnotexists": True,
+        "executemany": True,
+        "streamingcursor": None,
+        "returning": True,
     }
 
-DATABASES: List = [_SqlDatabase, _MongoDatabase]
+DATABASES: List = [_SqlDatabase, _AsyncpgDatabase, _MongoDatabase, _MemoryDatabase]
 
 
 class DatabaseManager:
@@ -394,13 +2649,17 @@ class DatabaseManager:
     """
 
     @staticmethod
-    def connect(database: Any) -> Optional[Database]:
+    def connect(
+        database: Any, sqlite_profile: Optional[SqliteProfile] = None
+    ) -> Optional[Database]:
         """
         Connects to a database.
 
         :param Any database: The database.
+        :param Optional[SqliteProfile] sqlite_profile: The connection tuning to apply to a sqlite database.
         :return: The database, if applicable.
         :rtype: Optional[Database]
+        :raises: UnsupportedDatabase: The database is not supported, or a sqlite profile was passed for a database that is not sqlite.
         """
 
         if type(database) not in DATABASE_TYPES:
@@ -408,4 +2667,14 @@ class DatabaseManager:
                 f"Database of type {type(database)} is not supported by the database manager."
             )
 
-        return DATABASE_TYPES[type(database)]["class"](database)
+        if sqlite_profile is None:
+            return DATABASE_TYPES[type(database)]["class"](database)
+
+        if not isinstance(database, aiosqlite.core.Connection):
+            raise UnsupportedDatabase(
+                f"Sqlite profiles are not supported by databases of type {type(database)}."
+            )
+
+        return DATABASE_TYPES[type(database)]["class"](
+            database, sqlite_profile=sqlite_profile
+        )
@@ -24,46 +24,49 @@ class EconomyAccount:
     def __checks(self):
         return EconomyManager.generate_checks(self.member)
 
-    async def currency(self):
-        currency_data = await self.economy_manager.database.select(
-            self.table, ["currency"], self.__checks
+    async def __select(self):
+        return await self.economy_manager.select_row(
+            self.table,
+            self.__checks,
+            self.economy_manager.get_record_class("economy"),
         )
-        return currency_data["currency"]
+
+    async def currency(self):
+        currency_data = await self.__select()
+        return currency_data.currency
 
     async def bank(self):
-        bank_data = await self.economy_manager.database.select(
-            self.table, ["bank"], self.__checks
-        )
-        return bank_data["bank"]
+        bank_data = await self.__select()
+        return bank_data.bank
 
     async def net(self):
         return await self.bank() + await self.currency()
 
     async def change_currency(self, amount: int):
-        currency = await self.currency()
-        await self.economy_manager.database.update(
-            self.table, {"currency": currency + amount}, self.__checks
+        await self.economy_manager.increment_row(
+            self.table, {"currency": amount}, self.__checks
         )
 
     async def change_bank(self, amount: int):
-        bank_amount = await self.bank()
-        await self.economy_manager.database.update(
-            self.table, {"bank": bank_amount + amount}, self.__checks
+        await self.economy_manager.increment_row(
+            self.table, {"bank": amount}, self.__checks
         )
 
 
 class EconomyManager(DatabaseChecker):
-    def __init__(self, bot):
+    def __init__(self, bot, buffer_writes: bool = False):
         super().__init__(
             [
                 {
                     "guild": "snowflake",
                     "member": "snowflake",
-                    "currency": "snowflake",
-                    "bank": "snowflake",
+                    "currency": "bignumber",
+                    "bank": "bignumber",
                 }
             ],
             ["economy"],
+            unique_keys={"economy": [("guild", "member")]},
+            buffered_tables={"economy": ("guild", "member")} if buffer_writes else {},
         )
         self.bot = bot
 
@@ -83,11 +86,8 @@ class EconomyManager(DatabaseChecker):
     async def get_account(self, member: discord.Member) -> Optional[EconomyAccount]:
         self._check_database()
 
-        member_data = await self.database.select(
-            self.tables["economy"],
-            [],
-            self.generate_checks(member),
-            True,
+        member_data = await self.select_row(
+            self.tables["economy"], self.generate_checks(member)
         )
 
         if member_data:
@@ -96,18 +96,36 @@ class EconomyManager(DatabaseChecker):
         return None
 
     @DatabaseChecker.uses_database
-    async def get_leaderboard(self, guild: discord.Guild) -> List[EconomyAccount]:
-        guild_info = sorted(
-            await self.database.select(
-                self.tables["economy"], [], {"guild": guild.id}, True
-            ),
-            key=lambda x: x["bank"] + x["currency"],
-            reverse=True,
+    async def get_leaderboard(
+        self, guild: discord.Guild, limit: int = None, offset: int = 0
+    ) -> List[EconomyAccount]:
+        """
+        |coro|
+
+        Returns the leaderboard of the guild, sorted by net worth by the database.
+        Members that left the guild are skipped, so a page might be shorter than the limit.
+
+        :param discord.Guild guild: The guild.
+        :param int limit: The amount of rows to fetch, all the rows are fetched if not provided.
+        :param int offset: The amount of rows to skip.
+        :return: The economy accounts.
+        :rtype: List[EconomyAccount]
+        """
+
+        guild_info = await self.database.select(
+            self.tables["economy"],
+            [],
+            {"guild": guild.id},
+            True,
+            order_by=[(("bank", "currency"), "DESC")],
+            limit=limit,
+            offset=offset,
+            record_class=self.get_record_class("economy", ("member",)),
         )
 
         members = []
         for member_info in guild_info:
-            member = guild.get_member(member_info["member"])
+            member = guild.get_member(member_info.member)
             if member:
                 members.append(EconomyAccount(self, member))
 
@@ -318,20 +318,22 @@ class ImageManager:
         font_normal = ImageFont.truetype(font_path, 25)
         font_small = ImageFont.truetype(font_path, 20)
 
+        progress = await member_account.get_progress()
+
         draw = ImageDraw.Draw(card)
         draw.text((245, 90), str(member), name_color, font=font_big, anchor="ls")
         draw.text((800, 90), f"Rank #{rank}", rank_color, font=font_medium, anchor="rs")
         draw.text(
             (245, 165),
-            f"Level {await member_account.level()}",
+            f"Level {progress.level}",
             level_color,
             font=font_normal,
             anchor="ls",
         )
         draw.text(
             (800, 165),
-            f"{self.human_format(await member_account.xp())} /"
-            f" {self.human_format(await member_account.next_level())} XP",
+            f"{self.human_format(progress.xp)} /"
+            f" {self.human_format(progress.next_level_xp)} XP",
             xp_color,
             font=font_small,
             anchor="rs",
@@ -345,7 +347,7 @@ class ImageManager:
             width=3,
         )
 
-        length_of_bar = await member_account.percentage_next_level() * 5.5 + 250
+        length_of_bar = progress.percentage * 5.5 + 250
         draw.rounded_rectangle(
             (245, 185, length_of_bar, 205), fill=bar_fill_color, radius=10
         )
@@ -6,6 +6,7 @@ from datetime import datetime
 from typing import List, TYPE_CHECKING, Optional, Dict, Union
 
 from .base import DatabaseChecker
+from .database import Predicate
 from .punishments import Punisher, get_relevant_punishment
 
 if TYPE_CHECKING:
@@ -51,21 +52,21 @@ class Infraction:
         }
 
     async def datetime(self) -> Optional[datetime]:
-        timestamp_data = await self.infraction_manager.database.select(
-            self.table, ["timestamp"], self.__checks
+        timestamp_data = await self.infraction_manager.select_row(
+            self.table, self.__checks
         )
         if timestamp_data:
             return datetime.utcfromtimestamp(timestamp_data["timestamp"])
 
     async def reason(self) -> Optional[str]:
-        reason_data = await self.infraction_manager.database.select(
-            self.table, ["reason"], self.__checks
+        reason_data = await self.infraction_manager.select_row(
+            self.table, self.__checks
         )
         if reason_data:
             return reason_data["reason"]
 
     async def set_reason(self, new_reason: str) -> None:
-        await self.infraction_manager.database.update(
+        await self.infraction_manager.update_row(
             self.table, {"reason": new_reason}, self.__checks
         )
 
@@ -73,7 +74,7 @@ class Infraction:
         partial = PartialInfraction(
             self.member, self.id, await self.reason(), await self.datetime()
         )
-        await self.infraction_manager.database.delete(self.table, self.__checks)
+        await self.infraction_manager.delete_rows(self.table, self.__checks)
         return partial
 
 
@@ -90,6 +91,7 @@ class InfractionManager(DatabaseChecker, Punisher):
                 }
             ],
             ["infractions"],
+            indexes={"infractions": [("guild", "member")]},
         )
         self.punishments = []
         self.bot = bot
@@ -137,12 +139,11 @@ class InfractionManager(DatabaseChecker, Punisher):
         if infraction_id:
             checks["id"] = infraction_id
 
+        if from_timestamp:
+            checks["timestamp"] = Predicate.gt(from_timestamp)
+
         warnings = await self.database.select(
-            self.tables["infractions"], [], checks, fetchall=True
+            self.tables["infractions"], ["id"], checks, fetchall=True
         )
 
-        return [
-            Infraction(self, member, infraction["id"])
-            for infraction in warnings
-            if infraction["timestamp"] > from_timestamp
-        ]
+        return [Infraction(self, member, infraction["id"]) for infraction in warnings]
@@ -8,11 +8,15 @@ Please feel free to read the Discord Terms of Service https://discord.com/terms.
 
 from __future__ import annotations
 
+import asyncio
+import time
+from collections import deque
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Union, Optional
+from typing import TYPE_CHECKING, Union, Optional, List, Dict, Any
 import discord
 
 from .base import DatabaseChecker
+from .database import Predicate
 
 if TYPE_CHECKING:
     from discord.ext import commands
@@ -32,60 +36,238 @@ class InviteAccount:
             self.member, self.member.guild
         )
 
+    async def get_invite_count(self):
+        return await self.invite_tracker.get_invite_count(
+            self.member, self.member.guild
+        )
+
 
 class InviteTracker(DatabaseChecker):
-    def __init__(self, bot: commands.Bot):
+    def __init__(
+        self,
+        bot: commands.Bot,
+        warmup: bool = True,
+        warmup_concurrency: int = 4,
+        warmup_rate: Union[int, float] = 10,
+    ):
+        """
+        :param commands.Bot bot: The bot.
+        :param bool warmup: A bool indicating if the invites of every guild should be cached when the bot is ready, if False, the invites of a guild are cached on its first member join.
+        :param int warmup_concurrency: The maximum amount of invite fetches the warmup runs at once.
+        :param Union[int, float] warmup_rate: The maximum amount of invite fetches the warmup starts per second.
+        """
+
         super().__init__(
             [
                 {
                     "guild": "snowflake",
                     "member": "snowflake",
                     "members_invited": "string",
-                }
+                },
+                {"guild": "snowflake", "inviter": "snowflake", "member": "snowflake"},
             ],
-            ["invites"],
+            ["invites", "invited_members"],
+            unique_keys={
+                "invites": [("guild", "member")],
+                # Also serves the (guild, inviter) lookups and counts as its prefix.
+                "invited_members": [("guild", "inviter", "member")],
+            },
         )
         self.bot = bot
-        self.cache = {}
+        # Maps guild ids to the uses of their invites by code, the uses that were attributed to joins.
+        self.cache: Dict[int, Dict[str, int]] = {}
+
+        self._running_refreshes: Dict[int, asyncio.Task] = {}
+        self._queued_refreshes: Dict[int, asyncio.Task] = {}
+
+        self.warmup = warmup
+        self.warmup_concurrency = warmup_concurrency
+        self.warmup_rate = warmup_rate
+        self.warmup_stats = {
+            "total": 0,
+            "loaded": 0,
+            "lazy_loaded": 0,
+            "forbidden": 0,
+            "failed": 0,
+            "started_at": None,
+            "finished_at": None,
+        }
+        self._next_warmup_fetch = 0.0
 
         self.bot.loop.create_task(self.__initialize_cache())
 
         self.bot.add_listener(self.__cleanup_guild_cache, "on_guild_remove")
-        self.bot.add_listener(self.__update_guild_cache, "on_guild_add")
+        self.bot.add_listener(self.__update_guild_cache, "on_guild_join")
         self.bot.add_listener(self.__track_invite, "on_invite_create")
         self.bot.add_listener(self.__cleanup_invite, "on_invite_delete")
 
     async def get_invite(self, member: discord.Member) -> Optional[discord.Invite]:
-        for inv in await member.guild.invites():
-            for invite in self.cache[member.guild.id]:
-                if invite.revoked:
-                    self.cache[invite.guild.id].remove(invite)
-                    return
+        """
+        |coro|
+
+        Returns the invite the member joined with.
+        The invites of the guild are compared to the cached uses in a single pass, every join is attributed one
+        new use. Joins that happen at once share the same invites fetch.
+
+        :param discord.Member member: The member that joined.
+        :return: The invite, None if it could not be determined, e.g. the invite was deleted when it was used.
+        :rtype: Optional[discord.Invite]
+        """
+
+        guild = member.guild
+        invites = await self.__get_latest_invites(guild)
+
+        cached_uses = self.cache.get(guild.id)
+        if cached_uses is None:
+            # The uses of the guild were not cached before the join, there is nothing to compare them to.
+            self.cache[guild.id] = {
+                code: invite.uses for code, invite in invites.items()
+            }
+            self.warmup_stats["lazy_loaded"] += 1
+            return None
+
+        for code in [code for code in cached_uses if code not in invites]:
+            del cached_uses[code]
+
+        for code, invite in invites.items():
+            if invite.uses > cached_uses.get(code, 0):
+                cached_uses[code] = cached_uses.get(code, 0) + 1
+                return invite
+
+        return None
+
+    async def __get_latest_invites(
+        self, guild: discord.Guild
+    ) -> Dict[str, discord.Invite]:
+        refresh = self._queued_refreshes.get(guild.id)
+
+        if refresh is None:
+            refresh = self._queued_refreshes[guild.id] = self.bot.loop.create_task(
+                self.__refresh_invites(guild)
+            )
+
+        return await asyncio.shield(refresh)
+
+    async def __refresh_invites(
+        self, guild: discord.Guild
+    ) -> Dict[str, discord.Invite]:
+        # A running fetch might have been sent before the queued joins happened, the queued joins wait for it
+        # and share the next fetch.
+        running = self._running_refreshes.get(guild.id)
+        if running is not None:
+            await asyncio.wait([running])
+
+        self._running_refreshes[guild.id] = self._queued_refreshes.pop(guild.id)
+
+        try:
+            return {invite.code: invite for invite in await guild.invites()}
+        finally:
+            del self._running_refreshes[guild.id]
+
+    @DatabaseChecker.uses_database
+    async def migrate_invites(
+        self, batch_size: int = 500, delete_legacy: bool = False
+    ) -> int:
+        """
+        |coro|
+
+        Copies the invited members that are stored as NUL separated strings in the invites table to the
+        invited_members table, one row per invited member.
+        Call it once after upgrading, invited members that were already copied or registered are skipped, so it
+        is safe to run it again if it was interrupted.
+
+        :param int batch_size: The amount of legacy rows read and invited members inserted at once.
+        :param bool delete_legacy: A bool indicating if the invites table should be emptied once every row is
+            copied, the legacy rows are kept if not set.
+        :return: The amount of invited members that were copied.
+        :rtype: int
+        """
+
+        migrated = 0
+        legacy_rows = []
+
+        async for row in self.database.iterate(
+            self.tables["invites"],
+            ["guild", "member", "members_invited"],
+            batch_size=batch_size,
+        ):
+            legacy_rows.append(row)
+
+            if len(legacy_rows) >= batch_size:
+                migrated += await self.__migrate_legacy_rows(legacy_rows, batch_size)
+                legacy_rows = []
+
+        if legacy_rows:
+            migrated += await self.__migrate_legacy_rows(legacy_rows, batch_size)
+
+        if delete_legacy:
+            await self.database.delete(self.tables["invites"])
+
+        return migrated
 
-                if invite.code == inv.code and inv.uses - invite.uses == 1:
-                    await self.__update_guild_cache(member.guild)
-                    return inv
+    async def __migrate_legacy_rows(
+        self, legacy_rows: List[Dict[str, Any]], batch_size: int
+    ) -> int:
+        existing_rows = await self.database.select(
+            self.tables["invited_members"],
+            ["guild", "inviter", "member"],
+            {"inviter": Predicate.in_({row["member"] for row in legacy_rows})},
+            True,
+        )
+        invite_rows = {
+            (row["guild"], row["inviter"], row["member"]) for row in existing_rows
+        }
+
+        new_rows = []
+        for row in legacy_rows:
+            for invited_member in (row["members_invited"] or "").split("\0"):
+                if not invited_member:
+                    continue
+
+                key = (row["guild"], row["member"], int(invited_member))
+                if key not in invite_rows:
+                    invite_rows.add(key)
+                    new_rows.append(dict(zip(("guild", "inviter", "member"), key)))
+
+        async with self.database.transaction():
+            for i in range(0, len(new_rows), batch_size):
+                await self.database.insert_many(
+                    self.tables["invited_members"], new_rows[i : i + batch_size]
+                )
+
+        return len(new_rows)
 
     @DatabaseChecker.uses_database
     async def get_members_invited(
         self, user: Union[discord.User, discord.Member], guild: discord.Guild
-    ):
+    ) -> List[int]:
         invited_members = await self.database.select(
-            self.tables["invites"],
-            ["members_invited"],
-            {"guild": guild.id, "member": user.id},
+            self.tables["invited_members"],
+            ["member"],
+            {"guild": guild.id, "inviter": user.id},
+            fetchall=True,
         )
 
-        if not invited_members:
-            return []
+        return [invited_member["member"] for invited_member in invited_members]
 
-        invited_members = invited_members["members_invited"]
-        if isinstance(invited_members, str):
-            return [
-                int(invited_member)
-                for invited_member in invited_members.split("\0")
-                if invited_member
-            ]
+    @DatabaseChecker.uses_database
+    async def get_invite_count(
+        self, user: Union[discord.User, discord.Member], guild: discord.Guild
+    ) -> int:
+        """
+        |coro|
+
+        Returns the amount of members the user invited to the guild, counted by the database.
+
+        :param Union[discord.User, discord.Member] user: The inviter.
+        :param discord.Guild guild: The guild.
+        :return: The amount of invited members.
+        :rtype: int
+        """
+
+        return await self.database.count(
+            self.tables["invited_members"], {"guild": guild.id, "inviter": user.id}
+        )
 
     async def fetch_inviter(
         self, invite: discord.Invite
@@ -100,50 +282,114 @@ class InviteTracker(DatabaseChecker):
         member: discord.Member,
         inviter: Union[discord.Member, discord.User],
     ) -> None:
-        invited_members = await self.get_members_invited(inviter, invite.guild)
-        if member.id in invited_members:
-            return
+        invite_row = {
+            "guild": invite.guild.id,
+            "inviter": inviter.id,
+            "member": member.id,
+        }
 
-        invited_members.append(member.id)
-        invited_members_sql = "\0".join(
-            str(invited_member) for invited_member in invited_members
+        # The unique key turns this into a single append-only insert that skips members already registered.
+        await self.database.insertifnotexists(
+            self.tables["invited_members"], invite_row, invite_row
         )
 
-        await self.database.updateorinsert(
-            self.tables["invites"],
-            {"members_invited": invited_members_sql},
-            {"guild": invite.guild.id, "member": inviter.id},
-            {
-                "guild": invite.guild.id,
-                "member": inviter.id,
-                "members_invited": invited_members_sql,
-            },
-        )
+    def get_warmup_progress(self) -> Dict[str, Any]:
+        """
+        Returns the progress of the invite cache warmup.
+
+        :return: The amount of guilds to warm up, loaded, lazily loaded on a join, forbidden and failed, the pending guilds and the elapsed seconds.
+        :rtype: Dict[str, Any]
+        """
+
+        stats = self.warmup_stats
+        started_at = stats["started_at"]
+
+        return {
+            "total": stats["total"],
+            "loaded": stats["loaded"],
+            "lazy_loaded": stats["lazy_loaded"],
+            "forbidden": stats["forbidden"],
+            "failed": stats["failed"],
+            "pending": max(
+                stats["total"] - stats["loaded"] - stats["forbidden"] - stats["failed"],
+                0,
+            ),
+            "done": stats["finished_at"] is not None,
+            "elapsed": (stats["finished_at"] or time.monotonic()) - started_at
+            if started_at is not None
+            else 0,
+        }
 
     async def __initialize_cache(self) -> None:
         await self.bot.wait_until_ready()
 
-        for guild in self.bot.guilds:
+        if not self.warmup:
+            return
+
+        guilds = deque(self.bot.guilds)
+        self.warmup_stats["total"] = len(guilds)
+        self.warmup_stats["started_at"] = time.monotonic()
+
+        await asyncio.gather(
+            *[
+                self.__warmup_worker(guilds)
+                for _ in range(max(self.warmup_concurrency, 1))
+            ]
+        )
+
+        self.warmup_stats["finished_at"] = time.monotonic()
+
+    async def __warmup_worker(self, guilds: deque) -> None:
+        while guilds:
+            guild = guilds.popleft()
+
+            if guild.id in self.cache:
+                # The guild was loaded by a member join in the meantime.
+                self.warmup_stats["total"] -= 1
+                continue
+
+            await self.__wait_for_warmup_slot()
+
             try:
-                self.cache[guild.id] = await guild.invites()
+                invites = await guild.invites()
             except discord.Forbidden:
-                pass
+                self.warmup_stats["forbidden"] += 1
+                continue
+            except discord.HTTPException:
+                # The guild is loaded on its first member join instead.
+                self.warmup_stats["failed"] += 1
+                continue
+
+            self.cache.setdefault(
+                guild.id, {invite.code: invite.uses for invite in invites}
+            )
+            self.warmup_stats["loaded"] += 1
+
+    async def __wait_for_warmup_slot(self) -> None:
+        # The fetches are spaced evenly instead of being sent in bursts that exhaust the rate limit bucket.
+        now = time.monotonic()
+        fetch_at = max(now, self._next_warmup_fetch)
+        self._next_warmup_fetch = fetch_at + 1 / self.warmup_rate
+
+        await asyncio.sleep(fetch_at - now)
 
     async def __update_guild_cache(self, guild: discord.Guild) -> None:
         try:
-            self.cache[guild.id] = await guild.invites()
+            self.cache[guild.id] = {
+                invite.code: invite.uses for invite in await guild.invites()
+            }
         except discord.Forbidden:
             pass
 
     async def __track_invite(self, invite: discord.Invite) -> None:
-        self.cache[invite.guild.id].append(invite)
+        if invite.guild.id in self.cache:
+            self.cache[invite.guild.id][invite.code] = invite.uses or 0
 
     async def __cleanup_invite(self, invite: discord.Invite) -> None:
-        if invite in self.cache[invite.guild.id]:
-            self.cache[invite.guild.id].remove(invite)
+        self.cache.get(invite.guild.id, {}).pop(invite.code, None)
 
     async def __cleanup_guild_cache(self, guild: discord.Guild) -> None:
-        self.cache.pop(guild.id)
+        self.cache.pop(guild.id, None)
 
     @DatabaseChecker.uses_database
     def get_user_info(self, member: discord.Member) -> InviteAccount:
@@ -1,16 +1,238 @@
 from __future__ import annotations
 
+import bisect
 import math
-import time
+from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Iterable, TYPE_CHECKING, List
+from typing import Iterable, TYPE_CHECKING, List, Tuple, Union, Optional, Dict
 
-from .base import DatabaseChecker
+from .base import DatabaseChecker, CooldownStore
+from .database import Predicate
 
 if TYPE_CHECKING:
     import discord
 
 
+@dataclass
+class LevelProgress:
+    """
+    Represents the progress of a member towards their next level.
+    """
+
+    level: int
+    xp: Union[int, float]
+    initial_xp: Union[int, float]
+    next_level_xp: Union[int, float]
+
+    @property
+    def percentage(self) -> int:
+        """
+        The percentage of the way from the initial xp of the level to the next level.
+
+        :rtype: int
+        """
+
+        return min(
+            math.floor(
+                (self.xp - self.initial_xp)
+                / (self.next_level_xp - self.initial_xp)
+                * 100
+            ),
+            100,
+        )
+
+
+class LevelCurve(ABC):
+    """
+    Represents a level curve, maps the total xp of a member to their level.
+    The thresholds of the first levels are precomputed into a sorted list, so most lookups are a binary search or
+    an index. Higher levels are computed from the curve and are not stored.
+    """
+
+    PRECOMPUTED_LEVELS = 100
+
+    def __init__(self):
+        self.thresholds: List[Union[int, float]] = [
+            self.calculate_threshold(level)
+            for level in range(1, self.PRECOMPUTED_LEVELS + 1)
+        ]
+
+    @abstractmethod
+    def calculate_threshold(self, level: int) -> Union[int, float]:
+        """
+        This function is an abstract method.
+        Returns the total xp needed to level up from the level, it must increase with the level.
+
+        :param int level: The level, starting from 1.
+        :return: The xp needed for the next level.
+        :rtype: Union[int, float]
+        """
+
+    def count_thresholds(self, xp: Union[int, float]) -> int:
+        """
+        Returns the amount of levels whose threshold is at most the xp, for xp beyond the precomputed thresholds.
+        The thresholds are searched exponentially and then by bisection, curves that can be inverted override it.
+
+        :param Union[int, float] xp: The total xp, at least the last precomputed threshold.
+        :return: The amount of levels.
+        :rtype: int
+        """
+
+        low = len(self.thresholds)
+        high = low * 2
+
+        while self.calculate_threshold(high) <= xp:
+            low, high = high, high * 2
+
+        while high - low > 1:
+            middle = (low + high) // 2
+
+            if self.calculate_threshold(middle) <= xp:
+                low = middle
+            else:
+                high = middle
+
+        return low
+
+    def _correct_count(self, count: int, xp: Union[int, float]) -> int:
+        # The inverse of a curve is computed with floats and might be off by one at a threshold, the count is
+        # corrected by the thresholds around it.
+        count = max(count, 0)
+
+        if self.calculate_threshold(count + 1) <= xp:
+            return count + 1
+
+        if count > 0 and self.calculate_threshold(count) > xp:
+            return count - 1
+
+        return count
+
+    def get_level(self, xp: Union[int, float]) -> int:
+        """
+        Returns the level of a member with the xp.
+
+        :param Union[int, float] xp: The total xp.
+        :return: The level.
+        :rtype: int
+        """
+
+        if xp < self.thresholds[-1]:
+            return bisect.bisect_right(self.thresholds, xp) + 1
+
+        return self.count_thresholds(xp) + 1
+
+    def get_next_level_xp(self, level: int) -> Union[int, float]:
+        """
+        Returns the total xp needed to level up from the level.
+
+        :param int level: The level.
+        :return: The xp needed for the next level.
+        :rtype: Union[int, float]
+        """
+
+        if level <= len(self.thresholds):
+            return self.thresholds[level - 1]
+
+        return self.calculate_threshold(level)
+
+    def get_initial_xp(self, level: int) -> Union[int, float]:
+        """
+        Returns the total xp a member reaches the level at.
+
+        :param int level: The level.
+        :return: The initial xp of the level.
+        :rtype: Union[int, float]
+        """
+
+        return 0 if level <= 1 else self.get_next_level_xp(level - 1)
+
+    def get_progress(self, xp: Union[int, float]) -> LevelProgress:
+        """
+        Returns the progress of a member with the xp.
+
+        :param Union[int, float] xp: The total xp.
+        :return: The progress.
+        :rtype: LevelProgress
+        """
+
+        level = self.get_level(xp)
+        return LevelProgress(
+            level, xp, self.get_initial_xp(level), self.get_next_level_xp(level)
+        )
+
+
+class GeometricLevelCurve(LevelCurve):
+    """
+    Represents a level curve where every level needs rank_multiplier times the xp of the previous one.
+    This is the default curve of LevelingManager. A multiplier of 1 needs the same xp for every level, which is a
+    LinearLevelCurve of initial_xp.
+    """
+
+    def __init__(
+        self, initial_xp: Union[int, float] = 50, rank_multiplier: float = 1.5
+    ):
+        if initial_xp <= 0:
+            raise ValueError("The initial xp must be greater than 0.")
+
+        if rank_multiplier <= 1:
+            raise ValueError(
+                "The rank multiplier must be greater than 1, use a LinearLevelCurve for a multiplier of 1."
+            )
+
+        self.initial_xp = initial_xp
+        self.rank_multiplier = rank_multiplier
+        super().__init__()
+
+    def calculate_threshold(self, level: int) -> Union[int, float]:
+        return self.initial_xp * self.rank_multiplier ** (level - 1)
+
+    def count_thresholds(self, xp: Union[int, float]) -> int:
+        return self._correct_count(
+            math.floor(
+                (math.log(xp) - math.log(self.initial_xp))
+                / math.log(self.rank_multiplier)
+            )
+            + 1,
+            xp,
+        )
+
+
+class LinearLevelCurve(LevelCurve):
+    """
+    Represents a level curve where every level needs the same amount of xp.
+    """
+
+    def __init__(self, xp_per_level: Union[int, float] = 50):
+        if xp_per_level <= 0:
+            raise ValueError("The xp per level must be greater than 0.")
+
+        self.xp_per_level = xp_per_level
+        super().__init__()
+
+    def calculate_threshold(self, level: int) -> Union[int, float]:
+        return self.xp_per_level * level
+
+    def count_thresholds(self, xp: Union[int, float]) -> int:
+        return self._correct_count(int(xp // self.xp_per_level), xp)
+
+
+class PolynomialLevelCurve(LevelCurve):
+    """
+    Represents a level curve where the xp needed for the next level is coefficient * level ** exponent.
+    """
+
+    def __init__(self, coefficient: Union[int, float] = 50, exponent: float = 2):
+        if coefficient <= 0 or exponent <= 0:
+            raise ValueError("The coefficient and the exponent must be greater than 0.")
+
+        self.coefficient = coefficient
+        self.exponent = exponent
+        super().__init__()
+
+    def calculate_threshold(self, level: int) -> Union[int, float]:
+        return self.coefficient * level**self.exponent
+
+
 @dataclass
 class LevelingAccount:
     """
@@ -27,53 +249,60 @@ class LevelingAccount:
     def __checks(self):
         return LevelingManager.generate_checks(self.member)
 
-    async def xp(self):
-        xp_data = await self.leveling_manager.database.select(
-            self.table, ["xp"], self.__checks
+    async def __select(self):
+        return await self.leveling_manager.select_row(
+            self.table, self.__checks, self.leveling_manager.get_record_class("xp")
         )
-        return xp_data["xp"]
+
+    async def xp(self):
+        xp_data = await self.__select()
+        return xp_data.xp
 
     async def level(self):
-        rank_data = await self.leveling_manager.database.select(
-            self.table, ["rank"], self.__checks
-        )
-        return rank_data["rank"]
+        return (await self.get_progress()).level
 
     async def next_level(self):
-        level_up_data = await self.leveling_manager.database.select(
-            self.table, ["level_up"], self.__checks
-        )
-        return level_up_data["level_up"]
+        return (await self.get_progress()).next_level_xp
 
-    async def percentage_next_level(self):
-        level_up = await self.next_level()
-        xp = await self.xp()
-        initial_xp = await self.initial_rank_xp()
+    async def get_progress(self) -> LevelProgress:
+        """
+        |coro|
 
-        return min(
-            abs(math.floor(abs(xp - initial_xp) / (level_up - initial_xp) * 100)), 100
-        )
+        Returns the progress of the member, the level is derived from the xp by the level curve.
+        The xp is the only source of the level, the stored rank and level_up columns are only used by the
+        listener to detect level ups.
+
+        :return: The progress.
+        :rtype: LevelProgress
+        """
+
+        return self.leveling_manager.level_curve.get_progress(await self.xp())
+
+    async def get_rank(self) -> Optional[int]:
+        return await self.leveling_manager.get_rank(self.member)
+
+    async def percentage_next_level(self):
+        return (await self.get_progress()).percentage
 
     async def initial_rank_xp(self):
-        next_level = await self.next_level()
-        return (
-            0
-            if next_level == 50
-            else next_level / self.leveling_manager.rank_multiplier
-        )
+        return (await self.get_progress()).initial_xp
 
     async def set_xp(self, value):
-        await self.leveling_manager.database.update(
-            self.table, {"xp": value}, self.__checks
+        await self.leveling_manager.update_row(self.table, {"xp": value}, self.__checks)
+
+    async def add_xp(self, amount):
+        xp_data = await self.leveling_manager.increment_row(
+            self.table, {"xp": amount}, self.__checks, returning=True
         )
+        return xp_data["xp"]
 
     async def set_level(self, value):
-        await self.leveling_manager.database.update(
+        await self.leveling_manager.update_row(
             self.table, {"rank": value}, self.__checks
         )
 
     async def set_next_level(self, value):
-        await self.leveling_manager.database.update(
+        await self.leveling_manager.update_row(
             self.table, {"level_up": value}, self.__checks
         )
 
@@ -87,6 +316,8 @@ class LevelingManager(DatabaseChecker):
         xp_on_message=5,
         rank_multiplier=1.5,
         xp_cooldown=60,
+        buffer_writes: bool = False,
+        level_curve: Optional[LevelCurve] = None,
     ):
         super().__init__(
             [
@@ -101,18 +332,61 @@ class LevelingManager(DatabaseChecker):
                 {"guild": "snowflake", "role": "snowflake"},
             ],
             ["xp", "roles", "role_list"],
+            unique_keys={"xp": [("guild", "member")], "roles": [("guild",)]},
+            indexes={"xp": [("guild", "xp")], "role_list": [("guild",)]},
+            buffered_tables={"xp": ("guild", "member")} if buffer_writes else {},
         )
 
         self.bot = bot
         self.award_role = award_role
         self.default_role_interval = default_role_interval
         self.xp_on_message = xp_on_message
+        self._custom_level_curve = level_curve is not None
+        self.level_curve = level_curve
         self.rank_multiplier = rank_multiplier
-        self.xp_cooldown = xp_cooldown
 
-        self.cooldown_members = {}
+        self.cooldown_members = CooldownStore(xp_cooldown)
+        self._role_ladders: Dict[int, Tuple[List[int], int]] = {}
         self.add_event(self.on_database_connect)
 
+    @property
+    def rank_multiplier(self) -> float:
+        """
+        The multiplier of the xp every level needs over the previous level.
+        Changing it rebuilds the default level curve, a level curve that was passed to the manager is kept.
+
+        :rtype: float
+        """
+
+        return self._rank_multiplier
+
+    @rank_multiplier.setter
+    def rank_multiplier(self, value: float) -> None:
+        if not self._custom_level_curve:
+            # A multiplier of 1 needs the same xp for every level, the thresholds of a geometric curve would not grow.
+            self.level_curve = (
+                LinearLevelCurve()
+                if value == 1
+                else GeometricLevelCurve(rank_multiplier=value)
+            )
+
+        self._rank_multiplier = value
+
+    @property
+    def xp_cooldown(self) -> Union[int, float]:
+        """
+        The amount of seconds a member has to wait between messages that award xp.
+        Changing it applies to the members that are already on cooldown.
+
+        :rtype: Union[int, float]
+        """
+
+        return self.cooldown_members.cooldown
+
+    @xp_cooldown.setter
+    def xp_cooldown(self, value: Union[int, float]) -> None:
+        self.cooldown_members.cooldown = value
+
     @DatabaseChecker.uses_database
     async def set_interval(self, guild: discord.Guild, interval: int = None) -> None:
         """
@@ -136,6 +410,7 @@ class LevelingManager(DatabaseChecker):
         await self.database.updateorinsert(
             self.tables["roles"], sql_insert_data, {"guild": guild.id}, sql_insert_data
         )
+        self._role_ladders.pop(guild.id, None)
 
     @DatabaseChecker.uses_database
     async def get_roles(self, guild: discord.Guild) -> List[int]:
@@ -170,13 +445,41 @@ class LevelingManager(DatabaseChecker):
         :rtype: None
         """
 
-        await self.database.delete(self.tables["role_list"], {"guild": guild.id})
+        async with self.database.transaction():
+            await self.database.delete(self.tables["role_list"], {"guild": guild.id})
+            await self.database.insert_many(
+                self.tables["role_list"],
+                [{"guild": guild.id, "role": role.id} for role in roles],
+            )
+
+        self._role_ladders.pop(guild.id, None)
 
-        for role in roles:
-            await self.database.insert(
-                self.tables["role_list"], {"guild": guild.id, "role": role.id}
+    @DatabaseChecker.uses_database
+    async def get_role_ladder(self, guild: discord.Guild) -> Tuple[List[int], int]:
+        """
+        |coro|
+
+        Returns the role IDs and the role interval of the guild.
+        The ladder is cached per guild, set_roles and set_interval invalidate it.
+
+        :param discord.Guild guild: The guild.
+        :return: The role IDs and the role interval.
+        :rtype: Tuple[List[int], int]
+        """
+
+        ladder = self._role_ladders.get(guild.id)
+
+        if ladder is None:
+            interval = await self.database.select(
+                self.tables["roles"], ["interval"], {"guild": guild.id}
+            )
+            ladder = self._role_ladders[guild.id] = (
+                await self.get_roles(guild),
+                interval["interval"] if interval else self.default_role_interval,
             )
 
+        return ladder
+
     async def on_database_connect(self):
         self.bot.add_listener(self.__handle_experience, "on_message")
 
@@ -190,68 +493,96 @@ class LevelingManager(DatabaseChecker):
         if not message.guild or message.author.bot:
             return
 
-        member_cooldown = self.cooldown_members.setdefault(message.guild.id, {}).get(
-            message.author.id, 0
-        )
-
-        if (time.time() - member_cooldown) >= self.xp_cooldown:
-            await self.create_account(message.author)
-            member_account = await self.get_account(message.author)
+        if self.cooldown_members.trigger((message.guild.id, message.author.id)):
+            checks = self.generate_checks(message.author)
 
-            await member_account.set_xp(await member_account.xp() + self.xp_on_message)
-            self.cooldown_members[message.guild.id][message.author.id] = time.time()
+            # The award is a single write, it returns the row so the level is computed without selecting it.
+            account_data = await self.increment_row(
+                self.tables["xp"],
+                {"xp": self.xp_on_message},
+                checks,
+                returning=["xp", "rank"],
+            )
 
-            leveled_up = False
-            while await member_account.xp() >= await member_account.next_level():
-                await member_account.set_next_level(
-                    await member_account.next_level() * self.rank_multiplier
+            if account_data is None:
+                rank = self.level_curve.get_level(self.xp_on_message)
+                await self.database.insertifnotexists(
+                    self.tables["xp"],
+                    {
+                        **checks,
+                        "rank": rank,
+                        "xp": self.xp_on_message,
+                        "level_up": self.level_curve.get_next_level_xp(rank),
+                    },
+                    checks,
                 )
-                await member_account.set_level(await member_account.level() + 1)
-                leveled_up = True
+                leveled_up = rank > 1
+            else:
+                rank = self.level_curve.get_level(account_data["xp"])
+                leveled_up = rank > account_data["rank"]
+
+                if leveled_up:
+                    await self.update_row(
+                        self.tables["xp"],
+                        {
+                            "rank": rank,
+                            "level_up": self.level_curve.get_next_level_xp(rank),
+                        },
+                        checks,
+                    )
 
             if leveled_up:
+                member_account = LevelingAccount(self, message.author)
                 roles = []
                 if self.award_role:
-                    role_ids = await self.get_roles(message.guild)
-                    interval = await self.database.select(
-                        self.tables["roles"], ["interval"], {"guild": message.guild.id}
-                    )
-                    interval = (
-                        interval["interval"] if interval else self.default_role_interval
-                    )
-
-                    if role_ids:
-                        member_level = await member_account.level()
-
-                        if (
-                            member_level % interval == 0
-                            and member_level // interval <= len(role_ids)
-                        ):
-                            roles = [
-                                message.guild.get_role(role_id) for role_id in role_ids
-                            ][: await member_account.level() // interval]
-                            roles.reverse()
-                            roles = [role for role in roles if role]
+                    role_ids, interval = await self.get_role_ladder(message.guild)
+
+                    if (
+                        role_ids
+                        and rank % interval == 0
+                        and rank // interval <= len(role_ids)
+                    ):
+                        roles = [
+                            message.guild.get_role(role_id) for role_id in role_ids
+                        ][: rank // interval]
+                        roles.reverse()
+                        roles = [role for role in roles if role]
 
                 await self.call_event("on_level_up", message, member_account, roles)
 
                 if roles:
-                    await message.author.add_roles(*roles)
+                    # Only the roles the member is missing are added, in a single request.
+                    member_role_ids = {role.id for role in message.author.roles}
+                    missing_roles = [
+                        role for role in roles if role.id not in member_role_ids
+                    ]
+
+                    if missing_roles:
+                        await message.author.add_roles(*missing_roles)
 
     @DatabaseChecker.uses_database
     async def create_account(self, member):
         await self.database.insertifnotexists(
             self.tables["xp"],
             dict(
-                zip(self.tables_column_data[0], [member.guild.id, member.id, 1, 0, 50])
+                zip(
+                    self.tables_column_data[0],
+                    [
+                        member.guild.id,
+                        member.id,
+                        1,
+                        0,
+                        self.level_curve.get_next_level_xp(1),
+                    ],
+                )
             ),
             self.generate_checks(member),
         )
 
     @DatabaseChecker.uses_database
     async def get_account(self, member):
-        member_data = await self.database.select(
-            self.tables["xp"], [], self.generate_checks(member), True
+        member_data = await self.select_row(
+            self.tables["xp"], self.generate_checks(member)
         )
 
         if member_data:
@@ -260,19 +591,92 @@ class LevelingManager(DatabaseChecker):
         return None
 
     @DatabaseChecker.uses_database
-    async def get_leaderboard(self, guild: discord.Guild):
-        guild_info = sorted(
-            await self.database.select(
-                self.tables["xp"], [], {"guild": guild.id}, True
-            ),
-            key=lambda x: x["xp"],
-            reverse=True,
+    async def get_rank(self, member: discord.Member) -> Optional[int]:
+        """
+        |coro|
+
+        Returns the rank of the member in the leaderboard of their guild.
+        The members with more xp are counted by the database, members with the same xp share a rank.
+
+        :param discord.Member member: The member.
+        :return: The rank, None if the member does not have an account.
+        :rtype: Optional[int]
+        """
+
+        member_data = await self.select_row(
+            self.tables["xp"], self.generate_checks(member), self.get_record_class("xp")
+        )
+
+        if not member_data:
+            return None
+
+        return (
+            await self.database.count(
+                self.tables["xp"],
+                {"guild": member.guild.id, "xp": Predicate.gt(member_data.xp)},
+            )
+            + 1
+        )
+
+    @DatabaseChecker.uses_database
+    async def get_leaderboard_progress(
+        self, guild: discord.Guild, limit: int = None, offset: int = 0
+    ) -> List[Tuple[LevelingAccount, LevelProgress]]:
+        """
+        |coro|
+
+        Returns the leaderboard of the guild with the progress of every member, sorted by xp by the database.
+        The progress is computed from the fetched xp by the level curve, so the page is a single query.
+        Members that left the guild are skipped, so a page might be shorter than the limit.
+
+        :param discord.Guild guild: The guild.
+        :param int limit: The amount of rows to fetch, all the rows are fetched if not provided.
+        :param int offset: The amount of rows to skip.
+        :return: The leveling accounts and their progress.
+        :rtype: List[Tuple[LevelingAccount, LevelProgress]]
+        """
+
+        guild_info = await self.database.select(
+            self.tables["xp"],
+            [],
+            {"guild": guild.id},
+            True,
+            order_by=[("xp", "DESC")],
+            limit=limit,
+            offset=offset,
+            record_class=self.get_record_class("xp", ("member", "xp")),
         )
 
         members = []
         for member_info in guild_info:
-            member = guild.get_member(member_info["member"])
+            member = guild.get_member(member_info.member)
             if member:
-                members.append(LevelingAccount(self, member))
+                members.append(
+                    (
+                        LevelingAccount(self, member),
+                        self.level_curve.get_progress(member_info.xp),
+                    )
+                )
 
         return members
+
+    async def get_leaderboard(
+        self, guild: discord.Guild, limit: int = None, offset: int = 0
+    ) -> List[LevelingAccount]:
+        """
+        |coro|
+
+        Returns the leaderboard of the guild, sorted by xp by the database.
+        Members that left the guild are skipped, so a page might be shorter than the limit.
+
+        :param discord.Guild guild: The guild.
+        :param int limit: The amount of rows to fetch, all the rows are fetched if not provided.
+        :param int offset: The amount of rows to skip.
+        :return: The leveling accounts.
+        :rtype: List[LevelingAccount]
+        """
+
+        return [
+            account
+            for account, _ in await self.get_leaderboard_progress(guild, limit, offset)
+        ]
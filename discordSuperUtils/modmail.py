@@ -12,7 +12,11 @@ class ModMailManager(DatabaseChecker):
         self.bot = bot
         self.trigger = trigger
 
-        super().__init__([{"guild": "snowflake", "channel": "snowflake"}], ["modmail"])
+        super().__init__(
+            [{"guild": "snowflake", "channel": "snowflake"}],
+            ["modmail"],
+            unique_keys={"modmail": [("guild",)]},
+        )
 
         self.bot.add_listener(self._handle_modmail_requests, "on_message")
 
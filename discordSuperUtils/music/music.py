@@ -73,6 +73,7 @@ class MusicManager(DatabaseChecker):
                 }
             ],
             ["playlists"],
+            indexes={"playlists": [("user",)]},
         )
         self.bot = bot
         setattr(bot, self._on_voice_state_update.__name__, self._on_voice_state_update)
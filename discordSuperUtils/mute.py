@@ -2,12 +2,13 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-from typing import TYPE_CHECKING, Union, Optional, List, Any, Dict
+from typing import TYPE_CHECKING, Union, Optional, List, Any, Dict, AsyncIterator
 
 import discord
 import discord.utils
 
 from .base import DatabaseChecker
+from .database import Predicate
 from .punishments import Punisher
 
 if TYPE_CHECKING:
@@ -41,6 +42,7 @@ class MuteManager(DatabaseChecker, Punisher):
                 }
             ],
             ["mutes"],
+            indexes={"mutes": [("guild", "member"), ("timestamp_of_unmute",)]},
         )
         self.bot = bot
         self.muted_role_name = muted_role_name
@@ -62,11 +64,25 @@ class MuteManager(DatabaseChecker, Punisher):
         :rtype: List[Dict[str, Any]]
         """
 
-        return [
-            x
-            for x in await self.database.select(self.tables["mutes"], [], fetchall=True)
-            if x["timestamp_of_unmute"] <= datetime.utcnow().timestamp()
-        ]
+        return [x async for x in self.iterate_muted_members()]
+
+    @DatabaseChecker.uses_database
+    async def iterate_muted_members(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        |coro|
+
+        This function streams the members that are supposed to be unmuted but are muted, as they are read.
+
+        :return: The unmuted members.
+        :rtype: AsyncIterator[Dict[str, Any]]
+        """
+
+        async for x in self.database.iterate(
+            self.tables["mutes"],
+            [],
+            {"timestamp_of_unmute": Predicate.lte(datetime.utcnow().timestamp())},
+        ):
+            yield x
 
     async def on_member_join(self, member: discord.Member) -> None:
         """
@@ -115,7 +131,7 @@ class MuteManager(DatabaseChecker, Punisher):
         await self.bot.wait_until_ready()
 
         while not self.bot.is_closed():
-            for muted_member in await self.get_muted_members():
+            async for muted_member in self.iterate_muted_members():
                 guild = self.bot.get_guild(muted_member["guild"])
 
                 if guild is None:
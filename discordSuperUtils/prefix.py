@@ -22,7 +22,11 @@ class PrefixManager(DatabaseChecker):
         default_prefixes: Iterable[str],
         mentioned: bool = False,
     ):
-        super().__init__([{"guild": "snowflake", "prefix": "string"}], ["prefixes"])
+        super().__init__(
+            [{"guild": "snowflake", "prefix": "string"}],
+            ["prefixes"],
+            unique_keys={"prefixes": [("guild",)]},
+        )
         self.default_prefixes = default_prefixes
         self.bot = bot
         self.mentioned = mentioned
@@ -15,6 +15,7 @@ class ReactionManager(DatabaseChecker):
                 }
             ],
             ["reaction_roles"],
+            indexes={"reaction_roles": [("guild", "message")]},
         )
 
         self.bot = bot
@@ -83,7 +83,16 @@ class TemplateInfo(DictionaryConvertible):
             convert_from["explict_content_filter"] or 0
         )
 
-        return cls(*list(convert_from.values()))
+        return cls(
+            convert_from["id"],
+            convert_from["guild"],
+            convert_from["afk_timeout"],
+            convert_from["mfa_level"],
+            convert_from["verification_level"],
+            convert_from["explict_content_filter"],
+            convert_from["system_channel"],
+            convert_from["afk_channel"],
+        )
 
 
 class TemplateCategory(DictionaryConvertible):
@@ -105,7 +114,7 @@ class TemplateCategory(DictionaryConvertible):
 
     @classmethod
     def from_dict(cls, convert_from: Dict[Any, Any]) -> TemplateCategory:
-        return cls(*list(convert_from.values())[1:])
+        return cls(*[convert_from[x] for x in cls.__slots__])
 
 
 class TemplateTextChannel(DictionaryConvertible):
@@ -150,7 +159,7 @@ class TemplateTextChannel(DictionaryConvertible):
     def from_dict(cls, convert_from: Dict[str, Any]) -> TemplateTextChannel:
         convert_from["nsfw"] = bool(convert_from["nsfw"])
 
-        return cls(*list(convert_from.values())[1:])
+        return cls(*[convert_from[x] for x in cls.__slots__])
 
 
 class TemplateVoiceChannel(DictionaryConvertible):
@@ -190,7 +199,7 @@ class TemplateVoiceChannel(DictionaryConvertible):
 
     @classmethod
     def from_dict(cls, convert_from: Dict[str, Any]) -> TemplateVoiceChannel:
-        return cls(*list(convert_from.values())[1:])
+        return cls(*[convert_from[x] for x in cls.__slots__])
 
 
 class TemplateRole(DictionaryConvertible):
@@ -246,7 +255,7 @@ class TemplateRole(DictionaryConvertible):
         convert_from["hoist"] = bool(convert_from["hoist"])
         convert_from["mentionable"] = bool(convert_from["mentionable"])
 
-        return cls(*list(convert_from.values())[1:])
+        return cls(*[convert_from[x] for x in cls.__slots__])
 
 
 class PartialTemplate:
@@ -312,12 +321,14 @@ class Template:
             self.voice_channels,
             self.roles,
         )
-        await self.database.delete(self.tables["templates"], checks)
-        await self.database.delete(self.tables["categories"], checks)
-        await self.database.delete(self.tables["text_channels"], checks)
-        await self.database.delete(self.tables["voice_channels"], checks)
-        await self.database.delete(self.tables["roles"], checks)
-        await self.database.delete(self.tables["overwrites"], checks)
+        async with self.database.transaction():
+            await self.database.delete(self.tables["templates"], checks)
+            await self.database.delete(self.tables["categories"], checks)
+            await self.database.delete(self.tables["text_channels"], checks)
+            await self.database.delete(self.tables["voice_channels"], checks)
+            await self.database.delete(self.tables["roles"], checks)
+            await self.database.delete(self.tables["overwrites"], checks)
+
         return partial
 
     @staticmethod
@@ -632,106 +643,134 @@ class TemplateManager(DatabaseChecker):
 
         return await Template.get_template(self.database, self.tables, template_id)
 
-    async def write_overwrites(
-        self,
+    @staticmethod
+    def generate_overwrite_rows(
         template_id: str,
         overwrites_object: int,
-        overwrites: discord.PermissionOverwrite,
-    ) -> None:
-        self._check_database()
+        overwrites: Dict[Any, discord.PermissionOverwrite],
+    ) -> List[Dict[str, Any]]:
+        rows = []
 
         for x, y in overwrites.items():
             pairs = [pair.value for pair in y.pair()]
 
-            await self.database.insert(
-                self.tables["overwrites"],
+            rows.append(
                 {
                     "id": template_id,
                     "overwrite_object": overwrites_object,
                     "overwrite_key": x.id,
                     "overwrite_pair": pairs[0],
                     "overwrite_second_pair": pairs[1],
-                },
+                }
             )
 
+        return rows
+
+    async def write_overwrites(
+        self,
+        template_id: str,
+        overwrites_object: int,
+        overwrites: discord.PermissionOverwrite,
+    ) -> None:
+        self._check_database()
+
+        await self.database.insert_many(
+            self.tables["overwrites"],
+            self.generate_overwrite_rows(template_id, overwrites_object, overwrites),
+        )
+
     async def create_template(self, guild: discord.Guild) -> Template:
         self._check_database()
 
         template_id = str(uuid.uuid4())
 
-        await self.database.insert(
-            self.tables["templates"],
-            {
-                "guild": guild.id,
-                "id": template_id,
-                "afk_timeout": guild.afk_timeout,
-                "mfa_level": guild.mfa_level,
-                "verification_level": guild.verification_level.value,
-                "explict_content_filter": guild.explicit_content_filter.value,
-                "system_channel": guild.system_channel and guild.system_channel.id,
-                "afk_channel": guild.afk_channel and guild.afk_channel.id,
-            },
-        )
-
-        for category in guild.categories:
-            await self.write_overwrites(template_id, category.id, category.overwrites)
+        async with self.database.transaction():
             await self.database.insert(
-                self.tables["categories"],
+                self.tables["templates"],
                 {
+                    "guild": guild.id,
                     "id": template_id,
-                    "name": category.name,
-                    "position": category.position,
-                    "category_id": category.id,
+                    "afk_timeout": guild.afk_timeout,
+                    "mfa_level": guild.mfa_level,
+                    "verification_level": guild.verification_level.value,
+                    "explict_content_filter": guild.explicit_content_filter.value,
+                    "system_channel": guild.system_channel and guild.system_channel.id,
+                    "afk_channel": guild.afk_channel and guild.afk_channel.id,
                 },
             )
 
-        for channel in guild.text_channels:
-            await self.write_overwrites(template_id, channel.id, channel.overwrites)
-            await self.database.insert(
-                self.tables["text_channels"],
-                {
-                    "id": template_id,
-                    "name": channel.name,
-                    "position": channel.position,
-                    "category": channel.category_id,
-                    "topic": channel.topic,
-                    "slowmode": channel.slowmode_delay,
-                    "nsfw": int(channel.is_nsfw()),
-                    "channel_id": channel.id,
-                },
+            overwrites = []
+            for channel in (
+                guild.categories + guild.text_channels + guild.voice_channels
+            ):
+                overwrites += self.generate_overwrite_rows(
+                    template_id, channel.id, channel.overwrites
+                )
+
+            await self.database.insert_many(self.tables["overwrites"], overwrites)
+
+            await self.database.insert_many(
+                self.tables["categories"],
+                [
+                    {
+                        "id": template_id,
+                        "name": category.name,
+                        "position": category.position,
+                        "category_id": category.id,
+                    }
+                    for category in guild.categories
+                ],
             )
 
-        for voice_channel in guild.voice_channels:
-            await self.write_overwrites(
-                template_id, voice_channel.id, voice_channel.overwrites
+            await self.database.insert_many(
+                self.tables["text_channels"],
+                [
+                    {
+                        "id": template_id,
+                        "name": channel.name,
+                        "position": channel.position,
+                        "category": channel.category_id,
+                        "topic": channel.topic,
+                        "slowmode": channel.slowmode_delay,
+                        "nsfw": int(channel.is_nsfw()),
+                        "channel_id": channel.id,
+                    }
+                    for channel in guild.text_channels
+                ],
             )
-            await self.database.insert(
+
+            await self.database.insert_many(
                 self.tables["voice_channels"],
-                {
-                    "id": template_id,
-                    "name": voice_channel.name,
-                    "position": voice_channel.position,
-                    "category": voice_channel.category_id,
-                    "bitrate": voice_channel.bitrate,
-                    "user_limit": voice_channel.user_limit,
-                    "channel_id": voice_channel.id,
-                },
+                [
+                    {
+                        "id": template_id,
+                        "name": voice_channel.name,
+                        "position": voice_channel.position,
+                        "category": voice_channel.category_id,
+                        "bitrate": voice_channel.bitrate,
+                        "user_limit": voice_channel.user_limit,
+                        "channel_id": voice_channel.id,
+                    }
+                    for voice_channel in guild.voice_channels
+                ],
             )
 
-        for role in guild.roles:
-            await self.database.insert(
+            await self.database.insert_many(
                 self.tables["roles"],
-                {
-                    "id": template_id,
-                    "default_role": int(role.is_default()),
-                    "name": role.name,
-                    "color": role.color.value,
-                    "hoist": int(role.hoist),
-                    "position": role.position,
-                    "mentionable": int(role.mentionable),
-                    "role_id": role.id,
-                    "permissions": role.permissions.value,
-                },
+                [
+                    {
+                        "id": template_id,
+                        "default_role": int(role.is_default()),
+                        "name": role.name,
+                        "color": role.color.value,
+                        "hoist": int(role.hoist),
+                        "position": role.position,
+                        "mentionable": int(role.mentionable),
+                        "role_id": role.id,
+                        "permissions": role.permissions.value,
+                    }
+                    for role in guild.roles
+                ],
             )
 
         return await Template.get_template(self.database, self.tables, template_id)
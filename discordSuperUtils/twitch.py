@@ -76,6 +76,7 @@ class TwitchManager(DatabaseChecker):
             [
                 "channels",
             ],
+            indexes={"channels": [("guild",)]},
         )
         self.bot = bot
 
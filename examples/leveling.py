@@ -35,9 +35,7 @@ async def rank(ctx, member: discord.Member = None):
         await ctx.send(f"I am still creating your account! please wait a few seconds.")
         return
 
-    guild_leaderboard = await LevelingManager.get_leaderboard(ctx.guild)
-    member = [x for x in guild_leaderboard if x.member == mem_obj]
-    member_rank = guild_leaderboard.index(member[0]) + 1 if member else -1
+    member_rank = await member_data.get_rank()
 
     image = await ImageManager.create_leveling_profile(
         member=mem_obj,
@@ -70,9 +68,10 @@ async def set_roles(ctx, interval: int, *roles: discord.Role):
 
 @bot.command()
 async def leaderboard(ctx):
-    guild_leaderboard = await LevelingManager.get_leaderboard(ctx.guild)
+    guild_leaderboard = await LevelingManager.get_leaderboard_progress(ctx.guild)
     formatted_leaderboard = [
-        f"Member: {x.member}, XP: {await x.xp()}" for x in guild_leaderboard
+        f"Member: {account.member}, Level: {progress.level}, XP: {progress.xp}"
+        for account, progress in guild_leaderboard
     ]
 
     await discordSuperUtils.PageManager(
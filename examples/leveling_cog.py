@@ -45,9 +45,7 @@ class Leveling(commands.Cog, discordSuperUtils.CogManager.Cog):
             )
             return
 
-        guild_leaderboard = await self.LevelingManager.get_leaderboard(ctx.guild)
-        member = [x for x in guild_leaderboard if x.member == mem_obj]
-        member_rank = guild_leaderboard.index(member[0]) + 1 if member else -1
+        member_rank = await member_data.get_rank()
 
         image = await self.ImageManager.create_leveling_profile(
             member=mem_obj,
@@ -79,9 +77,12 @@ class Leveling(commands.Cog, discordSuperUtils.CogManager.Cog):
 
     @commands.command()
     async def leaderboard(self, ctx):
-        guild_leaderboard = await self.LevelingManager.get_leaderboard(ctx.guild)
+        guild_leaderboard = await self.LevelingManager.get_leaderboard_progress(
+            ctx.guild
+        )
         formatted_leaderboard = [
-            f"Member: {x.member}, XP: {await x.xp()}" for x in guild_leaderboard
+            f"Member: {account.member}, Level: {progress.level}, XP: {progress.xp}"
+            for account, progress in guild_leaderboard
         ]
 
         await discordSuperUtils.PageManager(
@@ -0,0 +1,159 @@
+import asyncio
+
+import asyncpg
+
+import discordSuperUtils
+from discordSuperUtils import Predicate
+from tester import Tester
+
+TABLE = "scores"
+
+
+async def start_testing():
+    """
+    Checks the queries the asyncpg backend sends, using a pool of a connection that records its calls instead of
+    a server.
+
+    RESULTS
+    --------
+        numbered_queries: Passed
+        in_sizes: Passed
+        insert_many_copy: Passed
+
+    Conclusion
+    ----------
+        The placeholders are numbered in the order of the values of every query, including the predicates, the
+        paging and the upsert clause. An IN of a different size compiles its own template.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(
+        numbered_queries,
+        [
+            (
+                "UPDATE scores SET value = $1 WHERE id IN ($2, $3) AND value BETWEEN $4 AND $5",
+                [1, 1, 2, 0, 5],
+            ),
+            (
+                "UPDATE scores SET value = COALESCE(value, 0) + $1 WHERE id = $2 RETURNING value",
+                [1, 1],
+            ),
+            (
+                "SELECT id FROM scores WHERE value > $1 ORDER BY value DESC LIMIT $2 OFFSET $3",
+                [3, 2, 4],
+            ),
+            (
+                "INSERT INTO scores (id, value) VALUES ($1, $2) ON CONFLICT (id) DO UPDATE SET value = $3",
+                [1, 0, 2],
+            ),
+            ("DELETE FROM scores WHERE id <> $1", [1]),
+            ("SELECT COUNT(*) FROM scores WHERE id = $1 AND value <= $2", [3, 1]),
+        ],
+    )
+    tester.add_test(
+        in_sizes,
+        [
+            "DELETE FROM scores WHERE id IN ($1)",
+            "DELETE FROM scores WHERE id IN ($1, $2, $3)",
+            "DELETE FROM scores WHERE id IN ($1)",
+        ],
+    )
+    tester.add_test(
+        insert_many_copy,
+        [
+            ("copy", TABLE, ("id", "value"), [[1, 10], [2, 20]]),
+            ("copy", TABLE, ("id",), [[3]]),
+        ],
+    )
+    await tester.run()
+
+
+class Record(tuple):
+    def keys(self):
+        return ["count"]
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.calls = []
+
+    async def fetch(self, query, *values):
+        self.calls.append((query, list(values)))
+        return [Record((0,))] if query.startswith("SELECT COUNT") else []
+
+    async def copy_records_to_table(self, table_name, records, columns):
+        self.calls.append(("copy", table_name, tuple(columns), list(records)))
+
+
+class RecordingPool:
+    def __init__(self):
+        self.connection = RecordingConnection()
+
+    async def acquire(self):
+        return self.connection
+
+    async def release(self, connection):
+        pass
+
+
+async def create_database():
+    # The pool is never awaited, so it does not connect. The database is given a recording pool instead.
+    database = discordSuperUtils.DatabaseManager.connect(
+        asyncpg.create_pool("postgresql://localhost/test")
+    )
+    database.database = RecordingPool()
+
+    await database.create_table(
+        TABLE, {"id": "BIGINT", "value": "BIGINT"}, True, unique_keys=[("id",)]
+    )
+    database.database.connection.calls.clear()
+
+    return database, database.database.connection
+
+
+async def numbered_queries():
+    database, connection = await create_database()
+
+    await database.update(
+        TABLE,
+        {"value": 1},
+        {"id": Predicate.in_([1, 2]), "value": Predicate.between(0, 5)},
+    )
+    await database.increment(TABLE, {"value": 1}, {"id": 1}, True)
+    await database.select(
+        TABLE,
+        ["id"],
+        {"value": Predicate.gt(3)},
+        fetchall=True,
+        order_by=[("value", "DESC")],
+        limit=2,
+        offset=4,
+    )
+    await database.updateorinsert(TABLE, {"value": 2}, {"id": 1}, {"id": 1, "value": 0})
+    await database.delete(TABLE, {"id": Predicate.ne(1)})
+    await database.count(TABLE, {"id": 3, "value": Predicate.lte(1)})
+
+    return connection.calls
+
+
+async def in_sizes():
+    database, connection = await create_database()
+
+    for ids in ([1], [1, 2, 3], [4]):
+        await database.delete(TABLE, {"id": Predicate.in_(ids)})
+
+    return [query for query, _ in connection.calls]
+
+
+async def insert_many_copy():
+    database, connection = await create_database()
+
+    await database.insert_many(
+        TABLE, [{"id": 1, "value": 10}, {"id": 2, "value": 20}, {"id": 3}]
+    )
+
+    return connection.calls
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
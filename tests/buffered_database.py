@@ -0,0 +1,281 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "counters"
+
+
+async def start_testing():
+    """
+    Checks the write-behind behaviour of BufferedDatabase on sqlite and on the memory backend.
+    Every test returns its result for both backends.
+
+    RESULTS
+    --------
+        coalesced_updates: Passed
+        flush_on_max_pending: Passed
+        flush_on_interval: Passed
+        flush_on_close: Passed
+        interleaved_direct_increment: Passed
+        failed_flush_keeps_writes: Passed
+        buffered_currency_changes: Passed
+        buffered_increment_returning: Passed
+        update_of_missing_row: Passed
+
+    Conclusion
+    ----------
+        The updates of a row are written once, and the buffered increments are written as increments, so an
+        increment made directly on the same row before the flush is not overwritten. Increments of a row that is
+        not pending are buffered too, the row is read once to answer the increments that return their values.
+        The pending writes of a row that does not exist do not make it selectable.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(coalesced_updates, [(1, 1, 99)] * 2)
+    tester.add_test(flush_on_max_pending, [(1, 0, [1] * 10)] * 2)
+    tester.add_test(flush_on_interval, [(0, 1)] * 2)
+    tester.add_test(flush_on_close, 7)
+    tester.add_test(interleaved_direct_increment, [105] * 2)
+    tester.add_test(failed_flush_keeps_writes, [(1, 30)] * 2)
+    tester.add_test(buffered_currency_changes, [(100, 0, 1, 100, 100)] * 2)
+    tester.add_test(buffered_increment_returning, [([1, 2, 3], 1, 0, None, 3)] * 2)
+    tester.add_test(update_of_missing_row, [(None, None, None, 1, None)] * 2)
+    await tester.run()
+
+
+async def get_databases():
+    databases = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE,
+            {"id": "INTEGER", "name": "TEXT", "value": "INTEGER"},
+            True,
+            unique_keys=[("id",)],
+        )
+        await database.insert_many(
+            TABLE, [{"id": i, "name": "", "value": 0} for i in range(10)]
+        )
+        databases.append(database)
+
+    return databases
+
+
+def buffer(database, **kwargs):
+    buffered_database = discordSuperUtils.BufferedDatabase(database, **kwargs)
+    buffered_database.buffer_table(TABLE, ("id",))
+
+    return buffered_database
+
+
+async def get_value(database, row_id):
+    return (await database.select(TABLE, ["value"], {"id": row_id}))["value"]
+
+
+async def for_each_backend(test):
+    results = []
+
+    for database in await get_databases():
+        results.append(await test(database))
+        await database.close()
+
+    return results
+
+
+async def coalesced_updates():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+
+        for i in range(100):
+            await buffered_database.update(TABLE, {"value": i}, {"id": 1})
+
+        await buffered_database.flush()
+        stats = buffered_database.stats()
+
+        return stats["flushes"], stats["flushed_writes"], await get_value(database, 1)
+
+    return await for_each_backend(test)
+
+
+async def flush_on_max_pending():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60, max_pending=10)
+
+        for i in range(10):
+            await buffered_database.update(TABLE, {"value": 1}, {"id": i})
+
+        stats = buffered_database.stats()
+        values = [await get_value(database, i) for i in range(10)]
+
+        return stats["flushes"], stats["pending"], values
+
+    return await for_each_backend(test)
+
+
+async def flush_on_interval():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=0.05)
+
+        await buffered_database.update(TABLE, {"value": 1}, {"id": 1})
+        before = await get_value(database, 1)
+        await asyncio.sleep(0.2)
+
+        return before, await get_value(database, 1)
+
+    return await for_each_backend(test)
+
+
+async def flush_on_close():
+    store = discordSuperUtils.MemoryStore()
+    database = discordSuperUtils.DatabaseManager.connect(store)
+    await database.create_table(TABLE, None, True, unique_keys=[("id",)])
+    await database.insert(TABLE, {"id": 1, "value": 0})
+
+    buffered_database = buffer(database, flush_interval=60)
+    await buffered_database.update(TABLE, {"value": 7}, {"id": 1})
+    await buffered_database.close()
+
+    return await get_value(discordSuperUtils.DatabaseManager.connect(store), 1)
+
+
+async def interleaved_direct_increment():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+
+        await buffered_database.update(TABLE, {"name": "counter"}, {"id": 1})
+        await buffered_database.increment(TABLE, {"value": 5}, {"id": 1})
+
+        # Another connection increments the row before the flush.
+        await database.increment(TABLE, {"value": 100}, {"id": 1})
+        await buffered_database.flush()
+
+        return await get_value(database, 1)
+
+    return await for_each_backend(test)
+
+
+async def failed_flush_keeps_writes():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+
+        await buffered_database.update(TABLE, {"name": "counter"}, {"id": 1})
+        await buffered_database.increment(TABLE, {"value": 10}, {"id": 1})
+
+        inner_update = database.update
+
+        async def failing_update(*args):
+            raise RuntimeError("The database is unavailable.")
+
+        database.update = failing_update
+        try:
+            await buffered_database.flush()
+        except RuntimeError:
+            pass
+
+        database.update = inner_update
+        await buffered_database.increment(TABLE, {"value": 20}, {"id": 1})
+        await buffered_database.flush()
+
+        return buffered_database.stats()["flushes"], await get_value(database, 1)
+
+    return await for_each_backend(test)
+
+
+async def buffered_currency_changes():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+        economy_manager = discordSuperUtils.EconomyManager(None, buffer_writes=True)
+        await economy_manager.connect_to_database(buffered_database)
+
+        member = SimpleNamespace(id=1, guild=SimpleNamespace(id=1))
+        await economy_manager.create_account(member)
+        account = await economy_manager.get_account(member)
+
+        instrumentation = database.enable_instrumentation()
+        for _ in range(100):
+            await account.change_currency(1)
+
+        operations = instrumentation.stats()
+        database.disable_instrumentation()
+        currency = await account.currency()
+        await buffered_database.flush()
+
+        return (
+            buffered_database.stats()["buffered_writes"],
+            len(operations.get("increment", {})),
+            buffered_database.stats()["flushed_writes"],
+            currency,
+            (
+                await economy_manager.select_row(
+                    economy_manager.tables["economy"],
+                    economy_manager.generate_checks(member),
+                )
+            )["currency"],
+        )
+
+    return await for_each_backend(test)
+
+
+async def buffered_increment_returning():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+
+        instrumentation = database.enable_instrumentation()
+        values = [
+            (await buffered_database.increment(TABLE, {"value": 1}, {"id": 1}, True))[
+                "value"
+            ]
+            for _ in range(3)
+        ]
+        operations = instrumentation.stats()
+        database.disable_instrumentation()
+
+        missing = await buffered_database.increment(
+            TABLE, {"value": 1}, {"id": 100}, True
+        )
+        await buffered_database.flush()
+
+        return (
+            values,
+            operations["select"][TABLE]["calls"],
+            len(operations.get("increment", {})),
+            missing,
+            await get_value(database, 1),
+        )
+
+    return await for_each_backend(test)
+
+
+async def update_of_missing_row():
+    async def test(database):
+        buffered_database = buffer(database, flush_interval=60)
+
+        # The row does not exist, the update is kept pending until the flush, which updates nothing.
+        await buffered_database.update(TABLE, {"value": 5}, {"id": 100})
+        before = await buffered_database.select(TABLE, ["value"], {"id": 100})
+        incremented = await buffered_database.increment(
+            TABLE, {"value": 1}, {"id": 100}, True
+        )
+        await buffered_database.flush()
+
+        return (
+            before,
+            incremented,
+            await buffered_database.select(TABLE, ["value"], {"id": 100}),
+            buffered_database.stats()["flushes"],
+            await database.select(TABLE, ["value"], {"id": 100}),
+        )
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,98 @@
+import asyncio
+from types import SimpleNamespace
+
+import discordSuperUtils
+from tester import Tester
+
+
+async def start_testing():
+    """
+    Checks CooldownStore and the xp cooldown of LevelingManager.
+
+    RESULTS
+    --------
+        store_cooldowns: Passed
+        store_max_size: Passed
+        changed_cooldown: Passed
+        changed_xp_cooldown: Passed
+
+    Conclusion
+    ----------
+        The expired keys are pruned, and a changed cooldown applies to the keys that are already on cooldown.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(store_cooldowns, (True, False, True, False, True))
+    tester.add_test(store_max_size, (3, False, True))
+    tester.add_test(changed_cooldown, (True, False, True))
+    tester.add_test(changed_xp_cooldown, (60, [5, 5, 10, 10, 15]))
+    await tester.run()
+
+
+async def store_cooldowns():
+    store = discordSuperUtils.CooldownStore(0.05)
+
+    started = store.trigger(1)
+    triggered_again = store.trigger(1)
+    on_cooldown = store.is_on_cooldown(1)
+    await asyncio.sleep(0.1)
+
+    return (
+        started,
+        triggered_again,
+        on_cooldown,
+        store.is_on_cooldown(1),
+        store.trigger(1),
+    )
+
+
+async def store_max_size():
+    store = discordSuperUtils.CooldownStore(60, max_size=3)
+
+    for key in range(4):
+        store.trigger(key)
+
+    # The key that is the closest to expiring is dropped.
+    return len(store), store.is_on_cooldown(0), store.is_on_cooldown(3)
+
+
+async def changed_cooldown():
+    store = discordSuperUtils.CooldownStore(60)
+    store.trigger(1)
+    on_cooldown = store.is_on_cooldown(1)
+
+    store.cooldown = 0
+    not_on_cooldown = not store.is_on_cooldown(1)
+
+    store.cooldown = 60
+    return on_cooldown, store.is_on_cooldown(1), not_on_cooldown
+
+
+async def changed_xp_cooldown():
+    listeners = {}
+    bot = SimpleNamespace(
+        add_listener=lambda func, name: listeners.setdefault(name, func)
+    )
+
+    database = discordSuperUtils.DatabaseManager.connect(
+        discordSuperUtils.MemoryStore()
+    )
+    leveling_manager = discordSuperUtils.LevelingManager(bot, xp_cooldown=60)
+    await leveling_manager.connect_to_database(database)
+
+    guild = SimpleNamespace(id=1)
+    member = SimpleNamespace(id=1, bot=False, guild=guild)
+    message = SimpleNamespace(guild=guild, author=member)
+
+    xp = []
+    for cooldown in [60, 60, 0, 60, 0]:
+        leveling_manager.xp_cooldown = cooldown
+        await listeners["on_message"](message)
+        xp.append(await (await leveling_manager.get_account(member)).xp())
+
+    leveling_manager.xp_cooldown = 60
+    return leveling_manager.cooldown_members.cooldown, xp
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
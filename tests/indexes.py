@@ -0,0 +1,128 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+
+import aiomysql
+import aiosqlite
+
+import discordSuperUtils
+from discordSuperUtils.database import DATABASE_TYPES, get_index_name
+from tester import Tester
+
+
+async def start_testing():
+    """
+    Checks the indexes the managers declare, on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        indexes_created: Passed
+        repeated_connect: Passed
+        index_capabilities: Passed
+
+    Conclusion
+    ----------
+        The declared indexes and unique keys are created with the tables, connecting again does not fail or
+        create them twice.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(indexes_created, [True] * 2)
+    tester.add_test(repeated_connect, [([], True, 1)] * 2)
+    tester.add_test(index_capabilities, (True, False))
+    await tester.run()
+
+
+class WarningHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+async def get_index_names(database, table_name):
+    if isinstance(database.database, discordSuperUtils.MemoryStore):
+        return set(database.database.indexes.get(table_name, {}))
+
+    rows = await database.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?",
+        [table_name],
+    )
+    return {row["name"] for row in rows}
+
+
+def get_expected_index_names(leveling_manager):
+    table_name = leveling_manager.tables["xp"]
+
+    return {
+        get_index_name(table_name, ("guild", "member"), True),
+        get_index_name(table_name, ("guild", "xp")),
+    }
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        leveling_manager = discordSuperUtils.LevelingManager(
+            SimpleNamespace(add_listener=lambda *args: None)
+        )
+        await leveling_manager.connect_to_database(database)
+
+        results.append(await test(database, leveling_manager))
+        await database.close()
+
+    return results
+
+
+async def indexes_created():
+    async def test(database, leveling_manager):
+        return get_expected_index_names(leveling_manager) <= await get_index_names(
+            database, leveling_manager.tables["xp"]
+        )
+
+    return await for_each_backend(test)
+
+
+async def repeated_connect():
+    async def test(database, leveling_manager):
+        member = SimpleNamespace(id=1, guild=SimpleNamespace(id=1))
+        await leveling_manager.create_account(member)
+        index_names = await get_index_names(database, leveling_manager.tables["xp"])
+
+        handler = WarningHandler()
+        logging.getLogger().addHandler(handler)
+        try:
+            for _ in range(2):
+                await leveling_manager.connect_to_database(database)
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+        # The unique key still makes the account creation an upsert.
+        await leveling_manager.create_account(member)
+
+        return (
+            handler.messages,
+            index_names
+            == await get_index_names(database, leveling_manager.tables["xp"]),
+            await database.count(leveling_manager.tables["xp"]),
+        )
+
+    return await for_each_backend(test)
+
+
+async def index_capabilities():
+    return (
+        DATABASE_TYPES[aiosqlite.Connection]["indexifnotexists"],
+        DATABASE_TYPES[aiomysql.Pool]["indexifnotexists"],
+    )
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
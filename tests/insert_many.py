@@ -0,0 +1,119 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from discordSuperUtils.database import _SqlDatabase
+from tester import Tester
+
+TABLE = "rows"
+ROWS = [
+    {"id": 1, "name": "a"},
+    {"id": 2, "name": "b", "value": 2},
+    {"id": 3, "name": "c"},
+    {"name": "d", "id": 4},
+    {"id": 5, "name": "e", "value": 5},
+]
+
+
+async def start_testing():
+    """
+    Checks Database.insert_many on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        grouped_rows: Passed
+        inserted_rows: Passed
+        no_rows: Passed
+        rolled_back_rows: Passed
+
+    Conclusion
+    ----------
+        Rows with the same columns are inserted by one statement, and every row is inserted with its own values.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(
+        grouped_rows,
+        {
+            ("id", "name"): [[1, "a"], [3, "c"]],
+            ("id", "name", "value"): [[2, "b", 2], [5, "e", 5]],
+            ("name", "id"): [["d", 4]],
+        },
+    )
+    tester.add_test(
+        inserted_rows,
+        [
+            [
+                {"id": 1, "name": "a", "value": None},
+                {"id": 2, "name": "b", "value": 2},
+                {"id": 3, "name": "c", "value": None},
+                {"id": 4, "name": "d", "value": None},
+                {"id": 5, "name": "e", "value": 5},
+            ]
+        ]
+        * 2,
+    )
+    tester.add_test(no_rows, [0] * 2)
+    tester.add_test(rolled_back_rows, [0] * 2)
+    await tester.run()
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "name": "TEXT", "value": "INTEGER"}, True
+        )
+
+        results.append(await test(database))
+        await database.close()
+
+    return results
+
+
+async def grouped_rows():
+    return _SqlDatabase.group_rows(ROWS)
+
+
+async def inserted_rows():
+    async def test(database):
+        # Any iterable of rows is accepted.
+        await database.insert_many(TABLE, (row for row in ROWS))
+
+        return await database.select(
+            TABLE, ["id", "name", "value"], fetchall=True, order_by=[("id", "ASC")]
+        )
+
+    return await for_each_backend(test)
+
+
+async def no_rows():
+    async def test(database):
+        await database.insert_many(TABLE, [])
+        return await database.count(TABLE)
+
+    return await for_each_backend(test)
+
+
+async def rolled_back_rows():
+    async def test(database):
+        try:
+            async with database.transaction():
+                await database.insert_many(TABLE, ROWS)
+                raise RuntimeError("The rows are rolled back.")
+        except RuntimeError:
+            pass
+
+        return await database.count(TABLE)
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
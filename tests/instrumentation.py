@@ -0,0 +1,184 @@
+import asyncio
+import logging
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "scores"
+
+
+async def start_testing():
+    """
+    Checks the statistics and the slow query log of DatabaseInstrumentation on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        calls_and_rows: Passed
+        errors: Passed
+        histogram: Passed
+        slow_query_log: Passed
+        disabled: Passed
+
+    Conclusion
+    ----------
+        Every call is counted by operation and table with the rows it returned or wrote, failed calls are counted as
+        errors. The slow calls are logged with their compiled query on sqlite and with their arguments on the memory
+        backend, and disabling the instrumentation restores the methods.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(
+        calls_and_rows,
+        [
+            {
+                "insert_many": (1, 3),
+                "insert": (1, 1),
+                "select": (3, 5),
+                "count": (1, 0),
+                "update": (2, 0),
+            }
+        ]
+        * 2,
+    )
+    tester.add_test(errors, [(1, 1, 0)] * 2)
+    tester.add_test(histogram, [(5, 5, True)] * 2)
+    tester.add_test(
+        slow_query_log,
+        [
+            [
+                "Slow database call: select on 'scores'",
+                "Query: (['value'], {'id': 1})",
+            ],
+            [
+                "Slow database call: select on 'scores'",
+                "Query: SELECT value FROM scores WHERE id = ?",
+            ],
+        ],
+    )
+    tester.add_test(disabled, [(True, None, 1)] * 2)
+    await tester.run()
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "value": "INTEGER"}, True, unique_keys=[("id",)]
+        )
+        await database.insert_many(TABLE, [{"id": i, "value": i} for i in range(3)])
+
+        results.append(await test(database))
+        database.disable_instrumentation()
+        await database.close()
+
+    return results
+
+
+async def calls_and_rows():
+    async def test(database):
+        instrumentation = database.enable_instrumentation()
+
+        await database.insert_many(TABLE, ({"id": i, "value": i} for i in range(3, 6)))
+        await database.insert(TABLE, {"id": 6, "value": 6})
+        await database.select(TABLE, ["id"], fetchall=True, limit=4)
+        await database.select(TABLE, ["id"], {"id": 1})
+        await database.select(TABLE, ["id"], {"id": 100})
+        await database.count(TABLE)
+        await database.update(TABLE, {"value": 0}, {"id": 1})
+        await database.update(TABLE, {"value": 0}, {"id": 2})
+
+        return {
+            operation: (operation_stats[TABLE]["calls"], operation_stats[TABLE]["rows"])
+            for operation, operation_stats in instrumentation.stats().items()
+        }
+
+    return await for_each_backend(test)
+
+
+async def errors():
+    async def test(database):
+        instrumentation = database.enable_instrumentation()
+
+        try:
+            await database.execute("SELECT missing FROM nowhere")
+        except Exception:
+            pass
+
+        stats = instrumentation.stats()["execute"][None]
+
+        return stats["calls"], stats["errors"], stats["rows"]
+
+    return await for_each_backend(test)
+
+
+async def histogram():
+    async def test(database):
+        instrumentation = database.enable_instrumentation()
+
+        for i in range(5):
+            await database.select(TABLE, [], {"id": i})
+
+        stats = instrumentation.stats()["select"][TABLE]
+
+        return (
+            stats["calls"],
+            sum(stats["histogram"].values()),
+            stats["max_ms"] >= stats["average_ms"] > 0,
+        )
+
+    return await for_each_backend(test)
+
+
+async def slow_query_log():
+    async def test(database):
+        handler = RecordingHandler()
+        logging.getLogger().addHandler(handler)
+
+        # Every call is slower than a threshold of 0.
+        database.enable_instrumentation(slow_query_threshold=0)
+        try:
+            await database.select(TABLE, ["value"], {"id": 1})
+        finally:
+            logging.getLogger().removeHandler(handler)
+
+        message = handler.messages[0]
+
+        return [message.split(" took ")[0], "Query: " + message.split("Query: ")[1]]
+
+    return await for_each_backend(test)
+
+
+async def disabled():
+    async def test(database):
+        instrumentation = database.enable_instrumentation()
+        await database.select(TABLE, [], {"id": 1})
+        database.disable_instrumentation()
+        await database.select(TABLE, [], {"id": 1})
+
+        return (
+            "select" not in vars(database),
+            database.instrumentation,
+            instrumentation.stats()["select"][TABLE]["calls"],
+        )
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
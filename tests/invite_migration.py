@@ -0,0 +1,161 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+
+async def start_testing():
+    """
+    Checks the migration of the legacy invites table on sqlite and on the memory backend.
+    The legacy table stores the invited members of every inviter as a NUL separated string.
+
+    RESULTS
+    --------
+        not_migrated_on_connect: Passed
+        migrated_in_batches: Passed
+        migration_is_repeatable: Passed
+        legacy_rows_deleted_on_request: Passed
+
+    Conclusion
+    ----------
+        The migration only runs when it is called, it copies the rows in batches and keeps the legacy rows
+        unless it is asked to delete them.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(not_migrated_on_connect, [(0, 0)] * 2)
+    tester.add_test(migrated_in_batches, [(7, [1, 2, 3], [4], [], 4, 4)] * 2)
+    tester.add_test(migration_is_repeatable, [(1, 0, [1, 2, 3])] * 2)
+    tester.add_test(legacy_rows_deleted_on_request, [(7, 0, 7)] * 2)
+    await tester.run()
+
+
+async def wait_until_ready():
+    pass
+
+
+def create_bot():
+    return SimpleNamespace(
+        loop=asyncio.get_event_loop(),
+        guilds=[],
+        add_listener=lambda *args: None,
+        wait_until_ready=wait_until_ready,
+    )
+
+
+async def create_invite_tracker(connection):
+    database = discordSuperUtils.DatabaseManager.connect(connection)
+    invite_tracker = discordSuperUtils.InviteTracker(create_bot())
+    await invite_tracker.connect_to_database(database)
+
+    await database.insert_many(
+        invite_tracker.tables["invites"],
+        [
+            {"guild": 1, "member": 10, "members_invited": "1\0" + "2\0" + "3"},
+            {"guild": 1, "member": 11, "members_invited": "4"},
+            {"guild": 1, "member": 12, "members_invited": ""},
+            {"guild": 2, "member": 10, "members_invited": "5\0" + "6\0" + "7\0" + "7"},
+        ],
+    )
+
+    return database, invite_tracker
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database, invite_tracker = await create_invite_tracker(connection)
+        results.append(await test(database, invite_tracker))
+        await database.close()
+
+    return results
+
+
+def get_member(guild_id, member_id):
+    return SimpleNamespace(id=member_id, guild=SimpleNamespace(id=guild_id))
+
+
+async def get_invited(invite_tracker, guild_id, member_id):
+    return sorted(
+        await invite_tracker.get_members_invited(
+            get_member(guild_id, member_id), SimpleNamespace(id=guild_id)
+        )
+    )
+
+
+async def not_migrated_on_connect():
+    async def test(database, invite_tracker):
+        # Connecting again must not copy the legacy rows.
+        await invite_tracker.connect_to_database(database)
+
+        return (
+            await database.count(invite_tracker.tables["invited_members"]),
+            await invite_tracker.get_invite_count(
+                get_member(1, 10), SimpleNamespace(id=1)
+            ),
+        )
+
+    return await for_each_backend(test)
+
+
+async def migrated_in_batches():
+    async def test(database, invite_tracker):
+        instrumentation = database.enable_instrumentation()
+        migrated = await invite_tracker.migrate_invites(batch_size=2)
+        operations = instrumentation.stats()
+        database.disable_instrumentation()
+
+        return (
+            migrated,
+            await get_invited(invite_tracker, 1, 10),
+            await get_invited(invite_tracker, 1, 11),
+            await get_invited(invite_tracker, 1, 12),
+            operations["insert_many"][invite_tracker.tables["invited_members"]][
+                "calls"
+            ],
+            await database.count(invite_tracker.tables["invites"]),
+        )
+
+    return await for_each_backend(test)
+
+
+async def migration_is_repeatable():
+    async def test(database, invite_tracker):
+        # A member registered before the migration ran is not copied twice.
+        await database.insert(
+            invite_tracker.tables["invited_members"],
+            {"guild": 1, "inviter": 10, "member": 1},
+        )
+        await invite_tracker.migrate_invites()
+
+        return (
+            await database.count(
+                invite_tracker.tables["invited_members"], {"member": 1}
+            ),
+            await invite_tracker.migrate_invites(),
+            await get_invited(invite_tracker, 1, 10),
+        )
+
+    return await for_each_backend(test)
+
+
+async def legacy_rows_deleted_on_request():
+    async def test(database, invite_tracker):
+        return (
+            await invite_tracker.migrate_invites(delete_legacy=True),
+            await database.count(invite_tracker.tables["invites"]),
+            await database.count(invite_tracker.tables["invited_members"]),
+        )
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
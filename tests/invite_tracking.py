@@ -0,0 +1,260 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import discord
+
+import discordSuperUtils
+from tester import Tester
+
+
+async def start_testing():
+    """
+    Checks the attribution of member joins to invites and the warmup of the invite cache of InviteTracker, using
+    guilds that return their invites from memory.
+
+    RESULTS
+    --------
+        simultaneous_joins: Passed
+        simultaneous_joins_on_one_invite: Passed
+        join_during_fetch: Passed
+        deleted_and_created_invites: Passed
+        lazy_loaded_guild: Passed
+        warmup_concurrency: Passed
+        warmup_rate: Passed
+        warmup_errors: Passed
+        warmup_disabled: Passed
+
+    Conclusion
+    ----------
+        Joins that happen at once share a single invites fetch and every join is attributed one new use, a join
+        that happens during a fetch waits for the next one. The warmup keeps to its concurrency and rate, guilds
+        it could not load are loaded on their first member join.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(simultaneous_joins, ([None, "a", "b"], 1))
+    tester.add_test(simultaneous_joins_on_one_invite, (["a", "a"], 1, {"a": 2}))
+    tester.add_test(join_during_fetch, (["a", "b"], 2))
+    tester.add_test(deleted_and_created_invites, (None, "c", {"c": 1}))
+    tester.add_test(lazy_loaded_guild, (None, "a", 1))
+    tester.add_test(warmup_concurrency, (10, 2, True, 0))
+    tester.add_test(warmup_rate, True)
+    tester.add_test(warmup_errors, ((1, 1, 1, 0), {2: {"a": 0}}))
+    tester.add_test(warmup_disabled, (0, {}))
+    await tester.run()
+
+
+async def wait_until_ready():
+    pass
+
+
+class Guild:
+    def __init__(self, guild_id, uses=None, delay=0, error=None):
+        self.id = guild_id
+        self.uses = dict(uses or {})
+        self.delay = delay
+        self.error = error
+        self.fetches = 0
+
+    async def invites(self):
+        self.fetches += 1
+
+        # The uses are read when the request is sent, not when the response arrives.
+        invites = [
+            SimpleNamespace(code=code, uses=uses, guild=self)
+            for code, uses in self.uses.items()
+        ]
+        await asyncio.sleep(self.delay)
+
+        if self.error is not None:
+            raise self.error
+
+        return invites
+
+
+def create_member(guild):
+    return SimpleNamespace(id=1, guild=guild)
+
+
+def create_http_error(error_class, status):
+    return error_class(SimpleNamespace(status=status, reason=""), "")
+
+
+def create_invite_tracker(guilds=(), **kwargs):
+    listeners = {}
+    bot = SimpleNamespace(
+        loop=asyncio.get_event_loop(),
+        guilds=list(guilds),
+        add_listener=lambda func, name: listeners.setdefault(name, func),
+        wait_until_ready=wait_until_ready,
+    )
+
+    return discordSuperUtils.InviteTracker(bot, **kwargs), listeners
+
+
+async def wait_for_warmup(invite_tracker):
+    while not invite_tracker.get_warmup_progress()["done"]:
+        await asyncio.sleep(0.01)
+
+
+async def get_codes(invite_tracker, members):
+    invites = await asyncio.gather(*[invite_tracker.get_invite(x) for x in members])
+
+    return [invite.code if invite else None for invite in invites]
+
+
+async def simultaneous_joins():
+    guild = Guild(1, {"a": 0, "b": 0})
+    invite_tracker, _ = create_invite_tracker([guild])
+    await wait_for_warmup(invite_tracker)
+
+    guild.fetches = 0
+    guild.uses = {"a": 1, "b": 1}
+
+    # The third join has no new use left, e.g. it joined with an invite that was deleted when it was used.
+    return (
+        sorted(
+            await get_codes(invite_tracker, [create_member(guild) for _ in range(3)]),
+            key=str,
+        ),
+        guild.fetches,
+    )
+
+
+async def simultaneous_joins_on_one_invite():
+    guild = Guild(1, {"a": 0, "b": 0})
+    invite_tracker, _ = create_invite_tracker([guild])
+    await wait_for_warmup(invite_tracker)
+
+    guild.fetches = 0
+    guild.uses = {"a": 2, "b": 0}
+    codes = await get_codes(invite_tracker, [create_member(guild) for _ in range(2)])
+
+    return codes, guild.fetches, {"a": invite_tracker.cache[1]["a"]}
+
+
+async def join_during_fetch():
+    guild = Guild(1, {"a": 0, "b": 0})
+    invite_tracker, _ = create_invite_tracker([guild])
+    await wait_for_warmup(invite_tracker)
+
+    guild.fetches = 0
+    guild.delay = 0.05
+    guild.uses = {"a": 1, "b": 0}
+    first_join = asyncio.ensure_future(invite_tracker.get_invite(create_member(guild)))
+    await asyncio.sleep(0.01)
+
+    # The running fetch was sent before this join, so it has to wait for the next fetch to see its use.
+    guild.uses = {"a": 1, "b": 1}
+    second_join = await invite_tracker.get_invite(create_member(guild))
+
+    return [(await first_join).code, second_join.code], guild.fetches
+
+
+async def deleted_and_created_invites():
+    guild = Guild(1, {"a": 0})
+    invite_tracker, listeners = create_invite_tracker([guild])
+    await wait_for_warmup(invite_tracker)
+
+    # The member joined with the last use of the invite, so it was deleted.
+    guild.uses = {}
+    await listeners["on_invite_delete"](SimpleNamespace(code="a", guild=guild))
+    deleted_invite = await invite_tracker.get_invite(create_member(guild))
+
+    await listeners["on_invite_create"](SimpleNamespace(code="c", uses=0, guild=guild))
+    guild.uses = {"c": 1}
+    created_invite = await invite_tracker.get_invite(create_member(guild))
+
+    return deleted_invite, created_invite.code, invite_tracker.cache[1]
+
+
+async def lazy_loaded_guild():
+    guild = Guild(1, {"a": 0})
+    invite_tracker, _ = create_invite_tracker(warmup=False)
+
+    # The first join only caches the uses of the guild.
+    first_join = await invite_tracker.get_invite(create_member(guild))
+    guild.uses = {"a": 1}
+    second_join = await invite_tracker.get_invite(create_member(guild))
+
+    return (
+        first_join,
+        second_join.code,
+        invite_tracker.get_warmup_progress()["lazy_loaded"],
+    )
+
+
+async def warmup_concurrency():
+    running_fetches = 0
+    max_running_fetches = 0
+
+    class CountedGuild(Guild):
+        async def invites(self):
+            nonlocal running_fetches, max_running_fetches
+            running_fetches += 1
+            max_running_fetches = max(max_running_fetches, running_fetches)
+
+            try:
+                return await super().invites()
+            finally:
+                running_fetches -= 1
+
+    guilds = [CountedGuild(i, {"a": i}, delay=0.02) for i in range(10)]
+    invite_tracker, _ = create_invite_tracker(
+        guilds, warmup_concurrency=2, warmup_rate=1000
+    )
+    await wait_for_warmup(invite_tracker)
+    progress = invite_tracker.get_warmup_progress()
+
+    return (
+        progress["loaded"],
+        max_running_fetches,
+        all(invite_tracker.cache[i] == {"a": i} for i in range(10)),
+        progress["pending"],
+    )
+
+
+async def warmup_rate():
+    guilds = [Guild(i) for i in range(5)]
+    start = time.monotonic()
+    invite_tracker, _ = create_invite_tracker(
+        guilds, warmup_concurrency=5, warmup_rate=20
+    )
+    await wait_for_warmup(invite_tracker)
+
+    # The fetches are spaced 1 / 20 seconds apart, the last one starts after 4 intervals.
+    return time.monotonic() - start >= 0.2
+
+
+async def warmup_errors():
+    guilds = [
+        Guild(0, error=create_http_error(discord.Forbidden, 403)),
+        Guild(1, error=create_http_error(discord.HTTPException, 500)),
+        Guild(2, {"a": 0}),
+    ]
+    invite_tracker, _ = create_invite_tracker(guilds, warmup_rate=1000)
+    await wait_for_warmup(invite_tracker)
+    progress = invite_tracker.get_warmup_progress()
+
+    return (
+        (
+            progress["forbidden"],
+            progress["failed"],
+            progress["loaded"],
+            progress["pending"],
+        ),
+        invite_tracker.cache,
+    )
+
+
+async def warmup_disabled():
+    guild = Guild(1, {"a": 0})
+    invite_tracker, _ = create_invite_tracker([guild], warmup=False)
+    await asyncio.sleep(0.01)
+
+    return guild.fetches, invite_tracker.cache
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,178 @@
+import asyncio
+from types import SimpleNamespace
+
+import discordSuperUtils
+from tester import Tester
+
+CURVES = [
+    discordSuperUtils.GeometricLevelCurve(),
+    discordSuperUtils.LinearLevelCurve(),
+    discordSuperUtils.LinearLevelCurve(0.1),
+    discordSuperUtils.PolynomialLevelCurve(),
+    discordSuperUtils.PolynomialLevelCurve(3, 1.5),
+]
+LEVELS = 1000
+
+
+async def start_testing():
+    """
+    Checks the levels the level curves compute at their boundaries, within and beyond the precomputed thresholds.
+
+    RESULTS
+    --------
+        no_xp: Passed
+        exact_thresholds: Passed
+        below_thresholds: Passed
+        next_level_xp: Passed
+        huge_xp: Passed
+        thresholds_not_stored: Passed
+        unit_rank_multiplier: Passed
+        changed_rank_multiplier: Passed
+        account_level_from_xp: Passed
+
+    Conclusion
+    ----------
+        A member reaches a level exactly at its threshold, the levels beyond the precomputed thresholds are
+        computed from the curve without storing their thresholds. A rank multiplier of 1 is a linear curve, and
+        changing the rank multiplier rebuilds the default curve. The level of an account is derived from its xp,
+        not from the stored rank.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(no_xp, [1] * len(CURVES))
+    tester.add_test(exact_thresholds, [True] * len(CURVES))
+    tester.add_test(below_thresholds, [True] * len(CURVES))
+    tester.add_test(next_level_xp, [True] * len(CURVES))
+    tester.add_test(huge_xp, [True] * len(CURVES))
+    tester.add_test(
+        thresholds_not_stored,
+        [discordSuperUtils.LevelCurve.PRECOMPUTED_LEVELS] * len(CURVES),
+    )
+    tester.add_test(unit_rank_multiplier, ("LinearLevelCurve", [1, 2, 3, 4]))
+    tester.add_test(changed_rank_multiplier, (75, 100, "LinearLevelCurve"))
+    tester.add_test(account_level_from_xp, ((5, 168.75, 253.125), (5, 168.75, 253.125)))
+    await tester.run()
+
+
+async def no_xp():
+    return [curve.get_level(0) for curve in CURVES]
+
+
+async def exact_thresholds():
+    return [
+        all(
+            curve.get_level(curve.calculate_threshold(level)) == level + 1
+            for level in range(1, LEVELS)
+        )
+        for curve in CURVES
+    ]
+
+
+async def below_thresholds():
+    return [
+        all(
+            curve.get_level(curve.calculate_threshold(level) * (1 - 1e-9)) == level
+            for level in range(1, LEVELS)
+        )
+        for curve in CURVES
+    ]
+
+
+async def next_level_xp():
+    return [
+        all(
+            curve.get_initial_xp(level)
+            <= curve.get_progress(curve.get_initial_xp(level)).xp
+            < curve.get_next_level_xp(level)
+            == curve.calculate_threshold(level)
+            for level in range(1, LEVELS)
+        )
+        for curve in CURVES
+    ]
+
+
+async def huge_xp():
+    results = []
+
+    for curve in CURVES:
+        # Far beyond the precomputed thresholds, while the thresholds of the float curves are still distinct.
+        xp = 10**12
+        level = curve.get_level(xp)
+
+        results.append(
+            curve.calculate_threshold(level - 1)
+            <= xp
+            < curve.calculate_threshold(level)
+        )
+
+    return results
+
+
+async def thresholds_not_stored():
+    for curve in CURVES:
+        curve.get_level(10**100)
+        curve.get_next_level_xp(LEVELS)
+
+    return [len(curve.thresholds) for curve in CURVES]
+
+
+def create_leveling_manager(**kwargs):
+    return discordSuperUtils.LevelingManager(
+        SimpleNamespace(add_listener=lambda *args: None), **kwargs
+    )
+
+
+async def unit_rank_multiplier():
+    level_curve = create_leveling_manager(rank_multiplier=1).level_curve
+
+    return (
+        type(level_curve).__name__,
+        [level_curve.get_level(xp) for xp in (0, 50, 149, 150)],
+    )
+
+
+async def changed_rank_multiplier():
+    leveling_manager = create_leveling_manager()
+    xp = leveling_manager.level_curve.get_next_level_xp(2)
+    leveling_manager.rank_multiplier = 2
+
+    # A level curve that was passed to the manager is kept.
+    custom_leveling_manager = create_leveling_manager(
+        level_curve=discordSuperUtils.LinearLevelCurve(10)
+    )
+    custom_leveling_manager.rank_multiplier = 2
+
+    return (
+        xp,
+        leveling_manager.level_curve.get_next_level_xp(2),
+        type(custom_leveling_manager.level_curve).__name__,
+    )
+
+
+async def account_level_from_xp():
+    database = discordSuperUtils.DatabaseManager.connect(
+        discordSuperUtils.MemoryStore()
+    )
+    leveling_manager = create_leveling_manager()
+    await leveling_manager.connect_to_database(database)
+
+    member = SimpleNamespace(id=1, guild=SimpleNamespace(id=1))
+    await leveling_manager.create_account(member)
+    account = await leveling_manager.get_account(member)
+
+    # Setting the xp does not update the stored rank.
+    await account.set_xp(200)
+    progress = await account.get_progress()
+
+    return (
+        (
+            await account.level(),
+            await account.initial_rank_xp(),
+            await account.next_level(),
+        ),
+        (progress.level, progress.initial_xp, progress.next_level_xp),
+    )
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,149 @@
+import asyncio
+from types import SimpleNamespace
+
+import discordSuperUtils
+from tester import Tester
+
+MESSAGES = 200
+MEMBERS = 10
+
+
+async def start_testing():
+    """
+    Counts the database queries LevelingManager makes for the messages it awards, on a MemoryStore database with
+    the instrumentation enabled. Every member sends MESSAGES / MEMBERS messages and levels up a few times.
+
+    RESULTS
+    --------
+        queries_per_message: Passed
+        buffered_messages: Passed
+
+    Conclusion
+    ----------
+        The award is a single increment that returns the row, a second write is only made on a level up. The
+        listener makes 1.15 queries per message, the calls it made before make 5.6 queries per message.
+        When the writes are buffered, the awards are kept in memory and written in a single flush.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(queries_per_message, (MESSAGES, MESSAGES, 5.6, 1.15))
+    tester.add_test(buffered_messages, (MESSAGES, 0, MEMBERS))
+    await tester.run()
+
+
+def create_message(member_id):
+    guild = SimpleNamespace(id=1)
+    author = SimpleNamespace(id=member_id, bot=False, guild=guild)
+
+    return SimpleNamespace(guild=guild, author=author)
+
+
+async def create_leveling_manager(database, **kwargs):
+    listeners = {}
+    bot = SimpleNamespace(
+        add_listener=lambda func, name: listeners.setdefault(name, func)
+    )
+
+    leveling_manager = discordSuperUtils.LevelingManager(bot, xp_cooldown=0, **kwargs)
+    await leveling_manager.connect_to_database(database)
+
+    return leveling_manager, listeners["on_message"]
+
+
+def count_queries(instrumentation, operation=None):
+    return sum(
+        table_stats["calls"]
+        for name, operation_stats in instrumentation.stats().items()
+        if operation is None or name == operation
+        for table_stats in operation_stats.values()
+    )
+
+
+async def get_awarded_messages(database, leveling_manager):
+    rows = await database.select(leveling_manager.tables["xp"], ["xp"], fetchall=True)
+
+    return sum(row["xp"] for row in rows) // leveling_manager.xp_on_message
+
+
+# The calls the listener made before the award was a single increment, it selected the row for every value it
+# read and updated it for every value it set.
+async def award_before_single_increment(database, leveling_manager, message):
+    table = leveling_manager.tables["xp"]
+    checks = leveling_manager.generate_checks(message.author)
+
+    await database.insertifnotexists(
+        table, {**checks, "rank": 1, "xp": 0, "level_up": 50}, checks
+    )
+    await database.select(table, [], checks)
+    await database.increment(
+        table, {"xp": leveling_manager.xp_on_message}, checks, True
+    )
+
+    while (await database.select(table, [], checks))["xp"] >= (
+        await database.select(table, [], checks)
+    )["level_up"]:
+        level_up = (await database.select(table, [], checks))["level_up"]
+        await database.update(
+            table, {"level_up": level_up * leveling_manager.rank_multiplier}, checks
+        )
+        rank = (await database.select(table, [], checks))["rank"]
+        await database.update(table, {"rank": rank + 1}, checks)
+
+
+async def count_queries_per_message(award):
+    database = discordSuperUtils.DatabaseManager.connect(
+        discordSuperUtils.MemoryStore()
+    )
+    leveling_manager, on_message = await create_leveling_manager(database)
+
+    instrumentation = database.enable_instrumentation()
+    for i in range(MESSAGES):
+        message = create_message(i % MEMBERS)
+
+        if award is None:
+            await on_message(message)
+        else:
+            await award(database, leveling_manager, message)
+
+    queries = count_queries(instrumentation)
+    database.disable_instrumentation()
+
+    return await get_awarded_messages(database, leveling_manager), queries / MESSAGES
+
+
+async def queries_per_message():
+    baseline_messages, baseline_queries = await count_queries_per_message(
+        award_before_single_increment
+    )
+    messages, queries = await count_queries_per_message(None)
+
+    # The listener makes one query per message, the first message of a member and the level ups make one more.
+    return baseline_messages, messages, baseline_queries, queries
+
+
+async def buffered_messages():
+    database = discordSuperUtils.DatabaseManager.connect(
+        discordSuperUtils.MemoryStore()
+    )
+    buffered_database = discordSuperUtils.BufferedDatabase(database, flush_interval=60)
+    leveling_manager, on_message = await create_leveling_manager(
+        buffered_database, buffer_writes=True
+    )
+
+    instrumentation = database.enable_instrumentation()
+    for i in range(MESSAGES):
+        await on_message(create_message(i % MEMBERS))
+
+    direct_increments = count_queries(instrumentation, "increment")
+    database.disable_instrumentation()
+    await buffered_database.flush()
+
+    return (
+        await get_awarded_messages(database, leveling_manager),
+        direct_increments,
+        buffered_database.stats()["flushed_writes"],
+    )
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,141 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+# The xp of the members 0 to 3, the member 4 does not have an account.
+XP = [30, 10, 50, 10]
+
+
+async def start_testing():
+    """
+    Checks LevelingManager.get_rank on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        ranks_with_ties: Passed
+        ranks_by_guild: Passed
+        rank_follows_xp: Passed
+        rank_queries: Passed
+
+    Conclusion
+    ----------
+        The rank is the amount of members of the guild with more xp plus one, so members with the same xp share a
+        rank. It is counted by the database without fetching the leaderboard.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(ranks_with_ties, [[2, 3, 1, 3, None]] * 2)
+    tester.add_test(ranks_by_guild, [([1, 2], [2, 1])] * 2)
+    tester.add_test(rank_follows_xp, [([2, 1], [1, 2], [1, 1])] * 2)
+    tester.add_test(rank_queries, [(1, 1, False)] * 2)
+    await tester.run()
+
+
+def create_member(member_id, guild_id=1):
+    return SimpleNamespace(id=member_id, guild=SimpleNamespace(id=guild_id))
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        leveling_manager = discordSuperUtils.LevelingManager(
+            SimpleNamespace(add_listener=lambda *args: None), xp_cooldown=0
+        )
+        await leveling_manager.connect_to_database(database)
+
+        await database.insert_many(
+            leveling_manager.tables["xp"],
+            [
+                {"guild": 1, "member": i, "rank": 1, "xp": xp, "level_up": 50}
+                for i, xp in enumerate(XP)
+            ],
+        )
+
+        results.append(await test(database, leveling_manager))
+        await database.close()
+
+    return results
+
+
+async def ranks_with_ties():
+    async def test(database, leveling_manager):
+        return [
+            await leveling_manager.get_rank(create_member(i))
+            for i in range(len(XP) + 1)
+        ]
+
+    return await for_each_backend(test)
+
+
+async def ranks_by_guild():
+    async def test(database, leveling_manager):
+        # The members of the other guild have more xp, they do not count.
+        await database.insert_many(
+            leveling_manager.tables["xp"],
+            [
+                {"guild": 2, "member": 0, "rank": 1, "xp": 100, "level_up": 50},
+                {"guild": 2, "member": 2, "rank": 1, "xp": 200, "level_up": 50},
+            ],
+        )
+
+        return (
+            [await leveling_manager.get_rank(create_member(i)) for i in (2, 0)],
+            [
+                await (
+                    await leveling_manager.get_account(create_member(i, 2))
+                ).get_rank()
+                for i in (0, 2)
+            ],
+        )
+
+    return await for_each_backend(test)
+
+
+async def rank_follows_xp():
+    async def test(database, leveling_manager):
+        accounts = [
+            await leveling_manager.get_account(create_member(i)) for i in (0, 2)
+        ]
+        ranks = [[await account.get_rank() for account in accounts]]
+
+        await accounts[0].add_xp(30)
+        ranks.append([await account.get_rank() for account in accounts])
+
+        await accounts[1].set_xp(60)
+        ranks.append([await account.get_rank() for account in accounts])
+
+        return tuple(ranks)
+
+    return await for_each_backend(test)
+
+
+async def rank_queries():
+    async def test(database, leveling_manager):
+        instrumentation = database.enable_instrumentation()
+        await leveling_manager.get_rank(create_member(0))
+        stats = instrumentation.stats()
+        database.disable_instrumentation()
+
+        table = leveling_manager.tables["xp"]
+
+        return (
+            stats["select"][table]["calls"],
+            stats["count"][table]["calls"],
+            # A single row is selected, the leaderboard is not.
+            stats["select"][table]["rows"] > 1,
+        )
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,191 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "conformance"
+
+
+async def start_testing():
+    """
+    Runs the same calls on the memory backend and on sqlite and compares their results.
+
+    RESULTS
+    --------
+        inserts: Passed
+        upserts: Passed
+        updates_and_deletes: Passed
+        increments: Passed
+        predicates: Passed
+        iterate: Passed
+
+    Conclusion
+    ----------
+        The memory backend returns the same results as sqlite, so it can stand in for it in tests.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(inserts, True)
+    tester.add_test(upserts, True)
+    tester.add_test(updates_and_deletes, True)
+    tester.add_test(increments, True)
+    tester.add_test(predicates, True)
+    tester.add_test(iterate, True)
+    await tester.run()
+
+
+async def conforms(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE,
+            {"id": "INTEGER", "name": "TEXT", "value": "INTEGER", "extra": "INTEGER"},
+            True,
+            unique_keys=[("id",)],
+        )
+
+        results.append(await test(database))
+        await database.close()
+
+    if results[0] != results[1]:
+        raise AssertionError(f"memory: {results[0]}, sqlite: {results[1]}")
+
+    return True
+
+
+async def select_all(database):
+    return await database.select(
+        TABLE,
+        ["id", "name", "value", "extra"],
+        fetchall=True,
+        order_by=[("id", "ASC")],
+    )
+
+
+async def inserts():
+    async def test(database):
+        await database.insert(TABLE, {"id": 1, "name": "a", "value": 1})
+        await database.insert_many(
+            TABLE,
+            [
+                {"id": 2, "name": "b", "value": 2},
+                {"id": 3, "value": 3},
+                {"id": 4, "name": "d", "value": 4, "extra": 4},
+            ],
+        )
+
+        return (
+            await select_all(database),
+            await database.select(TABLE, ["name"], {"id": 3}),
+            await database.select(TABLE, [], {"id": 5}),
+            await database.count(TABLE),
+        )
+
+    return await conforms(test)
+
+
+async def upserts():
+    async def test(database):
+        row = {"id": 1, "name": "a", "value": 1}
+
+        await database.insertifnotexists(TABLE, row, {"id": 1})
+        await database.insertifnotexists(TABLE, {**row, "value": 5}, {"id": 1})
+        await database.updateorinsert(TABLE, {"value": 2}, {"id": 1}, row)
+        await database.updateorinsert(
+            TABLE, {"value": 3}, {"id": 2}, {"id": 2, "name": "b", "value": 3}
+        )
+
+        return await select_all(database)
+
+    return await conforms(test)
+
+
+async def updates_and_deletes():
+    async def test(database):
+        await database.insert_many(
+            TABLE, [{"id": i, "name": "x", "value": i} for i in range(1, 5)]
+        )
+        await database.update(TABLE, {"name": "y"}, {"id": 2})
+        await database.update(TABLE, {"value": 0}, {"name": "x"})
+        await database.delete(TABLE, {"id": 3})
+
+        return await select_all(database), await database.count(TABLE, {"value": 0})
+
+    return await conforms(test)
+
+
+async def increments():
+    async def test(database):
+        await database.insert_many(
+            TABLE,
+            [{"id": 1, "name": "a", "value": 1}, {"id": 2, "name": "a", "value": 2}],
+        )
+
+        returned = [
+            await database.increment(TABLE, {"value": 5}, {"id": 1}, True),
+            # The extra column was never set, it is incremented from 0.
+            await database.increment(
+                TABLE, {"extra": 2}, {"id": 1}, ["value", "extra"]
+            ),
+            await database.increment(TABLE, {"value": 1}, {"id": 3}, True),
+            await database.increment(TABLE, {"value": 10}, {"name": "a"}),
+        ]
+
+        return returned, await select_all(database)
+
+    return await conforms(test)
+
+
+async def predicates():
+    async def test(database):
+        await database.insert_many(
+            TABLE, [{"id": i, "name": str(i), "value": i * 10} for i in range(1, 8)]
+        )
+
+        return [
+            await database.count(TABLE, checks)
+            for checks in [
+                {"value": discordSuperUtils.Predicate.gt(30)},
+                {"value": discordSuperUtils.Predicate.gte(30)},
+                {"value": discordSuperUtils.Predicate.lt(30)},
+                {"value": discordSuperUtils.Predicate.lte(30)},
+                {"value": discordSuperUtils.Predicate.ne(30)},
+                {"value": discordSuperUtils.Predicate.in_([10, 30, 100])},
+                {"value": discordSuperUtils.Predicate.between(20, 50)},
+                {"value": discordSuperUtils.Predicate.gt(10), "name": "2"},
+            ]
+        ]
+
+    return await conforms(test)
+
+
+async def iterate():
+    async def test(database):
+        await database.insert_many(
+            TABLE, [{"id": i, "name": str(i), "value": i} for i in range(10)]
+        )
+
+        return sorted(
+            [
+                row["id"]
+                async for row in database.iterate(
+                    TABLE,
+                    ["id"],
+                    {"value": discordSuperUtils.Predicate.gte(5)},
+                    batch_size=2,
+                )
+            ]
+        )
+
+    return await conforms(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,194 @@
+import asyncio
+from collections import namedtuple
+
+import discordSuperUtils
+from discordSuperUtils.database import _MongoDatabase
+from tester import Tester
+
+TABLE = "scores"
+DOCUMENTS = [{"id": 1, "bank": 10}, {"id": 2, "bank": 3}]
+Score = namedtuple("Score", ("id", "bank"))
+
+
+async def start_testing():
+    """
+    Checks the queries the mongo backend sends for selects, using a collection that records its calls instead of
+    a server.
+
+    RESULTS
+    --------
+        projection: Passed
+        single_row: Passed
+        multiple_rows: Passed
+        zero_limit: Passed
+        expression_order: Passed
+        predicate_filter: Passed
+        records: Passed
+
+    Conclusion
+    ----------
+        Only the selected keys are fetched and _id is excluded, the rows are fetched in batches and the ordering and
+        paging are done by the server. A limit of 0 returns no rows without a query.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(projection, (None, {"id": 1, "bank": 1, "_id": 0}, {"_id": 1}))
+    tester.add_test(
+        single_row,
+        [
+            (
+                "find_one",
+                ({"id": 1},),
+                {"projection": {"bank": 1, "_id": 0}, "sort": [("bank", -1)]},
+            )
+        ],
+    )
+    tester.add_test(
+        multiple_rows,
+        [
+            (
+                "find",
+                ({},),
+                {
+                    "batch_size": _MongoDatabase.batch_size,
+                    "projection": {"id": 1, "_id": 0},
+                    "sort": [("bank", 1), ("id", -1)],
+                    "skip": 1,
+                    "limit": 2,
+                },
+            )
+        ],
+    )
+    tester.add_test(zero_limit, ([], None, []))
+    tester.add_test(
+        expression_order,
+        [
+            {"$match": {}},
+            {"$addFields": {"__order_0": {"$add": ["$bank", "$currency"]}}},
+            {"$sort": {"__order_0": -1}},
+            {"$limit": 3},
+            {"$project": {"__order_0": 0}},
+        ],
+    )
+    tester.add_test(
+        predicate_filter,
+        {
+            "id": {"$in": [1, 2]},
+            "bank": {"$gte": 3, "$lte": 10},
+            "currency": {"$gt": 0},
+            "guild": 1,
+        },
+    )
+    tester.add_test(records, ([Score(1, 10), Score(2, 3)], Score(1, 10), None))
+    await tester.run()
+
+
+class RecordingCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    async def to_list(self, length=None):
+        return self.documents
+
+
+class RecordingCollection:
+    def __init__(self, documents):
+        self.documents = documents
+        self.calls = []
+
+    async def find_one(self, *args, **kwargs):
+        self.calls.append(("find_one", args, kwargs))
+        return self.documents[0] if self.documents else None
+
+    def find(self, *args, **kwargs):
+        self.calls.append(("find", args, kwargs))
+        return RecordingCursor(self.documents)
+
+    def aggregate(self, pipeline, **kwargs):
+        self.calls.append(("aggregate", (pipeline,), kwargs))
+        return RecordingCursor(self.documents)
+
+
+def create_database(documents=()):
+    collection = RecordingCollection(list(documents))
+    return _MongoDatabase({TABLE: collection}), collection
+
+
+async def projection():
+    return (
+        _MongoDatabase.get_projection([]),
+        _MongoDatabase.get_projection(["id", "bank"]),
+        _MongoDatabase.get_projection(["_id"]),
+    )
+
+
+async def single_row():
+    database, collection = create_database(DOCUMENTS)
+    await database.select(TABLE, ["bank"], {"id": 1}, order_by=[("bank", "DESC")])
+
+    return collection.calls
+
+
+async def multiple_rows():
+    database, collection = create_database(DOCUMENTS)
+    await database.select(
+        TABLE,
+        ["id"],
+        fetchall=True,
+        order_by=[("bank", "ASC"), ("id", "DESC")],
+        limit=2,
+        offset=1,
+    )
+
+    return collection.calls
+
+
+async def zero_limit():
+    database, collection = create_database(DOCUMENTS)
+
+    return (
+        await database.select(TABLE, [], fetchall=True, limit=0),
+        await database.select(TABLE, [], limit=0),
+        collection.calls,
+    )
+
+
+async def expression_order():
+    database, collection = create_database(DOCUMENTS)
+    await database.select(
+        TABLE, [], fetchall=True, order_by=[(("bank", "currency"), "DESC")], limit=3
+    )
+
+    return collection.calls[0][1][0]
+
+
+async def predicate_filter():
+    database, collection = create_database(DOCUMENTS)
+    await database.select(
+        TABLE,
+        [],
+        {
+            "id": discordSuperUtils.Predicate.in_([1, 2]),
+            "bank": discordSuperUtils.Predicate.between(3, 10),
+            "currency": discordSuperUtils.Predicate.gt(0),
+            "guild": 1,
+        },
+        fetchall=True,
+    )
+
+    return collection.calls[0][1][0]
+
+
+async def records():
+    database, _ = create_database(DOCUMENTS)
+    empty_database, _ = create_database()
+
+    return (
+        await database.select(TABLE, [], fetchall=True, record_class=Score),
+        await database.select(TABLE, [], record_class=Score),
+        await empty_database.select(TABLE, [], record_class=Score),
+    )
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,216 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from discordSuperUtils import Predicate
+from tester import Tester
+
+TABLE = "predicates"
+# The values are 10, 20, ..., 70.
+ROWS = [{"id": i, "value": i * 10} for i in range(1, 8)]
+CHECKS = [
+    Predicate.gt(30),
+    Predicate.gte(30),
+    Predicate.lt(30),
+    Predicate.lte(30),
+    Predicate.ne(30),
+    Predicate.in_([10, 30, 100]),
+    Predicate.in_([]),
+    Predicate.between(20, 50),
+]
+
+
+async def start_testing():
+    """
+    Checks every predicate operator on sqlite and on the memory backend, and the queries they build.
+
+    RESULTS
+    --------
+        selected_rows: Passed
+        updated_rows: Passed
+        deleted_rows: Passed
+        matches: Passed
+        mongo_operators: Passed
+        sql_checks: Passed
+
+    Conclusion
+    ----------
+        Every operator selects, updates and deletes the same rows on both backends, an empty IN matches no rows.
+        The queries of an IN are cached by the amount of its values.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(
+        selected_rows,
+        [
+            [
+                [4, 5, 6, 7],
+                [3, 4, 5, 6, 7],
+                [1, 2],
+                [1, 2, 3],
+                [1, 2, 4, 5, 6, 7],
+                [1, 3],
+                [],
+                [2, 3, 4, 5],
+            ]
+        ]
+        * 2,
+    )
+    tester.add_test(updated_rows, [[4, 5, 2, 3, 6, 2, 0, 4]] * 2)
+    tester.add_test(deleted_rows, [[3, 2, 5, 4, 1, 5, 7, 3]] * 2)
+    tester.add_test(
+        matches,
+        [
+            [False, False, True],
+            [True, False, True],
+            [False, True, False],
+            [True, True, False],
+            [False, True, True],
+            [True, True, False],
+            [False, False, False],
+            [True, False, False],
+        ],
+    )
+    tester.add_test(
+        mongo_operators,
+        [
+            {"$gt": 30},
+            {"$gte": 30},
+            {"$lt": 30},
+            {"$lte": 30},
+            {"$ne": 30},
+            {"$in": [10, 30, 100]},
+            {"$in": []},
+            {"$gte": 20, "$lte": 50},
+        ],
+    )
+    tester.add_test(
+        sql_checks,
+        (
+            [
+                " WHERE value > ?",
+                " WHERE value >= ?",
+                " WHERE value < ?",
+                " WHERE value <= ?",
+                " WHERE value <> ?",
+                " WHERE value IN (?, ?, ?)",
+                " WHERE 1 = 0",
+                " WHERE value BETWEEN ? AND ?",
+            ],
+            [[30], [30], [30], [30], [30], [10, 30, 100], [], [20, 50]],
+            2,
+        ),
+    )
+    await tester.run()
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "value": "INTEGER"}, True, unique_keys=[("id",)]
+        )
+
+        results.append(await test(database))
+        await database.close()
+
+    return results
+
+
+async def reset(database):
+    await database.delete(TABLE, {"id": Predicate.gt(0)})
+    await database.insert_many(TABLE, ROWS)
+
+
+async def selected_rows():
+    async def test(database):
+        await reset(database)
+
+        return [
+            [
+                row["id"]
+                for row in await database.select(
+                    TABLE,
+                    ["id"],
+                    {"value": check},
+                    fetchall=True,
+                    order_by=[("id", "ASC")],
+                )
+            ]
+            for check in CHECKS
+        ]
+
+    return await for_each_backend(test)
+
+
+async def updated_rows():
+    async def test(database):
+        results = []
+
+        for check in CHECKS:
+            await reset(database)
+            await database.update(TABLE, {"value": 0}, {"value": check})
+            results.append(await database.count(TABLE, {"value": 0}))
+
+        return results
+
+    return await for_each_backend(test)
+
+
+async def deleted_rows():
+    async def test(database):
+        results = []
+
+        for check in CHECKS:
+            await reset(database)
+            await database.delete(TABLE, {"value": check})
+            results.append(await database.count(TABLE))
+
+        return results
+
+    return await for_each_backend(test)
+
+
+async def matches():
+    return [[check.matches(value) for value in (30, 10, 60)] for check in CHECKS]
+
+
+async def mongo_operators():
+    return [check.to_mongo() for check in CHECKS]
+
+
+async def sql_checks():
+    database = discordSuperUtils.DatabaseManager.connect(
+        await aiosqlite.connect(":memory:")
+    )
+    signatures = {
+        discordSuperUtils.database.get_check_columns({"value": check})
+        for check in (Predicate.in_([1, 2]), Predicate.in_([3, 4]), Predicate.in_([5]))
+    }
+
+    result = (
+        [
+            database._build_where_clause(
+                discordSuperUtils.database.get_check_columns({"value": check})
+            )
+            for check in CHECKS
+        ],
+        [
+            discordSuperUtils.database.get_check_values({"value": check})
+            for check in CHECKS
+        ],
+        len(signatures),
+    )
+    await database.close()
+
+    return result
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,111 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from discordSuperUtils.database import QueryCache
+from tester import Tester
+
+TABLE = "queries"
+
+
+async def start_testing():
+    """
+    Checks the compiled query templates of the sqlite database.
+
+    RESULTS
+    --------
+        repeated_queries: Passed
+        different_shapes: Passed
+        predicate_signatures: Passed
+        lru_eviction: Passed
+
+    Conclusion
+    ----------
+        A query is compiled once per shape, the values of the checks do not change the template.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(repeated_queries, (1, 9))
+    tester.add_test(different_shapes, (4, 0))
+    tester.add_test(predicate_signatures, (2, 1))
+    tester.add_test(lru_eviction, (["a", "c"], 1, 3, (0, 0, 0)))
+    await tester.run()
+
+
+async def get_database():
+    database = discordSuperUtils.DatabaseManager.connect(
+        await aiosqlite.connect(":memory:")
+    )
+    await database.create_table(TABLE, {"id": "INTEGER", "value": "INTEGER"}, True)
+    await database.insert_many(TABLE, [{"id": i, "value": i} for i in range(10)])
+    database.query_cache.clear()
+
+    return database
+
+
+async def repeated_queries():
+    database = await get_database()
+
+    for i in range(10):
+        await database.select(TABLE, ["value"], {"id": i})
+
+    query_cache = database.query_cache
+    await database.close()
+
+    return query_cache.misses, query_cache.hits
+
+
+async def different_shapes():
+    database = await get_database()
+
+    await database.select(TABLE, ["value"], {"id": 1})
+    await database.select(TABLE, ["id"], {"id": 1})
+    await database.select(TABLE, ["value"], {"value": 1})
+    await database.update(TABLE, {"value": 2}, {"id": 1})
+
+    query_cache = database.query_cache
+    await database.close()
+
+    return query_cache.misses, query_cache.hits
+
+
+async def predicate_signatures():
+    database = await get_database()
+
+    # The amount of IN values is a part of the template, the values are not.
+    for values in [[1, 2], [3, 4, 5], [6, 7]]:
+        await database.select(
+            TABLE,
+            ["value"],
+            {"id": discordSuperUtils.Predicate.in_(values)},
+            fetchall=True,
+        )
+
+    query_cache = database.query_cache
+    await database.close()
+
+    return query_cache.misses, query_cache.hits
+
+
+async def lru_eviction():
+    query_cache = QueryCache(max_size=2)
+
+    for key in ["a", "b", "a", "c"]:
+        query_cache.get(key, lambda: f"SELECT {key}")
+
+    # "a" was hit after "b" was added, so "b" is the least recently used when "c" is added.
+    cached = list(query_cache._queries)
+    hits, misses = query_cache.hits, query_cache.misses
+    query_cache.clear()
+
+    return (
+        cached,
+        hits,
+        misses,
+        (len(query_cache), query_cache.hits, query_cache.misses),
+    )
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,135 @@
+import asyncio
+from collections import namedtuple
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from discordSuperUtils.database import make_records
+from tester import Tester
+
+TABLE = "records"
+Record = namedtuple("Record", ["xp", "member"])
+
+
+async def start_testing():
+    """
+    Checks that selects decode their rows into record classes on sqlite and on the memory backend.
+    The fields of the record class are ordered differently from the columns of the table.
+
+    RESULTS
+    --------
+        sql_field_order: Passed
+        memory_field_names: Passed
+        document_field_names: Passed
+        leaderboard_records: Passed
+
+    Conclusion
+    ----------
+        SQL rows are decoded by position, so the columns are selected in the order of the fields.
+        Documents and memory rows are decoded by name, regardless of the order of their keys.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(sql_field_order, (Record(30, 3), [Record(30, 3), Record(20, 2)]))
+    tester.add_test(memory_field_names, (Record(30, 3), [Record(30, 3), Record(20, 2)]))
+    tester.add_test(
+        document_field_names, (Record(10, 1), [Record(20, 2), Record(None, 3)])
+    )
+    tester.add_test(leaderboard_records, [([3, 2, 1], [3, 2, 1], 10)] * 2)
+    await tester.run()
+
+
+async def create_database(connection):
+    database = discordSuperUtils.DatabaseManager.connect(connection)
+    await database.create_table(
+        TABLE, {"member": "INTEGER", "name": "TEXT", "xp": "INTEGER"}, True
+    )
+    await database.insert_many(
+        TABLE, [{"member": i, "name": str(i), "xp": i * 10} for i in range(1, 4)]
+    )
+
+    return database
+
+
+async def select_records(database):
+    record = await database.select(TABLE, [], {"member": 3}, record_class=Record)
+    records = await database.select(
+        TABLE,
+        [],
+        None,
+        True,
+        order_by=[("xp", "DESC")],
+        limit=2,
+        record_class=Record,
+    )
+
+    await database.close()
+    return record, records
+
+
+async def sql_field_order():
+    return await select_records(
+        await create_database(await aiosqlite.connect(":memory:"))
+    )
+
+
+async def memory_field_names():
+    return await select_records(await create_database(discordSuperUtils.MemoryStore()))
+
+
+async def document_field_names():
+    # Mongo returns documents with their keys in the order they were stored in.
+    return (
+        make_records({"_id": 1, "member": 1, "xp": 10}, Record, False),
+        make_records(
+            [{"xp": 20, "name": "2", "member": 2}, {"member": 3}], Record, True
+        ),
+    )
+
+
+async def leaderboard_records():
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        leveling_manager = discordSuperUtils.LevelingManager(
+            SimpleNamespace(add_listener=lambda *args: None)
+        )
+        await leveling_manager.connect_to_database(database)
+
+        members = {i: SimpleNamespace(id=i) for i in range(1, 4)}
+        guild = SimpleNamespace(id=1, get_member=members.get)
+        for member in members.values():
+            member.guild = guild
+            await leveling_manager.create_account(member)
+            await (await leveling_manager.get_account(member)).set_xp(member.id * 10)
+
+        progress = await leveling_manager.get_leaderboard_progress(guild)
+        economy_manager = discordSuperUtils.EconomyManager(None)
+        await economy_manager.connect_to_database(database)
+
+        for member in members.values():
+            await economy_manager.create_account(member)
+            await (await economy_manager.get_account(member)).change_bank(member.id)
+
+        results.append(
+            (
+                [account.member.id for account, _ in progress],
+                [
+                    account.member.id
+                    for account in await economy_manager.get_leaderboard(guild)
+                ],
+                await (await leveling_manager.get_account(members[1])).xp(),
+            )
+        )
+        await database.close()
+
+    return results
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,162 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+ROLES = {role_id: SimpleNamespace(id=role_id) for role_id in range(100, 104)}
+NEW_ROLES = {role_id: SimpleNamespace(id=role_id) for role_id in range(200, 204)}
+
+
+async def start_testing():
+    """
+    Checks the cached role ladder of LevelingManager and the roles it awards on a level up, on sqlite and on the
+    memory backend. Every message levels the member up once.
+
+    RESULTS
+    --------
+        ladder_selected_once: Passed
+        set_roles_invalidates: Passed
+        set_interval_invalidates: Passed
+        awards_follow_changes: Passed
+
+    Conclusion
+    ----------
+        The ladder of a guild is selected once, set_roles and set_interval invalidate it. A level up only adds the
+        roles the member is missing, in a single call.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(ladder_selected_once, [([[101], [102], [103]], 1, 1)] * 2)
+    tester.add_test(
+        set_roles_invalidates, [([100, 101, 102, 103], [200, 201, 202, 203])] * 2
+    )
+    tester.add_test(set_interval_invalidates, [(5, 2, 3)] * 2)
+    tester.add_test(
+        awards_follow_changes, [[[100], [102, 101], [203, 202, 201, 200]]] * 2
+    )
+    await tester.run()
+
+
+def create_guild():
+    return SimpleNamespace(id=1, get_role={**ROLES, **NEW_ROLES}.get)
+
+
+def create_author(guild, roles=()):
+    added_roles = []
+    author = SimpleNamespace(id=1, bot=False, guild=guild, roles=list(roles))
+
+    async def add_roles(*roles):
+        added_roles.append([role.id for role in roles])
+        author.roles.extend(roles)
+
+    author.add_roles = add_roles
+
+    return author, added_roles
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        listeners = {}
+        bot = SimpleNamespace(
+            add_listener=lambda func, name: listeners.setdefault(name, func)
+        )
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        leveling_manager = discordSuperUtils.LevelingManager(
+            bot,
+            award_role=True,
+            xp_on_message=10,
+            xp_cooldown=0,
+            level_curve=discordSuperUtils.LinearLevelCurve(10),
+        )
+        await leveling_manager.connect_to_database(database)
+
+        results.append(await test(database, leveling_manager, listeners["on_message"]))
+        await database.close()
+
+    return results
+
+
+async def ladder_selected_once():
+    async def test(database, leveling_manager, on_message):
+        guild = create_guild()
+        author, added_roles = create_author(guild, [ROLES[100]])
+        await leveling_manager.set_interval(guild, 2)
+        await leveling_manager.set_roles(guild, ROLES.values())
+
+        instrumentation = database.enable_instrumentation()
+        for _ in range(9):
+            await on_message(SimpleNamespace(guild=guild, author=author))
+
+        selects = instrumentation.stats()["select"]
+        database.disable_instrumentation()
+
+        return (
+            added_roles,
+            selects[leveling_manager.tables["roles"]]["calls"],
+            selects[leveling_manager.tables["role_list"]]["calls"],
+        )
+
+    return await for_each_backend(test)
+
+
+async def set_roles_invalidates():
+    async def test(database, leveling_manager, on_message):
+        guild = create_guild()
+        await leveling_manager.set_roles(guild, ROLES.values())
+        roles, _ = await leveling_manager.get_role_ladder(guild)
+
+        await leveling_manager.set_roles(guild, NEW_ROLES.values())
+        new_roles, _ = await leveling_manager.get_role_ladder(guild)
+
+        return roles, new_roles
+
+    return await for_each_backend(test)
+
+
+async def set_interval_invalidates():
+    async def test(database, leveling_manager, on_message):
+        guild = create_guild()
+        intervals = [(await leveling_manager.get_role_ladder(guild))[1]]
+
+        for interval in (2, 3):
+            await leveling_manager.set_interval(guild, interval)
+            intervals.append((await leveling_manager.get_role_ladder(guild))[1])
+
+        return tuple(intervals)
+
+    return await for_each_backend(test)
+
+
+async def awards_follow_changes():
+    async def test(database, leveling_manager, on_message):
+        guild = create_guild()
+        author, added_roles = create_author(guild)
+        message = SimpleNamespace(guild=guild, author=author)
+        await leveling_manager.set_interval(guild, 2)
+        await leveling_manager.set_roles(guild, ROLES.values())
+
+        # Level 2 awards the first role of an interval of 2.
+        await on_message(message)
+
+        # Level 3 awards the first three roles of an interval of 1, the member already has the first one.
+        await leveling_manager.set_interval(guild, 1)
+        await on_message(message)
+
+        await leveling_manager.set_roles(guild, NEW_ROLES.values())
+        await on_message(message)
+
+        return added_roles
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
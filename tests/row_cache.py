@@ -0,0 +1,141 @@
+import asyncio
+from types import SimpleNamespace
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+MEMBER = SimpleNamespace(id=1, guild=SimpleNamespace(id=1))
+
+
+async def start_testing():
+    """
+    Checks the row cache of the managers on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        cached_rows_are_copies: Passed
+        overlapping_read_not_cached: Passed
+        committed_transaction: Passed
+        rolled_back_transaction: Passed
+
+    Conclusion
+    ----------
+        The callers of select_row cannot change the cached rows, a read that overlaps a write is not cached, and
+        a rolled back transaction does not leave its writes in the cache.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(cached_rows_are_copies, [(0, 1)] * 2)
+    tester.add_test(overlapping_read_not_cached, [(0, None, 5)] * 2)
+    tester.add_test(committed_transaction, [(0, 5)] * 2)
+    tester.add_test(rolled_back_transaction, [(0, 0)] * 2)
+    await tester.run()
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        economy_manager = discordSuperUtils.EconomyManager(None)
+        await economy_manager.connect_to_database(database)
+        economy_manager.enable_row_cache()
+        await economy_manager.create_account(MEMBER)
+
+        results.append(
+            await test(
+                economy_manager,
+                economy_manager.tables["economy"],
+                economy_manager.generate_checks(MEMBER),
+            )
+        )
+        await database.close()
+
+    return results
+
+
+async def cached_rows_are_copies():
+    async def test(economy_manager, table, checks):
+        row = await economy_manager.select_row(table, checks)
+        row["currency"] = 100
+
+        return (
+            (await economy_manager.select_row(table, checks))["currency"],
+            economy_manager.row_cache.hits,
+        )
+
+    return await for_each_backend(test)
+
+
+async def overlapping_read_not_cached():
+    async def test(economy_manager, table, checks):
+        database = economy_manager.database
+        select = database.select
+        written = asyncio.Event()
+
+        async def slow_select(*args, **kwargs):
+            # The row is read before the write, and returned after it.
+            row = await select(*args, **kwargs)
+            await written.wait()
+            return row
+
+        database.select = slow_select
+        read = asyncio.ensure_future(economy_manager.select_row(table, checks))
+        await asyncio.sleep(0.01)
+
+        await economy_manager.increment_row(table, {"currency": 5}, checks)
+        written.set()
+        stale_currency = (await read)["currency"]
+        database.select = select
+
+        return (
+            stale_currency,
+            economy_manager.row_cache.get(table, checks),
+            (await economy_manager.select_row(table, checks))["currency"],
+        )
+
+    return await for_each_backend(test)
+
+
+async def committed_transaction():
+    async def test(economy_manager, table, checks):
+        await economy_manager.select_row(table, checks)
+
+        async with economy_manager.transaction():
+            await economy_manager.update_row(table, {"currency": 5}, checks)
+            await economy_manager.select_row(table, checks)
+            cached_rows = len(economy_manager.row_cache)
+
+        return (
+            cached_rows,
+            (await economy_manager.select_row(table, checks))["currency"],
+        )
+
+    return await for_each_backend(test)
+
+
+async def rolled_back_transaction():
+    async def test(economy_manager, table, checks):
+        await economy_manager.select_row(table, checks)
+
+        try:
+            async with economy_manager.transaction():
+                await economy_manager.update_row(table, {"currency": 5}, checks)
+                await economy_manager.increment_row(table, {"bank": 5}, checks)
+                raise RuntimeError("The transaction is rolled back.")
+        except RuntimeError:
+            pass
+
+        row = await economy_manager.select_row(table, checks)
+        return row["currency"], row["bank"]
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
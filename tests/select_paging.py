@@ -0,0 +1,153 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "scores"
+ROWS = [
+    {"id": 1, "bank": 10, "currency": 5},
+    {"id": 2, "bank": 3, "currency": 20},
+    {"id": 3, "bank": 10, "currency": 1},
+    {"id": 4, "bank": 0, "currency": 0},
+    {"id": 5, "bank": 7, "currency": 7},
+]
+
+
+async def start_testing():
+    """
+    Checks the ordering and paging of Database.select on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        order_by_column: Passed
+        order_by_columns: Passed
+        order_by_expression: Passed
+        limit_and_offset: Passed
+        offset_without_limit: Passed
+        zero_limit: Passed
+
+    Conclusion
+    ----------
+        Both backends order, limit and skip the rows the same way, a limit of 0 returns no rows.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(order_by_column, [[4, 2, 5, 1, 3]] * 2)
+    tester.add_test(order_by_columns, [[1, 3, 5, 2, 4]] * 2)
+    tester.add_test(order_by_expression, [[2, 1, 5, 3, 4]] * 2)
+    tester.add_test(limit_and_offset, [([2, 1], [5, 3], [4], [])] * 2)
+    tester.add_test(offset_without_limit, [[3, 4]] * 2)
+    tester.add_test(zero_limit, [([], None)] * 2)
+    await tester.run()
+
+
+async def select_ids(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "bank": "INTEGER", "currency": "INTEGER"}, True
+        )
+        await database.insert_many(TABLE, ROWS)
+
+        results.append(await test(database))
+        await database.close()
+
+    return results
+
+
+def get_ids(rows):
+    return [row["id"] for row in rows]
+
+
+async def order_by_column():
+    async def test(database):
+        return get_ids(
+            await database.select(
+                TABLE, ["id"], fetchall=True, order_by=[("bank", "ASC"), ("id", "ASC")]
+            )
+        )
+
+    return await select_ids(test)
+
+
+async def order_by_columns():
+    async def test(database):
+        return get_ids(
+            await database.select(
+                TABLE,
+                ["id"],
+                fetchall=True,
+                order_by=[("bank", "DESC"), ("currency", "DESC")],
+            )
+        )
+
+    return await select_ids(test)
+
+
+async def order_by_expression():
+    async def test(database):
+        return get_ids(
+            await database.select(
+                TABLE,
+                ["id"],
+                fetchall=True,
+                order_by=[(("bank", "currency"), "DESC"), ("id", "ASC")],
+            )
+        )
+
+    return await select_ids(test)
+
+
+async def limit_and_offset():
+    async def test(database):
+        order_by = [(("bank", "currency"), "DESC"), ("id", "ASC")]
+
+        return tuple(
+            [
+                get_ids(
+                    await database.select(
+                        TABLE,
+                        ["id"],
+                        fetchall=True,
+                        order_by=order_by,
+                        limit=2,
+                        offset=offset,
+                    )
+                )
+                for offset in range(0, 8, 2)
+            ]
+        )
+
+    return await select_ids(test)
+
+
+async def offset_without_limit():
+    async def test(database):
+        return get_ids(
+            await database.select(
+                TABLE, ["id"], fetchall=True, order_by=[("id", "ASC")], offset=2
+            )
+        )[:2]
+
+    return await select_ids(test)
+
+
+async def zero_limit():
+    async def test(database):
+        return (
+            await database.select(TABLE, ["id"], fetchall=True, limit=0),
+            await database.select(TABLE, ["id"], limit=0),
+        )
+
+    return await select_ids(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,155 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import aiosqlite
+import pytz
+
+import discordSuperUtils
+from tester import Tester
+
+
+async def start_testing():
+    """
+    Checks the rows the mute and birthday sweeps stream, on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        expired_mutes: Passed
+        unmuted_while_streaming: Passed
+        birthdays_by_timezone: Passed
+
+    Conclusion
+    ----------
+        The sweeps only read the rows they handle, and the rows can be written while they are streamed.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(expired_mutes, [[1, 2]] * 2)
+    tester.add_test(unmuted_while_streaming, [([1, 2], [3])] * 2)
+    tester.add_test(birthdays_by_timezone, [([1, 2], [])] * 2)
+    await tester.run()
+
+
+async def wait_until_ready():
+    pass
+
+
+def create_bot():
+    # The bot is closed, so the sweep loops of the managers return right away.
+    return SimpleNamespace(
+        loop=asyncio.get_event_loop(),
+        add_listener=lambda *args: None,
+        wait_until_ready=wait_until_ready,
+        is_closed=lambda: True,
+    )
+
+
+async def for_each_backend(manager_class, test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        manager = manager_class(create_bot())
+        await manager.connect_to_database(database)
+
+        results.append(await test(database, manager))
+        await database.close()
+
+    return results
+
+
+async def insert_mutes(database, mute_manager):
+    now = datetime.utcnow().timestamp()
+
+    await database.insert_many(
+        mute_manager.tables["mutes"],
+        [
+            {
+                "guild": 1,
+                "member": member,
+                "timestamp_of_mute": now - 600,
+                "timestamp_of_unmute": now + offset,
+                "reason": "",
+            }
+            for member, offset in [(1, -300), (2, -60), (3, 300)]
+        ],
+    )
+
+
+async def expired_mutes():
+    async def test(database, mute_manager):
+        await insert_mutes(database, mute_manager)
+
+        return sorted(
+            [
+                muted_member["member"]
+                async for muted_member in mute_manager.iterate_muted_members()
+            ]
+        )
+
+    return await for_each_backend(discordSuperUtils.MuteManager, test)
+
+
+async def unmuted_while_streaming():
+    async def test(database, mute_manager):
+        await insert_mutes(database, mute_manager)
+
+        unmuted = []
+        async for muted_member in mute_manager.iterate_muted_members():
+            await database.delete(
+                mute_manager.tables["mutes"],
+                {"guild": 1, "member": muted_member["member"]},
+            )
+            unmuted.append(muted_member["member"])
+
+        remaining = await database.select(
+            mute_manager.tables["mutes"], ["member"], fetchall=True
+        )
+        return sorted(unmuted), [row["member"] for row in remaining]
+
+    return await for_each_backend(discordSuperUtils.MuteManager, test)
+
+
+def get_birthday(timezone, days=0):
+    today = datetime.now(pytz.timezone(timezone)) + timedelta(days=days)
+    return datetime(2000, today.month, today.day, 12).timestamp()
+
+
+async def birthdays_by_timezone():
+    async def test(database, birthday_manager):
+        await database.insert_many(
+            birthday_manager.tables["birthdays"],
+            [
+                {
+                    "guild": 1,
+                    "member": member,
+                    "utc_birthday": get_birthday(timezone, days),
+                    "timezone": timezone,
+                }
+                for member, timezone, days in [
+                    (1, "UTC", 0),
+                    (2, "Asia/Tokyo", 0),
+                    (3, "UTC", 60),
+                    (4, "America/New_York", 0),
+                ]
+            ],
+        )
+
+        members = [
+            birthday_member["member"]
+            async for birthday_member in birthday_manager.iterate_members_with_birthday(
+                ["UTC", "Asia/Tokyo"]
+            )
+        ]
+
+        return sorted(members), await birthday_manager.get_members_with_birthday([])
+
+    return await for_each_backend(discordSuperUtils.BirthdayManager, test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
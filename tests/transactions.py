@@ -0,0 +1,199 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "accounts"
+
+
+async def start_testing():
+    """
+    Checks Database.transaction on sqlite and on the memory backend.
+
+    RESULTS
+    --------
+        committed_transaction: Passed
+        rolled_back_transaction: Passed
+        nested_transaction_joins: Passed
+        nested_transaction_rolled_back: Passed
+        concurrent_write_kept: Passed
+        stream_during_transaction: Passed
+
+    Conclusion
+    ----------
+        The calls of a transaction are committed or rolled back together, nested transactions join the outer
+        transaction, and the calls of other tasks are not a part of it. A stream on the shared sqlite connection
+        does not read the writes of a transaction that is rolled back, whether it started before or during it.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(committed_transaction, [[(1, 5), (2, 10)]] * 2)
+    tester.add_test(rolled_back_transaction, [[(1, 10), (2, 10)]] * 2)
+    tester.add_test(nested_transaction_joins, [[(1, 20), (2, 10), (3, 0)]] * 2)
+    tester.add_test(nested_transaction_rolled_back, [[(1, 10), (2, 10)]] * 2)
+    tester.add_test(concurrent_write_kept, [[(1, 10), (2, 10), (4, 0)]] * 2)
+    tester.add_test(stream_during_transaction, ([(1, 10), (2, 10)], [(1, 10), (2, 10)]))
+    await tester.run()
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "balance": "INTEGER"}, True
+        )
+        await database.insert_many(
+            TABLE, [{"id": 1, "balance": 10}, {"id": 2, "balance": 10}]
+        )
+
+        await test(database)
+        results.append(
+            [
+                (row["id"], row["balance"])
+                for row in await database.select(
+                    TABLE, [], fetchall=True, order_by=[("id", "ASC")]
+                )
+            ]
+        )
+        await database.close()
+
+    return results
+
+
+async def transfer(database, amount):
+    await database.increment(TABLE, {"balance": -amount}, {"id": 1})
+    await database.increment(TABLE, {"balance": amount}, {"id": 2})
+
+
+async def committed_transaction():
+    async def test(database):
+        async with database.transaction():
+            await database.update(TABLE, {"balance": 5}, {"id": 1})
+            await database.update(TABLE, {"balance": 10}, {"id": 2})
+
+    return await for_each_backend(test)
+
+
+async def rolled_back_transaction():
+    async def test(database):
+        try:
+            async with database.transaction():
+                await transfer(database, 5)
+                await database.insert(TABLE, {"id": 3, "balance": 0})
+                await database.delete(TABLE, {"id": 1})
+                raise RuntimeError("The transfer is rolled back.")
+        except RuntimeError:
+            pass
+
+    return await for_each_backend(test)
+
+
+async def nested_transaction_joins():
+    async def test(database):
+        async with database.transaction():
+            await database.insert(TABLE, {"id": 3, "balance": 0})
+
+            # The inner transaction is a part of the outer one, its error does not roll anything back on its own.
+            try:
+                async with database.transaction():
+                    await database.update(TABLE, {"balance": 20}, {"id": 1})
+                    raise RuntimeError("The error is handled by the outer transaction.")
+            except RuntimeError:
+                pass
+
+    return await for_each_backend(test)
+
+
+async def nested_transaction_rolled_back():
+    async def test(database):
+        try:
+            async with database.transaction():
+                await database.insert(TABLE, {"id": 3, "balance": 0})
+
+                async with database.transaction():
+                    await transfer(database, 5)
+                    raise RuntimeError("Both transactions are rolled back.")
+        except RuntimeError:
+            pass
+
+    return await for_each_backend(test)
+
+
+async def concurrent_write_kept():
+    async def test(database):
+        started = asyncio.Event()
+
+        async def rolled_back():
+            try:
+                async with database.transaction():
+                    await database.insert(TABLE, {"id": 3, "balance": 0})
+                    started.set()
+                    await asyncio.sleep(0.05)
+                    raise RuntimeError("Only the calls of this task are rolled back.")
+            except RuntimeError:
+                pass
+
+        async def concurrent():
+            await started.wait()
+            await database.insert(TABLE, {"id": 4, "balance": 0})
+
+        await asyncio.gather(rolled_back(), concurrent())
+
+    return await for_each_backend(test)
+
+
+async def stream_during_transaction():
+    # The memory backend applies the writes of a transaction when they are made, only sqlite shares a connection.
+    database = discordSuperUtils.DatabaseManager.connect(
+        await aiosqlite.connect(":memory:")
+    )
+    await database.create_table(TABLE, {"id": "INTEGER", "balance": "INTEGER"}, True)
+    await database.insert_many(
+        TABLE, [{"id": 1, "balance": 10}, {"id": 2, "balance": 10}]
+    )
+    started = asyncio.Event()
+
+    async def rolled_back():
+        try:
+            async with database.transaction():
+                await database.update(TABLE, {"balance": 0}, {"id": 2})
+                await database.insert(TABLE, {"id": 3, "balance": 0})
+                started.set()
+                await asyncio.sleep(0.05)
+                raise RuntimeError("The stream does not see the calls of this task.")
+        except RuntimeError:
+            pass
+
+    async def stream(during):
+        if during:
+            await started.wait()
+
+        rows = []
+
+        async for row in database.iterate(TABLE, ["id", "balance"], batch_size=1):
+            if not during and not started.is_set():
+                # The transaction starts between the batches of the stream.
+                asyncio.ensure_future(rolled_back())
+                await started.wait()
+
+            rows.append((row["id"], row["balance"]))
+
+        return rows
+
+    _, started_during = await asyncio.gather(rolled_back(), stream(True))
+    started.clear()
+    started_before = await stream(False)
+    await database.close()
+
+    return started_during, started_before
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())
@@ -0,0 +1,219 @@
+import asyncio
+
+import aiosqlite
+
+import discordSuperUtils
+from tester import Tester
+
+TABLE = "scores"
+UNKEYED_TABLE = "logs"
+
+
+async def start_testing():
+    """
+    Checks Database.updateorinsert and Database.insertifnotexists on sqlite and on the memory backend, on a table
+    with a unique key and on a table without one.
+
+    RESULTS
+    --------
+        updateorinsert_unique_key: Passed
+        updateorinsert_without_unique_key: Passed
+        insertifnotexists_unique_key: Passed
+        insertifnotexists_without_unique_key: Passed
+
+    Conclusion
+    ----------
+        When the checks are a unique key, sqlite upserts in a single statement and does not select the row first.
+        Otherwise the row is selected and then updated or inserted. The memory backend finds the row without a
+        call, and updates it through update. insertifnotexists leaves an existing row untouched on both paths, and
+        both backends store the same rows.
+    """
+
+    tester = Tester(gather=False)
+    tester.add_test(
+        updateorinsert_unique_key,
+        [
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 5}],
+                {"updateorinsert": 1},
+                {"updateorinsert": 1, "update": 1},
+            ),
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 5}],
+                {"updateorinsert": 1},
+                {"updateorinsert": 1},
+            ),
+        ],
+    )
+    tester.add_test(
+        updateorinsert_without_unique_key,
+        [
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 5}],
+                {"updateorinsert": 1},
+                {"updateorinsert": 1, "update": 1},
+            ),
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 5}],
+                {"updateorinsert": 1, "select": 1, "insert": 1},
+                {"updateorinsert": 1, "select": 1, "update": 1},
+            ),
+        ],
+    )
+    tester.add_test(
+        insertifnotexists_unique_key,
+        [
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 0}],
+                {"insertifnotexists": 1},
+                {"insertifnotexists": 1},
+            )
+        ]
+        * 2,
+    )
+    tester.add_test(
+        insertifnotexists_without_unique_key,
+        [
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 0}],
+                {"insertifnotexists": 1},
+                {"insertifnotexists": 1},
+            ),
+            (
+                [{"id": 1, "value": 0}],
+                [{"id": 1, "value": 0}],
+                {"insertifnotexists": 1, "select": 1, "insert": 1},
+                {"insertifnotexists": 1, "select": 1},
+            ),
+        ],
+    )
+    await tester.run()
+
+
+async def for_each_backend(test):
+    results = []
+
+    for connection in [
+        discordSuperUtils.MemoryStore(),
+        await aiosqlite.connect(":memory:"),
+    ]:
+        database = discordSuperUtils.DatabaseManager.connect(connection)
+        await database.create_table(
+            TABLE, {"id": "INTEGER", "value": "INTEGER"}, True, unique_keys=[("id",)]
+        )
+        await database.create_table(
+            UNKEYED_TABLE, {"id": "INTEGER", "value": "INTEGER"}, True
+        )
+
+        results.append(await test(database))
+        await database.close()
+
+    return results
+
+
+async def get_rows(database, table_name):
+    return await database.select(table_name, [], {"id": 1}, fetchall=True)
+
+
+async def get_calls(database, method, table_name, *args):
+    instrumentation = database.enable_instrumentation()
+    # The method is looked up after the instrumentation is enabled, so its call is counted too.
+    await getattr(database, method)(table_name, *args)
+    database.disable_instrumentation()
+
+    return {
+        operation: operation_stats[table_name]["calls"]
+        for operation, operation_stats in instrumentation.stats().items()
+    }
+
+
+async def updateorinsert(database, table_name):
+    # The row does not exist, so it is inserted. The second call updates it.
+    insert_calls = await get_calls(
+        database,
+        "updateorinsert",
+        table_name,
+        {"value": 5},
+        {"id": 1},
+        {"id": 1, "value": 0},
+    )
+    inserted_rows = await get_rows(database, table_name)
+    update_calls = await get_calls(
+        database,
+        "updateorinsert",
+        table_name,
+        {"id": 1, "value": 5},
+        {"id": 1},
+        {"id": 1, "value": 0},
+    )
+
+    return (
+        inserted_rows,
+        await get_rows(database, table_name),
+        insert_calls,
+        update_calls,
+    )
+
+
+async def insertifnotexists(database, table_name):
+    insert_calls = await get_calls(
+        database,
+        "insertifnotexists",
+        table_name,
+        {"id": 1, "value": 0},
+        {"id": 1},
+    )
+    inserted_rows = await get_rows(database, table_name)
+    # The row exists, so it is left untouched.
+    existing_calls = await get_calls(
+        database,
+        "insertifnotexists",
+        table_name,
+        {"id": 1, "value": 5},
+        {"id": 1},
+    )
+
+    return (
+        inserted_rows,
+        await get_rows(database, table_name),
+        insert_calls,
+        existing_calls,
+    )
+
+
+async def updateorinsert_unique_key():
+    async def test(database):
+        return await updateorinsert(database, TABLE)
+
+    return await for_each_backend(test)
+
+
+async def updateorinsert_without_unique_key():
+    async def test(database):
+        return await updateorinsert(database, UNKEYED_TABLE)
+
+    return await for_each_backend(test)
+
+
+async def insertifnotexists_unique_key():
+    async def test(database):
+        return await insertifnotexists(database, TABLE)
+
+    return await for_each_backend(test)
+
+
+async def insertifnotexists_without_unique_key():
+    async def test(database):
+        return await insertifnotexists(database, UNKEYED_TABLE)
+
+    return await for_each_backend(test)
+
+
+loop = asyncio.get_event_loop()
+loop.run_until_complete(start_testing())